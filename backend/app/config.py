@@ -8,6 +8,19 @@ class Settings(BaseSettings):
     DATA_DIR: Path = BASE_DIR / "data"
     DATABASE_URL: str = f"sqlite:///{DATA_DIR / 'plants.db'}"
     
+    # SQLite: PRAGMA appliqués à chaque connexion (app.utils.db.configure_sqlite)
+    SQLITE_JOURNAL_MODE: str = "WAL"  # lecteurs non bloqués par l'écrivain
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # sûr en WAL (pas de corruption), fsync au checkpoint
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # attente du verrou d'écriture avant "database is locked"
+    SQLITE_CACHE_SIZE: int = -65536  # négatif = KiB par connexion (64 Mo)
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # lectures par mmap, 0 = désactivé
+    SQLITE_TEMP_STORE: str = "MEMORY"  # tris et index temporaires en mémoire
+    SQLITE_FOREIGN_KEYS: bool = True
+    # Pool de connexions (WAL: lectures concurrentes, une écriture à la fois)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0  # secondes d'attente d'une connexion libre
+    
     # App
     APP_NAME: str = "Plant Manager v2"
     DEBUG: bool = True
@@ -15,6 +28,27 @@ class Settings(BaseSettings):
     # Paths
     PHOTOS_DIR: Path = DATA_DIR / "photos"
     EXPORTS_DIR: Path = DATA_DIR / "exports"
+    UPLOADS_DIR: Path = DATA_DIR / "uploads"  # Uploads bruts en attente d'encodage
+    DERIVED_DIR: Path = DATA_DIR / "derived"  # Variantes de photos générées à la demande
+    
+    # Image processing (app.utils.image_workers)
+    IMAGE_WORKERS: int = 2  # processus d'encodage, 0 = thread du processus courant
+    IMAGE_QUEUE_MAX: int = 8  # tâches en cours/en attente avant 503
+    IMAGE_TASK_TIMEOUT: float = 60.0  # secondes par image
+    PHOTO_JOBS_MAX_PENDING: int = 50  # tâches d'ingestion en attente avant 503
+    DERIVED_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # budget disque des variantes (LRU)
+    
+    # Statistics
+    STATS_COUNTERS_ENABLED: bool = False  # Dashboard lu depuis la table plant_stats (O(1))
+    WATERING_SCHEDULE_CACHE_TTL: int = 300  # secondes, filet de sécurité multi-process
+    
+    # Instrumentation (app.utils.metrics): Server-Timing + GET /metrics
+    METRICS_ENABLED: bool = True
+    # Journal des requêtes lentes (app.utils.slow_queries): GET /api/diagnostics/slow-queries
+    SLOW_QUERY_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 100.0
+    SLOW_QUERY_EXPLAIN: bool = True  # EXPLAIN QUERY PLAN des requêtes lentes
+    SLOW_QUERY_BUFFER_SIZE: int = 100  # dernières requêtes lentes conservées
     
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
@@ -24,4 +58,6 @@ settings = Settings()
 settings.DATA_DIR.mkdir(exist_ok=True)
 settings.PHOTOS_DIR.mkdir(exist_ok=True)
 settings.EXPORTS_DIR.mkdir(exist_ok=True)
+settings.UPLOADS_DIR.mkdir(exist_ok=True)
+settings.DERIVED_DIR.mkdir(exist_ok=True)
 
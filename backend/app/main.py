@@ -1,36 +1,84 @@
-from fastapi import FastAPI, Depends
+import time
+
+STARTED_AT = time.perf_counter()
+
+# Avant tout autre import: mesure du coût de chaque module (IMPORT_PROFILING=1)
+from app.utils import import_profiler
+import_profiler.install_from_env()
+
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from app.config import settings
-from app.utils.db import init_db, get_db
+from app.utils.db import get_db, engine, async_engine, RowInUseError
 from app.models import Base
 from app.routes.plants import router as plants_router
-from app.routes.photos import router as photos_router, files_router
-from app.routes.histories import watering_router, fertilizing_router, repotting_router, disease_router, notes_router
+from app.routes.photos import router as photos_router, files_router, jobs_router as photo_jobs_router, sprites_router as photo_sprites_router
+from app.routes.histories import watering_router, fertilizing_router, repotting_router, disease_router, notes_router, batch_router as history_batch_router
 from app.routes.settings import router as settings_router
 from app.routes.statistics import router as statistics_router
 from app.routes.lookups import router as lookups_router
-from app.scripts.seed_lookups import seed_all
-from app.scripts.seed_plants import seed_plants
+from app.routes.exports import router as exports_router
+from app.routes.imports import router as imports_router
+from app.routes.diagnostics import router as diagnostics_router
+from app.routes.metrics import router as metrics_router
+from app.utils.bootstrap import bootstrap
+from app.utils.image_workers import image_pool
+from app.utils.metrics import MetricsMiddleware, instrument_sql
+from app.services.photo_job_service import PhotoJobService
+import asyncio
+import logging
 import os
 
-# Initialize database
-init_db()
+logger = logging.getLogger(__name__)
+
+
+# Relancer les ingestions de photos interrompues par un arrêt
+# tasks garde une référence aux tâches (la boucle n'en garde qu'une faible)
+def resume_photo_jobs(tasks: set) -> None:
+    db = next(get_db())
+    try:
+        job_ids = PhotoJobService.reset_interrupted(db)
+    finally:
+        db.close()
+    for job_id in job_ids:
+        task = asyncio.create_task(PhotoJobService.process_job(job_id, engine))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schéma et seeds hors import: ignorés si l'empreinte enregistrée est à jour
+    import_ms = (time.perf_counter() - STARTED_AT) * 1000
+    result = await run_in_threadpool(bootstrap)
+    app.state.photo_job_tasks = set()
+    resume_photo_jobs(app.state.photo_job_tasks)
+    app.state.startup = {
+        "import_ms": round(import_ms, 1),
+        "bootstrap_status": result["status"],
+        "bootstrap_ms": result["elapsed_ms"],
+        "cold_start_ms": round((time.perf_counter() - STARTED_AT) * 1000, 1),
+    }
+    logger.info(
+        f"Cold start: {app.state.startup['cold_start_ms']:.0f} ms "
+        f"(import {import_ms:.0f} ms, bootstrap {result['status']} {result['elapsed_ms']:.0f} ms)"
+    )
+    yield
+    # Arrêter les workers d'images avec l'application
+    image_pool.shutdown()
+    await async_engine.dispose()
 
-# Seed lookup tables and sample plants at startup
-db = next(get_db())
-try:
-    seed_all(db)
-    seed_plants(db)
-finally:
-    db.close()
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     description="Desktop plant management application",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
 )
 
 # CORS configuration for Tauri + React development
@@ -63,18 +111,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Latence, requêtes SQL et taille des réponses par route (Server-Timing, /metrics)
+if settings.METRICS_ENABLED:
+    instrument_sql()
+    app.add_middleware(MetricsMiddleware)
+
+# Suppression d'une valeur encore référencée (foreign_keys=ON): conflit, pas 500
+@app.exception_handler(RowInUseError)
+async def row_in_use_handler(request: Request, exc: RowInUseError):
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
+
 # Include routers
 app.include_router(plants_router)
 app.include_router(photos_router)
 app.include_router(files_router)
+app.include_router(photo_jobs_router)
+app.include_router(photo_sprites_router)
 app.include_router(watering_router)
 app.include_router(fertilizing_router)
 app.include_router(repotting_router)
 app.include_router(disease_router)
 app.include_router(notes_router)
+app.include_router(history_batch_router)
 app.include_router(settings_router)
 app.include_router(statistics_router)
 app.include_router(lookups_router)
+app.include_router(exports_router)
+app.include_router(imports_router)
+app.include_router(diagnostics_router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
 
 # Health check endpoint
 @app.get("/health")
@@ -100,4 +166,5 @@ async def db_status(db: Session = Depends(get_db)):
 
 if __name__ == "__main__":
     import uvicorn
+    logging.basicConfig(level=logging.INFO)
     uvicorn.run(app, host="127.0.0.1", port=8002)
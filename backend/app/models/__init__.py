@@ -4,6 +4,11 @@ from app.models.plant import Plant
 from app.models.photo import Photo as PhotoModel
 from app.models.lookup import Unit, Location, PurchasePlace, WateringFrequency, LightRequirement, FertilizerType, DiseaseType, TreatmentType, PlantHealthStatus
 from app.models.histories import WateringHistory, FertilizingHistory, RepottingHistory, DiseaseHistory, PlantHistory
+from app.models.plant_stats import PlantStat
+from app.models.photo_job import PhotoJob
+from app.models.reference_sequence import ReferenceSequence
+from app.models.app_metadata import AppMetadata
+from app.models import plant_search  # Index FTS5 plants_fts (DDL attaché à la table plants)
 
 __all__ = [
     "Base", "BaseModel",
@@ -11,4 +16,8 @@ __all__ = [
     "Unit", "Location", "PurchasePlace", "WateringFrequency", "LightRequirement", "FertilizerType", "DiseaseType", "TreatmentType", "PlantHealthStatus",
     "WateringHistory", "FertilizingHistory", "RepottingHistory", "DiseaseHistory", "PlantHistory",
     "Tag", "TagCategory",
+    "PlantStat",
+    "PhotoJob",
+    "ReferenceSequence",
+    "AppMetadata",
 ]
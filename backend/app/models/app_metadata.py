@@ -0,0 +1,21 @@
+"""
+Métadonnées de l'application (table app_metadata, clé → valeur)
+Ex: version et empreinte des seeds enregistrées par le bootstrap
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String, Text
+
+from app.models.base import Base
+
+
+class AppMetadata(Base):
+    __tablename__ = "app_metadata"
+
+    key = Column(String(100), primary_key=True)
+    value = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<AppMetadata(key={self.key}, value={self.value})>"
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, String, Integer, DateTime, Date, Text, ForeignKey, Boolean
+from sqlalchemy import Column, String, Integer, DateTime, Date, Text, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
 class WateringHistory(BaseModel):
     __tablename__ = "watering_histories"
+    __table_args__ = (Index("ix_watering_histories_plant_date", "plant_id", "date"),)
     plant_id = Column(Integer, ForeignKey("plants.id"), nullable=False)
     date = Column(Date, nullable=False)
     amount_ml = Column(Integer)
@@ -13,6 +14,7 @@ class WateringHistory(BaseModel):
 
 class FertilizingHistory(BaseModel):
     __tablename__ = "fertilizing_histories"
+    __table_args__ = (Index("ix_fertilizing_histories_plant_date", "plant_id", "date"),)
     plant_id = Column(Integer, ForeignKey("plants.id"), nullable=False)
     date = Column(Date, nullable=False)
     fertilizer_type_id = Column(Integer, ForeignKey("fertilizer_types.id"))
@@ -23,6 +25,7 @@ class FertilizingHistory(BaseModel):
 
 class RepottingHistory(BaseModel):
     __tablename__ = "repotting_histories"
+    __table_args__ = (Index("ix_repotting_histories_plant_date", "plant_id", "date"),)
     plant_id = Column(Integer, ForeignKey("plants.id"), nullable=False)
     date = Column(Date, nullable=False)
     soil_type = Column(String(100))
@@ -34,6 +37,7 @@ class RepottingHistory(BaseModel):
 
 class DiseaseHistory(BaseModel):
     __tablename__ = "disease_histories"
+    __table_args__ = (Index("ix_disease_histories_plant_date", "plant_id", "date"),)
     plant_id = Column(Integer, ForeignKey("plants.id"), nullable=False)
     date = Column(Date, nullable=False)
     disease_type_id = Column(Integer, ForeignKey("disease_types.id"), nullable=True)
@@ -50,6 +54,7 @@ class DiseaseHistory(BaseModel):
 
 class PlantHistory(BaseModel):
     __tablename__ = "plant_histories"
+    __table_args__ = (Index("ix_plant_histories_plant_date", "plant_id", "date"),)
     plant_id = Column(Integer, ForeignKey("plants.id"), nullable=False)
     date = Column(Date, nullable=False)
     title = Column(String(100))
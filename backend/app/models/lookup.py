@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Text
+from sqlalchemy import Column, String, Integer, Text, Float
 from app.models.base import BaseModel
 
 class Unit(BaseModel):
@@ -63,5 +63,6 @@ class Season(BaseModel):
     name = Column(String(50), unique=True, nullable=False)  # printemps, été, automne, hiver
     start_month = Column(Integer, nullable=False)  # 1-12
     end_month = Column(Integer, nullable=False)  # 1-12
+    watering_factor = Column(Float, nullable=False, default=1.0)  # multiplicateur de l'intervalle d'arrosage
     description = Column(Text, nullable=True)
 
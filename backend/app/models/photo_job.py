@@ -0,0 +1,34 @@
+"""
+Tâches d'ingestion de photos asynchrones (table photo_jobs)
+
+L'upload brut est stocké dans data/uploads/ et la tâche passe par:
+pending → processing → done (photo_id renseigné) ou failed (error renseignée)
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+
+from app.models.base import BaseModel
+
+
+class PhotoJob(BaseModel):
+    __tablename__ = "photo_jobs"
+
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    plant_id = Column(Integer, ForeignKey("plants.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(String(20), nullable=False, default=STATUS_PENDING, index=True)
+    upload_path = Column(String(500), nullable=False)  # Fichier brut dans UPLOADS_DIR
+    original_filename = Column(String(255))
+    upload_size = Column(Integer, nullable=False, default=0)
+    photo_id = Column(Integer, ForeignKey("photos.id", ondelete="SET NULL"), nullable=True)
+    error = Column(Text, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    photo = relationship("Photo")
+
+    def __repr__(self):
+        return f"<PhotoJob(id={self.id}, plant_id={self.plant_id}, status={self.status})>"
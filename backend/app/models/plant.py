@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text, DECIMAL
+from sqlalchemy import Column, String, Integer, Boolean, Date, DateTime, ForeignKey, Text, DECIMAL
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 from app.models.base import BaseModel
@@ -52,6 +52,11 @@ class Plant(BaseModel):
     archived_reason = Column(String(255), nullable=True)  # Why was it archived
     deleted_at = Column(DateTime, nullable=True)
     
+    # Last care events (denormalized from histories, maintained by HistoryService)
+    last_watered_at = Column(Date, nullable=True, index=True)
+    last_fertilized_at = Column(Date, nullable=True, index=True)
+    last_repotted_at = Column(Date, nullable=True, index=True)
+    
     # Relationships
     photos = relationship("Photo", back_populates="plant", cascade="all, delete-orphan")
     watering_histories = relationship("WateringHistory", back_populates="plant")
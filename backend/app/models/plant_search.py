@@ -0,0 +1,145 @@
+"""
+Index plein texte FTS5 des plantes (SQLite)
+
+Table virtuelle plants_fts à contenu externe (content='plants'):
+- colonnes indexées: name, scientific_name, description
+- tokenizer unicode61 + remove_diacritics (fougère == fougere)
+- index de préfixes 2 et 3 caractères pour la recherche "au fil de la frappe"
+- synchronisée avec plants par triggers (INSERT / UPDATE / DELETE)
+- chargements en masse: deferred_insert_indexing (une instruction par lot)
+"""
+
+import re
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import DDL, event, text
+from sqlalchemy.engine import Connection
+
+from app.models.plant import Plant
+
+FTS_TABLE = "plants_fts"
+
+# Pondération bm25 par colonne: name > scientific_name > description
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+INSERT_TRIGGER = f"""
+    CREATE TRIGGER IF NOT EXISTS plants_fts_ai AFTER INSERT ON plants BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, scientific_name, description)
+        VALUES (new.id, new.name, new.scientific_name, new.description);
+    END
+    """
+
+CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, scientific_name, description,
+        content='plants', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    INSERT_TRIGGER,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS plants_fts_ad AFTER DELETE ON plants BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, scientific_name, description)
+        VALUES ('delete', old.id, old.name, old.scientific_name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS plants_fts_au AFTER UPDATE OF name, scientific_name, description ON plants BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, scientific_name, description)
+        VALUES ('delete', old.id, old.name, old.scientific_name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, scientific_name, description)
+        VALUES (new.id, new.name, new.scientific_name, new.description);
+    END
+    """,
+]
+
+DROP_STATEMENTS = [
+    "DROP TRIGGER IF EXISTS plants_fts_ai",
+    "DROP TRIGGER IF EXISTS plants_fts_ad",
+    "DROP TRIGGER IF EXISTS plants_fts_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# Créé/supprimé avec la table plants (create_all / drop_all), SQLite uniquement
+for _statement in CREATE_STATEMENTS:
+    event.listen(Plant.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in DROP_STATEMENTS:
+    event.listen(Plant.__table__, "before_drop", DDL(_statement).execute_if(dialect="sqlite"))
+
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(q: str) -> Optional[str]:
+    """
+    Convertit une saisie utilisateur en requête MATCH FTS5
+
+    Chaque mot devient un préfixe entre guillemets ("fic"* AND "lyr"*),
+    ce qui neutralise la syntaxe FTS5 (opérateurs, colonnes, parenthèses).
+
+    Returns:
+        str ou None si la saisie ne contient aucun mot
+    """
+    tokens = _TOKEN_RE.findall(q or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def search_index_exists(conn: Connection) -> bool:
+    """Indique si la table FTS5 est présente dans la base"""
+    if conn.dialect.name != "sqlite":
+        return False
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE},
+    ).first() is not None
+
+
+def rebuild_search_index(conn: Connection) -> None:
+    """Reconstruit entièrement l'index à partir de la table plants"""
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def ensure_search_index(conn: Connection) -> bool:
+    """
+    Crée l'index FTS5 sur une base existante s'il manque, puis le remplit
+
+    Returns:
+        bool: True si l'index a été créé
+    """
+    if conn.dialect.name != "sqlite" or search_index_exists(conn):
+        return False
+    for statement in CREATE_STATEMENTS:
+        conn.execute(text(statement))
+    rebuild_search_index(conn)
+    return True
+
+
+@contextmanager
+def deferred_insert_indexing(conn: Connection) -> Iterator[None]:
+    """
+    Chargement en masse: suspend le trigger d'insertion et indexe les nouvelles
+    plantes en une seule instruction (INSERT ... SELECT) à la sortie du bloc
+
+    À utiliser dans une transaction: sous SQLite, DROP/CREATE TRIGGER sont
+    transactionnels (un rollback restaure le trigger) et le DROP prend le verrou
+    d'écriture, donc toutes les plantes insérées dans le bloc ont un id > max(id).
+    """
+    if not search_index_exists(conn):
+        yield
+        return
+    conn.execute(text("DROP TRIGGER IF EXISTS plants_fts_ai"))
+    last_id = conn.execute(text("SELECT coalesce(max(id), 0) FROM plants")).scalar()
+    yield
+    conn.execute(
+        text(
+            f"INSERT INTO {FTS_TABLE}(rowid, name, scientific_name, description) "
+            "SELECT id, name, scientific_name, description FROM plants WHERE id > :last_id"
+        ),
+        {"last_id": last_id},
+    )
+    conn.execute(text(INSERT_TRIGGER))
@@ -0,0 +1,18 @@
+"""
+Compteurs du dashboard maintenus incrémentalement (table plant_stats)
+Une ligne par KPI: key = nom du compteur, value = valeur courante
+"""
+
+from sqlalchemy import Column, Integer, String
+
+from app.models.base import Base
+
+
+class PlantStat(Base):
+    __tablename__ = "plant_stats"
+
+    key = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<PlantStat(key={self.key}, value={self.value})>"
@@ -0,0 +1,18 @@
+"""
+Séquences de références des plantes (table reference_sequences)
+Une ligne par préfixe de famille: next_value = prochain numéro à attribuer
+"""
+
+from sqlalchemy import Column, Integer, String
+
+from app.models.base import Base
+
+
+class ReferenceSequence(Base):
+    __tablename__ = "reference_sequences"
+
+    prefix = Column(String(100), primary_key=True)
+    next_value = Column(Integer, nullable=False, default=1)
+
+    def __repr__(self):
+        return f"<ReferenceSequence(prefix={self.prefix}, next_value={self.next_value})>"
@@ -0,0 +1,68 @@
+"""
+Endpoints FastAPI de diagnostic (démarrage de l'application, requêtes SQL lentes)
+"""
+
+import sys
+
+from fastapi import APIRouter, Query, Request
+
+from app.config import settings
+from app.utils import import_profiler
+from app.utils.slow_queries import slow_query_log
+
+router = APIRouter(prefix="/api/diagnostics", tags=["diagnostics"])
+
+# Modules chargés à la première utilisation, pas au démarrage
+DEFERRED_MODULES = ("PIL",)
+
+
+@router.get("/startup", response_model=dict)
+async def get_startup_diagnostics(
+    request: Request,
+    limit: int = Query(30, ge=1, le=1000),
+    sort: str = Query("cumulative", pattern="^(cumulative|self)$"),
+):
+    """
+    Coût du démarrage
+    Retourne: {
+        startup: {import_ms, bootstrap_status, bootstrap_ms, cold_start_ms} ou null (lifespan non exécuté),
+        import_profiling: {enabled, total_ms, modules: [{module, self_ms, cumulative_ms, depth}]},
+        deferred_modules: {module: chargé ou non}
+    }
+    Profilage des imports: lancer le serveur avec IMPORT_PROFILING=1
+    """
+    profiler = import_profiler.get_profiler()
+    profiling = {"enabled": profiler is not None, "total_ms": None, "modules": []}
+    if profiler is not None:
+        profiling["total_ms"] = profiler.total_ms()
+        profiling["modules"] = profiler.report(limit=limit, sort=f"{sort}_ms")
+    return {
+        "startup": getattr(request.app.state, "startup", None),
+        "import_profiling": profiling,
+        "deferred_modules": {name: name in sys.modules for name in DEFERRED_MODULES},
+    }
+
+
+@router.get("/slow-queries", response_model=dict)
+async def get_slow_queries(limit: int = Query(50, ge=1, le=1000)):
+    """
+    Dernières requêtes SQL lentes (plus récentes d'abord)
+    Retourne: {
+        enabled, threshold_ms,
+        full_scans: {table: nombre de requêtes lentes la parcourant en entier},
+        queries: [{at, duration_ms, statement, parameters, executemany, route, caller, plan, full_scans}]
+    }
+    Une table souvent parcourue en entier est candidate à un index
+    """
+    return {
+        "enabled": settings.SLOW_QUERY_ENABLED,
+        "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        "full_scans": slow_query_log.full_scans(),
+        "queries": slow_query_log.entries(limit),
+    }
+
+
+@router.delete("/slow-queries", status_code=204)
+async def clear_slow_queries():
+    """Vide le journal (avant de mesurer l'effet d'un nouvel index)"""
+    slow_query_log.clear()
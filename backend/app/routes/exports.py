@@ -0,0 +1,102 @@
+"""
+Routes pour l'export de la collection (NDJSON, CSV, ZIP)
+"""
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from typing import List
+
+from app.utils.db import get_db
+from app.schemas.export_schema import ExportResponse
+from app.services.export_service import ExportService
+
+router = APIRouter(prefix="/api/exports", tags=["exports"])
+
+FORMAT_QUERY = Query("ndjson", pattern="^(ndjson|csv|zip)$", description="ndjson, csv ou zip")
+TABLE_QUERY = Query("plants", description="Table exportée en CSV: plants, photos, watering, fertilizing, repotting, disease, notes")
+PHOTOS_QUERY = Query(False, description="ZIP: inclure les fichiers photos")
+
+
+def _export_response(export: dict) -> dict:
+    """État d'export + URL de téléchargement/suivi"""
+    return {
+        **{key: value for key, value in export.items() if key != "path"},
+        "url": f"/api/exports/{export['filename']}",
+    }
+
+
+@router.get("/stream")
+async def stream_export(
+    format: str = FORMAT_QUERY,
+    table: str = TABLE_QUERY,
+    include_photos: bool = PHOTOS_QUERY,
+    db: Session = Depends(get_db),
+):
+    """
+    Export de toute la collection en flux (mémoire constante)
+    - ndjson: une plante par ligne avec tags, photos et historiques
+    - csv: une table (plants par défaut)
+    - zip: plants.ndjson + un CSV par table (+ photos si include_photos)
+    """
+    if format == "csv" and table not in ExportService.TABLES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Table inconnue: {table} (valeurs: {', '.join(ExportService.TABLES)})"
+        )
+    filename = ExportService.new_filename(format, table)
+    return StreamingResponse(
+        ExportService.stream(db.get_bind(), format, table, include_photos),
+        media_type=ExportService.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("", response_model=ExportResponse, status_code=202)
+async def create_export(
+    background_tasks: BackgroundTasks,
+    format: str = FORMAT_QUERY,
+    table: str = TABLE_QUERY,
+    include_photos: bool = PHOTOS_QUERY,
+    db: Session = Depends(get_db),
+):
+    """
+    Écrit un export dans EXPORTS_DIR en tâche de fond
+    Suivi et téléchargement via GET /api/exports/{filename}
+    """
+    try:
+        filename = ExportService.start_export(format, table)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    background_tasks.add_task(
+        ExportService.write_export, db.get_bind(), filename, format, table, include_photos
+    )
+    return _export_response(ExportService.get_export(filename))
+
+
+@router.get("", response_model=List[ExportResponse])
+async def list_exports():
+    """Exports présents dans EXPORTS_DIR (plus récents d'abord)"""
+    return [_export_response(export) for export in ExportService.list_exports()]
+
+
+@router.get("/{filename}", response_model=ExportResponse)
+async def get_export(filename: str):
+    """
+    Télécharge un export terminé
+    En cours: 202 avec son état; échoué: 500 avec l'erreur
+    """
+    export = ExportService.get_export(filename)
+    if not export:
+        raise HTTPException(status_code=404, detail="Export non trouvé")
+    if export["status"] == "done":
+        return FileResponse(
+            path=export["path"],
+            media_type=ExportService.FORMATS[filename.rsplit(".", 1)[1]],
+            filename=filename,
+        )
+    status_code = 202 if export["status"] == "running" else 500
+    return JSONResponse(
+        status_code=status_code,
+        content=ExportResponse(**_export_response(export)).model_dump(mode="json"),
+    )
@@ -3,19 +3,25 @@ Endpoints FastAPI pour les historiques (5 types)
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.utils.db import get_db
+from app.utils.db import get_async_db, get_db
 from app.schemas.history_schema import (
     WateringHistoryCreate, WateringHistoryUpdate, WateringHistoryResponse,
     FertilizingHistoryCreate, FertilizingHistoryUpdate, FertilizingHistoryResponse,
     RepottingHistoryCreate, RepottingHistoryUpdate, RepottingHistoryResponse,
     DiseaseHistoryCreate, DiseaseHistoryUpdate, DiseaseHistoryResponse,
     PlantHistoryCreate, PlantHistoryUpdate, PlantHistoryResponse,
+    HistoryBatchTarget, HistoryBatchResponse,
+    WateringBatchCreate, WateringBatchUpdate,
+    FertilizingBatchCreate, FertilizingBatchUpdate,
 )
-from app.services.history_service import HistoryService
+from app.services.history_service import AsyncHistoryService, HistoryService
+from app.services.plant_service import AsyncPlantService
 from app.models.plant import Plant
+from app.models.histories import WateringHistory, FertilizingHistory, RepottingHistory, DiseaseHistory, PlantHistory
 
 # Créer 5 routers pour chaque type d'historique
 watering_router = APIRouter(prefix="/api/plants", tags=["watering-history"])
@@ -23,6 +29,8 @@ fertilizing_router = APIRouter(prefix="/api/plants", tags=["fertilizing-history"
 repotting_router = APIRouter(prefix="/api/plants", tags=["repotting-history"])
 disease_router = APIRouter(prefix="/api/plants", tags=["disease-history"])
 notes_router = APIRouter(prefix="/api/plants", tags=["plant-notes"])
+# Opérations groupées (plusieurs plantes en une requête)
+batch_router = APIRouter(prefix="/api/histories", tags=["history-batch"])
 
 
 # ===== WATERING HISTORY =====
@@ -39,13 +47,12 @@ async def create_watering(plant_id: int, data: WateringHistoryCreate, db: Sessio
 
 
 @watering_router.get("/{plant_id}/watering-history", response_model=List[WateringHistoryResponse])
-async def get_watering_list(plant_id: int, db: Session = Depends(get_db)):
+async def get_watering_list(plant_id: int, db: AsyncSession = Depends(get_async_db)):
     """Lister les arrosages"""
-    plant = db.query(Plant).filter(Plant.id == plant_id, Plant.deleted_at == None).first()
-    if not plant:
+    if not await AsyncPlantService.get_by_id(db, plant_id):
         raise HTTPException(status_code=404, detail="Plante non trouvée")
     
-    return HistoryService.get_all_watering(db, plant_id)
+    return await AsyncHistoryService.get_all(db, WateringHistory, plant_id)
 
 
 @watering_router.get("/{plant_id}/watering-history/{history_id}", response_model=WateringHistoryResponse)
@@ -89,13 +96,12 @@ async def create_fertilizing(plant_id: int, data: FertilizingHistoryCreate, db:
 
 
 @fertilizing_router.get("/{plant_id}/fertilizing-history", response_model=List[FertilizingHistoryResponse])
-async def get_fertilizing_list(plant_id: int, db: Session = Depends(get_db)):
+async def get_fertilizing_list(plant_id: int, db: AsyncSession = Depends(get_async_db)):
     """Lister les fertilisations"""
-    plant = db.query(Plant).filter(Plant.id == plant_id, Plant.deleted_at == None).first()
-    if not plant:
+    if not await AsyncPlantService.get_by_id(db, plant_id):
         raise HTTPException(status_code=404, detail="Plante non trouvée")
     
-    return HistoryService.get_all_fertilizing(db, plant_id)
+    return await AsyncHistoryService.get_all(db, FertilizingHistory, plant_id)
 
 
 @fertilizing_router.get("/{plant_id}/fertilizing-history/{history_id}", response_model=FertilizingHistoryResponse)
@@ -139,13 +145,12 @@ async def create_repotting(plant_id: int, data: RepottingHistoryCreate, db: Sess
 
 
 @repotting_router.get("/{plant_id}/repotting-history", response_model=List[RepottingHistoryResponse])
-async def get_repotting_list(plant_id: int, db: Session = Depends(get_db)):
+async def get_repotting_list(plant_id: int, db: AsyncSession = Depends(get_async_db)):
     """Lister les rempotages"""
-    plant = db.query(Plant).filter(Plant.id == plant_id, Plant.deleted_at == None).first()
-    if not plant:
+    if not await AsyncPlantService.get_by_id(db, plant_id):
         raise HTTPException(status_code=404, detail="Plante non trouvée")
     
-    return HistoryService.get_all_repotting(db, plant_id)
+    return await AsyncHistoryService.get_all(db, RepottingHistory, plant_id)
 
 
 @repotting_router.get("/{plant_id}/repotting-history/{history_id}", response_model=RepottingHistoryResponse)
@@ -189,13 +194,12 @@ async def create_disease(plant_id: int, data: DiseaseHistoryCreate, db: Session
 
 
 @disease_router.get("/{plant_id}/disease-history", response_model=List[DiseaseHistoryResponse])
-async def get_disease_list(plant_id: int, db: Session = Depends(get_db)):
+async def get_disease_list(plant_id: int, db: AsyncSession = Depends(get_async_db)):
     """Lister les maladies"""
-    plant = db.query(Plant).filter(Plant.id == plant_id, Plant.deleted_at == None).first()
-    if not plant:
+    if not await AsyncPlantService.get_by_id(db, plant_id):
         raise HTTPException(status_code=404, detail="Plante non trouvée")
     
-    return HistoryService.get_all_disease(db, plant_id)
+    return await AsyncHistoryService.get_all(db, DiseaseHistory, plant_id)
 
 
 @disease_router.get("/{plant_id}/disease-history/{history_id}", response_model=DiseaseHistoryResponse)
@@ -239,13 +243,12 @@ async def create_plant_note(plant_id: int, data: PlantHistoryCreate, db: Session
 
 
 @notes_router.get("/{plant_id}/plant-history", response_model=List[PlantHistoryResponse])
-async def get_plant_notes_list(plant_id: int, db: Session = Depends(get_db)):
+async def get_plant_notes_list(plant_id: int, db: AsyncSession = Depends(get_async_db)):
     """Lister les notes"""
-    plant = db.query(Plant).filter(Plant.id == plant_id, Plant.deleted_at == None).first()
-    if not plant:
+    if not await AsyncPlantService.get_by_id(db, plant_id):
         raise HTTPException(status_code=404, detail="Plante non trouvée")
     
-    return HistoryService.get_all_plant_notes(db, plant_id)
+    return await AsyncHistoryService.get_all(db, PlantHistory, plant_id)
 
 
 @notes_router.get("/{plant_id}/plant-history/{history_id}", response_model=PlantHistoryResponse)
@@ -273,3 +276,47 @@ async def delete_plant_note(plant_id: int, history_id: int, db: Session = Depend
     if not success:
         raise HTTPException(status_code=404, detail="Entrée non trouvée")
     return None
+
+
+# ===== OPÉRATIONS GROUPÉES =====
+
+@batch_router.post("/watering/batch", response_model=HistoryBatchResponse, status_code=201)
+async def create_watering_batch(data: WateringBatchCreate, db: Session = Depends(get_db)):
+    """Arroser toutes les plantes sélectionnées (plant_ids, location_id, tag_id)"""
+    return HistoryService.create_batch(db, WateringHistory, data, data.data)
+
+
+@batch_router.patch("/watering/batch", response_model=HistoryBatchResponse)
+async def update_watering_batch(data: WateringBatchUpdate, db: Session = Depends(get_db)):
+    """Mettre à jour des arrosages (ids, ou plantes sélectionnées + date)"""
+    try:
+        return HistoryService.update_batch(db, WateringHistory, data, data.data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@batch_router.post("/watering/batch/delete", response_model=HistoryBatchResponse)
+async def delete_watering_batch(data: HistoryBatchTarget, db: Session = Depends(get_db)):
+    """Supprimer des arrosages (ids, ou plantes sélectionnées + date)"""
+    return HistoryService.delete_batch(db, WateringHistory, data)
+
+
+@batch_router.post("/fertilizing/batch", response_model=HistoryBatchResponse, status_code=201)
+async def create_fertilizing_batch(data: FertilizingBatchCreate, db: Session = Depends(get_db)):
+    """Fertiliser toutes les plantes sélectionnées (plant_ids, location_id, tag_id)"""
+    return HistoryService.create_batch(db, FertilizingHistory, data, data.data)
+
+
+@batch_router.patch("/fertilizing/batch", response_model=HistoryBatchResponse)
+async def update_fertilizing_batch(data: FertilizingBatchUpdate, db: Session = Depends(get_db)):
+    """Mettre à jour des fertilisations (ids, ou plantes sélectionnées + date)"""
+    try:
+        return HistoryService.update_batch(db, FertilizingHistory, data, data.data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@batch_router.post("/fertilizing/batch/delete", response_model=HistoryBatchResponse)
+async def delete_fertilizing_batch(data: HistoryBatchTarget, db: Session = Depends(get_db)):
+    """Supprimer des fertilisations (ids, ou plantes sélectionnées + date)"""
+    return HistoryService.delete_batch(db, FertilizingHistory, data)
@@ -0,0 +1,42 @@
+"""
+Routes pour l'import en masse (CSV, NDJSON)
+"""
+
+import io
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.utils.db import get_db
+from app.schemas.import_schema import ImportReport
+from app.services.import_service import ImportService
+
+router = APIRouter(prefix="/api/imports", tags=["imports"])
+
+
+@router.post("", response_model=ImportReport)
+async def import_file(
+    file: UploadFile = File(...),
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="csv ou ndjson"),
+    kind: str = Query("plants", description="plants, watering, fertilizing, repotting, disease, notes"),
+    db: Session = Depends(get_db),
+):
+    """
+    Importe un fichier de plantes (ou d'historiques) par lots
+    - plants: colonnes de PlantCreate; NDJSON de /api/exports accepté (historiques imbriqués)
+    - historiques: colonnes du schéma de création + plant_id ou plant_reference
+    Les lignes invalides sont listées dans errors sans interrompre l'import.
+    """
+    if kind not in ImportService.KINDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Type inconnu: {kind} (valeurs: {', '.join(ImportService.KINDS)})"
+        )
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return await run_in_threadpool(ImportService.import_stream, db, stream, format, kind)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Fichier non UTF-8")
+    finally:
+        stream.detach()
@@ -193,5 +193,5 @@ async def list_seasons(
 ):
     """Récupère toutes les saisons"""
     seasons = SettingsService.get_seasons(db)
-    return [{"id": s.id, "name": s.name, "start_month": s.start_month, "end_month": s.end_month, "description": s.description} for s in seasons]
+    return [{"id": s.id, "name": s.name, "start_month": s.start_month, "end_month": s.end_month, "watering_factor": s.watering_factor, "description": s.description} for s in seasons]
 
@@ -0,0 +1,22 @@
+"""
+Endpoint FastAPI des métriques de performance (format d'exposition Prometheus)
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.utils.metrics import registry
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Histogrammes par route depuis le démarrage: durée, requêtes SQL (nombre et
+    temps cumulé), taille des réponses
+    Un nombre de requêtes SQL élevé sur une route signale un N+1
+    """
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
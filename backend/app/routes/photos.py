@@ -2,37 +2,50 @@
 Routes pour la gestion des photos
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Path as PathParam, Query
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Path as PathParam, Query, Request, Response
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from pathlib import Path
+from typing import Optional
 import logging
+import time
 
 from app.utils.db import get_db
 from app.models.plant import Plant
 from app.models.photo import Photo as PhotoModel
-from app.schemas.photo_schema import PhotoResponse, PhotoUploadResponse
+from app.schemas.photo_schema import PhotoResponse, PhotoUploadResponse, PhotoJobResponse, PhotoSpriteResponse
 from app.services.photo_service import PhotoService
+from app.services.photo_job_service import PhotoJobService, UploadTooLarge
+from app.services.photo_sprite_service import PhotoSpriteService
+from app.utils.image_workers import image_pool, ImagePoolSaturated, ImagePoolTimeout
+from app.utils.http_cache import cached_file_response, strong_etag
+from app.utils.derived_cache import derived_cache
+from app.utils.image_processor import VARIANT_ALIASES, VARIANT_WIDTHS, render_variant, resolve_variant
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/plants", tags=["photos"])
 files_router = APIRouter(tags=["files"])
+jobs_router = APIRouter(prefix="/api/photo-jobs", tags=["photo-jobs"])
+sprites_router = APIRouter(prefix="/api/photo-sprites", tags=["photo-sprites"])
 
 
 @router.post("/{plant_id}/photos", response_model=PhotoUploadResponse, status_code=201)
 async def upload_photo(
+    response: Response,
     plant_id: int = PathParam(..., gt=0),
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
     """
     Télécharge une photo pour une plante avec UUID
-    - Convertit en WebP
+    - Convertit en WebP (dans le pool d'images, hors boucle d'événements)
     - Génère versions (large, medium, thumbnail)
     - Stocke les métadonnées en DB
+    - 503 + Retry-After si le pool d'images est saturé
+    - Durées par étape dans l'en-tête Server-Timing
     """
     # Vérifier que la plante existe
     plant = db.query(Plant).filter(Plant.id == plant_id).first()
@@ -40,28 +53,57 @@ async def upload_photo(
         raise HTTPException(status_code=404, detail="Plante non trouvée")
     
     # Lire le fichier
+    started = time.perf_counter()
     try:
         file_content = await file.read()
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Erreur lecture fichier: {str(e)}")
+    read_ms = round((time.perf_counter() - started) * 1000, 2)
     
-    # Traiter l'upload avec PhotoService (utilise UUID)
-    success, photo, msg = PhotoService.process_upload(
-        plant_id=plant_id,
-        file_content=file_content,
-        filename=file.filename or "photo.jpg",
-        db=db,
-    )
+    quota_error = PhotoService.check_quota(plant_id)
+    if quota_error:
+        raise HTTPException(status_code=400, detail=quota_error)
+    
+    # Encodage WebP dans le pool d'images
+    started = time.perf_counter()
+    try:
+        encoded = await image_pool.run(PhotoService.encode_upload, file_content)
+    except ImagePoolSaturated as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except ImagePoolTimeout as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    timings = {"read": read_ms}
+    # Attente dans la file + transfert vers le worker = total - temps de travail
+    worker_ms = sum(encoded["timings"].values())
+    timings["queue"] = round(max((time.perf_counter() - started) * 1000 - worker_ms, 0), 2)
+    
+    if not encoded["ok"]:
+        raise HTTPException(status_code=400, detail=encoded["message"])
+    
+    success, photo, msg = PhotoService.save_upload(plant_id, encoded, db)
+    timings.update(encoded["timings"])
     
     if not success:
         raise HTTPException(status_code=400, detail=msg)
     
+    response.headers["Server-Timing"] = ", ".join(
+        f"{name};dur={duration}" for name, duration in timings.items()
+    )
+    logger.info(f"Upload photo {photo.id} (plante {plant_id}): {timings}")
+    
     # Construire la réponse avec URLs
     response_data = {
         'id': photo.id,
         'plant_id': photo.plant_id,
         'filename': photo.filename,
         'file_size': photo.file_size,
+        'width': photo.width,
+        'height': photo.height,
         'is_primary': photo.is_primary,
         'created_at': photo.created_at,
         'updated_at': photo.updated_at,
@@ -75,6 +117,55 @@ async def upload_photo(
     return response_data
 
 
+@router.post("/{plant_id}/photos/jobs", response_model=PhotoJobResponse, status_code=202)
+async def ingest_photo(
+    background_tasks: BackgroundTasks,
+    plant_id: int = PathParam(..., gt=0),
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
+    """
+    Ingestion asynchrone d'une photo
+    - Stocke l'upload brut et répond 202 immédiatement avec l'id de la tâche
+    - L'encodage WebP + thumbnail est fait en tâche de fond
+    - Suivi via GET /api/photo-jobs/{job_id}
+    """
+    plant = db.query(Plant).filter(Plant.id == plant_id).first()
+    if not plant:
+        raise HTTPException(status_code=404, detail="Plante non trouvée")
+    
+    if PhotoJobService.count_active(db) >= settings.PHOTO_JOBS_MAX_PENDING:
+        raise HTTPException(
+            status_code=503,
+            detail="Trop de photos en cours de traitement",
+            headers={"Retry-After": "5"},
+        )
+    
+    try:
+        job = await run_in_threadpool(
+            PhotoJobService.create_job, db, plant_id, file.file, file.filename
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Erreur lecture fichier: {str(e)}")
+    
+    background_tasks.add_task(PhotoJobService.process_job, job.id, db.get_bind())
+    return job
+
+
+@jobs_router.get("/{job_id}", response_model=PhotoJobResponse)
+async def get_photo_job(
+    job_id: int = PathParam(..., gt=0),
+    db: Session = Depends(get_db)
+):
+    """État d'une tâche d'ingestion (pending, processing, done, failed)"""
+    job = PhotoJobService.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Tâche non trouvée")
+    return job
+
+
 @router.get("/{plant_id}/photos", response_model=list[PhotoResponse])
 async def get_photos(
     plant_id: int = PathParam(..., gt=0),
@@ -184,32 +275,117 @@ async def reorder_photos(
 
 @files_router.get("/api/photos/{plant_id}/{filename}")
 async def get_photo_file(
+    request: Request,
     plant_id: int,
     filename: str,
     thumb: bool = Query(False),
+    size: Optional[str] = Query(None, description="thumb, medium, large ou largeur (150, 400, 800, 1200)"),
     db: Session = Depends(get_db)
 ):
-    """Servir le fichier photo WebP ou thumbnail"""
-    # Vérifier que la photo existe en DB
-    photo = db.query(PhotoModel).filter(
-        PhotoModel.plant_id == plant_id,
-        PhotoModel.filename == filename
-    ).first()
+    """
+    Servir le fichier photo WebP, sa thumbnail ou une variante de taille
+    - Noms UUID, contenu immuable: ETag fort + Cache-Control immutable
+    - 304 sur If-None-Match, requêtes Range (206)
+    - Vérification DB ignorée pour les fichiers déjà confirmés
+    - ?size=: variante rendue au premier accès puis servie depuis le cache disque
+    """
+    width = None
+    if size in ("thumb", "thumbnail"):
+        thumb = True
+    elif size is not None:
+        width = resolve_variant(size)
+        thumb = False  # Variante rendue depuis la photo pleine taille
+        if width is None:
+            allowed = ", ".join(["thumb", *VARIANT_ALIASES, *map(str, VARIANT_WIDTHS)])
+            raise HTTPException(status_code=400, detail=f"Taille invalide (valeurs: {allowed})")
     
-    if not photo:
-        raise HTTPException(status_code=404, detail="Photo non trouvée")
+    if not PhotoService.is_known_file(plant_id, filename):
+        photo = db.query(PhotoModel.id).filter(
+            PhotoModel.plant_id == plant_id,
+            PhotoModel.filename == filename
+        ).first()
+        
+        if not photo:
+            raise HTTPException(status_code=404, detail="Photo non trouvée")
+        PhotoService.remember_file(plant_id, filename)
     
     # Construire le chemin du fichier
     if thumb:
         file_path = settings.PHOTOS_DIR / str(plant_id) / "thumbs" / filename
     else:
         file_path = settings.PHOTOS_DIR / str(plant_id) / filename
+    variant = "thumb" if thumb else "full"
     
-    if not file_path.exists():
+    try:
+        if width is not None:
+            if not file_path.exists():
+                raise FileNotFoundError(file_path)
+            source_path = str(file_path)
+            file_path = await derived_cache.get_or_render(
+                derived_cache.path_for(plant_id, filename, width),
+                lambda: image_pool.run(render_variant, source_path, width),
+            )
+            variant = f"w{width}"
+        file_size = file_path.stat().st_size
+        etag = strong_etag(Path(filename).stem, variant, file_size)
+        return cached_file_response(request, file_path, etag, "image/webp", filename=filename)
+    except FileNotFoundError:
+        PhotoService.forget_file(plant_id, filename)
         raise HTTPException(status_code=404, detail="Fichier non trouvé")
+    except ImagePoolSaturated as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except ImagePoolTimeout as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@sprites_router.get("", response_model=PhotoSpriteResponse)
+async def get_photo_sprite(
+    plant_ids: str = Query(..., description="Ids des plantes de la page, séparés par des virgules"),
+    db: Session = Depends(get_db)
+):
+    """
+    Sprite des thumbnails principales d'une page de plantes
+    - Une image WebP (url) + les coordonnées de chaque plante
+    - Sprite mis en cache par hash de ses membres (photo, updated_at)
+    """
+    try:
+        ids = list(dict.fromkeys(int(value) for value in plant_ids.split(",") if value.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="plant_ids: entiers séparés par des virgules")
+    if not ids:
+        raise HTTPException(status_code=400, detail="plant_ids requis")
+    if len(ids) > PhotoSpriteService.MAX_PLANTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximum {PhotoSpriteService.MAX_PLANTS} plantes par sprite"
+        )
     
-    return FileResponse(
-        path=file_path,
-        media_type="image/webp",
-        filename=filename
-    )
+    try:
+        return await PhotoSpriteService.build(db, ids)
+    except ImagePoolSaturated as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except ImagePoolTimeout as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@sprites_router.get("/{key}.webp")
+async def get_photo_sprite_file(
+    request: Request,
+    key: str = PathParam(..., pattern="^[0-9a-f]{32}$"),
+):
+    """Servir l'image d'un sprite (contenu adressé par hash: immuable)"""
+    sprite_path = PhotoSpriteService.sprite_path(key)
+    if not derived_cache.lookup(sprite_path):
+        raise HTTPException(status_code=404, detail="Sprite non trouvé, redemander la carte")
+    try:
+        return cached_file_response(request, sprite_path, strong_etag(key), "image/webp")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Sprite non trouvé, redemander la carte")
@@ -3,12 +3,17 @@ Endpoints FastAPI pour les plantes
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 
-from app.utils.db import get_db
-from app.schemas.plant_schema import PlantCreate, PlantUpdate, PlantResponse, PlantListResponse
+from app.utils.db import get_async_db, get_db
+from app.schemas.plant_schema import PlantCreate, PlantUpdate, PlantResponse, PlantListResponse, PlantPage
 from app.services import PlantService
+from app.services.plant_service import AsyncPlantService
+from app.services.watering_schedule_service import AsyncWateringScheduleService
 
 
 router = APIRouter(
@@ -16,25 +21,140 @@ router = APIRouter(
     tags=["plants"],
 )
 
+# Paramètres communs de pagination par curseur
+AFTER_QUERY = Query(None, description="Curseur keyset (next_cursor de la page précédente)")
+CURSOR_QUERY = Query(False, description="Réponse paginée {items, next_cursor} au lieu d'une liste")
+SORT_QUERY = Query("id", pattern="^(id|name)$", description="Clé de tri")
+INCLUDE_QUERY = Query(None, description="Données liées à inclure, séparées par des virgules: primary_photo")
+FIELDS_QUERY = Query(None, description="Colonnes à retourner, séparées par des virgules (id toujours inclus)")
+
+# Données liées disponibles via ?include=
+INCLUDES = {"primary_photo"}
+
+
+def _requested_includes(include: Optional[str]) -> set:
+    """Noms demandés via ?include= (400 si inconnus)"""
+    requested = {name.strip() for name in (include or "").split(",") if name.strip()}
+    unknown = requested - INCLUDES
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"include inconnu: {', '.join(sorted(unknown))} (valeurs: {', '.join(sorted(INCLUDES))})"
+        )
+    return requested
+
+
+def _with_includes(db: Session, plants: list, include: Optional[str]) -> list:
+    """Charge les données liées demandées via ?include= (une requête par inclusion)"""
+    if "primary_photo" in _requested_includes(include):
+        PlantService.attach_primary_photos(db, plants)
+    return plants
+
+
+async def _with_includes_async(db: AsyncSession, plants: list, include: Optional[str]) -> list:
+    """Voir _with_includes (AsyncSession)"""
+    if "primary_photo" in _requested_includes(include):
+        await AsyncPlantService.attach_primary_photos(db, plants)
+    return plants
+
+
+def _paginated(
+    fetch,
+    limit: int,
+    sort: str,
+    after: Optional[str],
+    cursor: bool,
+    db: Optional[Session] = None,
+    include: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """
+    Exécute fetch() et construit la réponse selon le mode de pagination
+    
+    - mode offset (défaut): liste simple, compatible avec les anciens clients
+    - mode curseur (after ou cursor=true): {items, next_cursor}
+    - include: données liées chargées pour toute la page (voir _with_includes)
+    - fields: fetch() retourne des dicts partiels, envoyés sans passer par
+      PlantListResponse (voir _projected)
+    """
+    try:
+        plants = fetch()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if include:
+        _with_includes(db, plants, include)
+    
+    return _page(plants, limit, sort, after, cursor, fields)
+
+
+async def _paginated_async(
+    fetch,
+    limit: int,
+    sort: str,
+    after: Optional[str],
+    cursor: bool,
+    db: Optional[AsyncSession] = None,
+    include: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """Voir _paginated (fetch() retourne une coroutine AsyncPlantService)"""
+    try:
+        plants = await fetch()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if include:
+        await _with_includes_async(db, plants, include)
+    
+    return _page(plants, limit, sort, after, cursor, fields)
+
+
+def _page(plants: list, limit: int, sort: str, after: Optional[str], cursor: bool, fields: Optional[str]):
+    """Réponse selon le mode de pagination (liste simple ou {items, next_cursor})"""
+    if after is None and not cursor:
+        return _projected(plants) if fields else plants
+    
+    page = {
+        "items": plants,
+        "next_cursor": PlantService.next_cursor(plants, limit, sort),
+    }
+    return _projected(page) if fields else page
+
+
+def _projected(content) -> JSONResponse:
+    """Réponse directe pour les projections (fields=): pas de validation Pydantic"""
+    return JSONResponse(jsonable_encoder(content))
+
 
 # ===== ROUTES SANS PARAMÈTRES D'ID (à placer AVANT /{plant_id}) =====
 
-@router.get("", response_model=List[PlantListResponse])
+@router.get("", response_model=Union[PlantPage, List[PlantListResponse]])
 async def list_plants(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     archived: bool = Query(False, description="Inclure les plantes archivées"),
-    db: Session = Depends(get_db),
+    after: Optional[str] = AFTER_QUERY,
+    cursor: bool = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    include: Optional[str] = INCLUDE_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Récupère la liste des plantes avec pagination"""
-    plants = PlantService.get_all(
-        db,
-        skip=skip,
-        limit=limit,
-        include_archived=archived,
-        include_deleted=False,
+    """Récupère la liste des plantes avec pagination (offset ou curseur)"""
+    return await _paginated_async(
+        lambda: AsyncPlantService.get_all(
+            db,
+            skip=skip,
+            limit=limit,
+            include_archived=archived,
+            include_deleted=False,
+            after=after,
+            sort=sort,
+            fields=PlantService.parse_fields(fields, sort),
+        ),
+        limit, sort, after, cursor, db=db, include=include, fields=fields,
     )
-    return plants
 
 
 @router.post("", response_model=PlantResponse, status_code=201)
@@ -81,58 +201,91 @@ async def generate_reference(
         raise HTTPException(status_code=500, detail=f"Erreur génération référence: {str(e)}")
 
 
-@router.get("/archived", response_model=List[PlantListResponse])
+@router.get("/archived", response_model=Union[PlantPage, List[PlantListResponse]])
 async def get_archived_plants(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = AFTER_QUERY,
+    cursor: bool = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    include: Optional[str] = INCLUDE_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
     db: Session = Depends(get_db),
 ):
     """Récupère les plantes archivées"""
-    plants = PlantService.get_archived(db, skip=skip, limit=limit)
-    return plants
+    return _paginated(
+        lambda: PlantService.get_archived(
+            db, skip=skip, limit=limit, after=after, sort=sort,
+            fields=PlantService.parse_fields(fields, sort),
+        ),
+        limit, sort, after, cursor, db=db, include=include, fields=fields,
+    )
 
 
-@router.get("/search", response_model=List[PlantListResponse])
+@router.get("/search", response_model=Union[PlantPage, List[PlantListResponse]])
 async def search_plants_endpoint(
     q: str = Query(..., min_length=1, description="Terme de recherche"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    after: Optional[str] = AFTER_QUERY,
+    cursor: bool = CURSOR_QUERY,
+    sort: str = Query("relevance", pattern="^(relevance|id|name)$", description="Clé de tri"),
+    include: Optional[str] = INCLUDE_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Recherche full-text dans name, scientific_name, description"""
-    plants = PlantService.search(db, q, skip=skip, limit=limit)
-    return plants
+    """Recherche full-text (FTS5, préfixes, sans accents) dans name, scientific_name, description"""
+    return await _paginated_async(
+        lambda: AsyncPlantService.search(
+            db, q, skip=skip, limit=limit, after=after, sort=sort,
+            fields=PlantService.parse_fields(fields, sort),
+        ),
+        limit, sort, after, cursor, db=db, include=include, fields=fields,
+    )
 
 
-@router.get("/filter", response_model=List[PlantListResponse])
+@router.get("/filter", response_model=Union[PlantPage, List[PlantListResponse]])
 async def filter_plants_endpoint(
     location_id: int = Query(None),
     difficulty: str = Query(None),
     health_status: str = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = AFTER_QUERY,
+    cursor: bool = CURSOR_QUERY,
+    sort: str = SORT_QUERY,
+    include: Optional[str] = INCLUDE_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
     db: Session = Depends(get_db),
 ):
     """Filtre avancé: localisation, difficulté, santé"""
-    plants = PlantService.filter_plants(
-        db,
-        location_id=location_id,
-        difficulty=difficulty,
-        health_status=health_status,
-        skip=skip,
-        limit=limit
+    return _paginated(
+        lambda: PlantService.filter_plants(
+            db,
+            location_id=location_id,
+            difficulty=difficulty,
+            health_status=health_status,
+            skip=skip,
+            limit=limit,
+            after=after,
+            sort=sort,
+            fields=PlantService.parse_fields(fields, sort),
+        ),
+        limit, sort, after, cursor, db=db, include=include, fields=fields,
     )
-    return plants
 
 
 @router.get("/to-water", response_model=List[dict])
 async def plants_to_water_endpoint(
-    days_ago: int = Query(0, ge=0, description="Jours depuis dernier arrosage"),
-    db: Session = Depends(get_db),
+    days_ago: int = Query(0, ge=0, description="Jours depuis dernier arrosage (plantes sans fréquence)"),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Plantes à arroser: jamais arrosées ou arrosées il y a N jours"""
-    plants = PlantService.get_plants_to_water(db, days_ago=days_ago)
-    return plants
+    """
+    Plantes à arroser aujourd'hui: jamais arrosées, ou dont la prochaine date
+    (fréquence × saison) est atteinte. Les plantes sans fréquence d'arrosage
+    gardent la règle "arrosées il y a days_ago jours ou plus".
+    """
+    return await AsyncWateringScheduleService.get_due(db, horizon_days=0, fallback_days=days_ago)
 
 
 @router.get("/to-fertilize", response_model=List[dict])
@@ -147,11 +300,17 @@ async def plants_to_fertilize_endpoint(
 
 @router.get("/favorites", response_model=List[PlantListResponse])
 async def get_favorite_plants(
+    include: Optional[str] = INCLUDE_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
     db: Session = Depends(get_db),
 ):
     """Récupère les plantes favorites"""
-    plants = PlantService.get_favorites(db)
-    return plants
+    try:
+        plants = PlantService.get_favorites(db, fields=PlantService.parse_fields(fields, "name"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    _with_includes(db, plants, include)
+    return _projected(plants) if fields else plants
 
 
 # ===== ROUTES AVEC PARAMÈTRES D'ID (à placer APRÈS les routes sans params) =====
@@ -221,11 +380,8 @@ async def regenerate_reference(
                 detail="La plante doit avoir une famille pour régénérer la référence"
             )
         
-        # Générer nouvelle référence
-        new_reference = PlantService.generate_reference(db, plant.family)
-        
-        # Mettre à jour la plante
-        plant.reference = new_reference
+        # Générer et écrire la nouvelle référence (séquence resynchronisée si déjà prise)
+        PlantService.assign_reference(db, plant, plant.family)
         db.commit()
         db.refresh(plant)
         
@@ -2,18 +2,21 @@
 Endpoints FastAPI pour les statistiques et le dashboard
 """
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import date, timedelta
 
-from app.utils.db import get_db
-from app.services.stats_service import StatsService
+from app.utils.db import get_async_db, get_db
+from app.services.stats_service import AsyncStatsService, StatsService
+from app.services.watering_schedule_service import WateringScheduleService
 
 router = APIRouter(prefix="/api/statistics", tags=["statistics"])
 
 
 @router.get("/dashboard", response_model=dict)
-async def get_dashboard_stats(db: Session = Depends(get_db)):
+async def get_dashboard_stats(db: AsyncSession = Depends(get_async_db)):
     """
     Récupère les 7 KPI du dashboard
     Retourne: {
@@ -22,7 +25,22 @@ async def get_dashboard_stats(db: Session = Depends(get_db)):
         total_photos
     }
     """
-    return StatsService.get_dashboard_stats(db)
+    return await AsyncStatsService.get_dashboard_stats(db)
+
+
+@router.get("/counters/check", response_model=dict)
+async def check_stats_counters(db: Session = Depends(get_db)):
+    """
+    Vérifie la cohérence de la table plant_stats avec les tables sources
+    Retourne: {consistent, counters, actual, drift}
+    """
+    return StatsService.check_counters(db)
+
+
+@router.post("/counters/rebuild", response_model=dict)
+async def rebuild_stats_counters(db: Session = Depends(get_db)):
+    """Recalcule la table plant_stats depuis les tables sources"""
+    return StatsService.rebuild_counters(db)
 
 
 @router.get("/upcoming-waterings", response_model=List[dict])
@@ -32,11 +50,31 @@ async def get_upcoming_waterings(
 ):
     """
     Plantes à arroser dans N jours
-    Retourne les plantes jamais arrosées + celles arrosées il y a N jours ou plus
+    Retourne les plantes jamais arrosées + celles dont la prochaine date d'arrosage
+    (fréquence × coefficient saisonnier) tombe dans les N jours.
+    Plantes sans fréquence: arrosées il y a N jours ou plus.
     """
     return StatsService.get_upcoming_waterings(db, days)
 
 
+@router.get("/watering-agenda", response_model=List[dict])
+async def get_watering_agenda(
+    start: Optional[date] = Query(None, description="Début (défaut: aujourd'hui)"),
+    end: Optional[date] = Query(None, description="Fin incluse (défaut: start + 6 jours)"),
+    db: Session = Depends(get_db),
+):
+    """
+    Agenda des arrosages prévus sur une période
+    Retourne: [{date, plants: [{id, name, overdue_days}]}]
+    """
+    start = start or date.today()
+    end = end or start + timedelta(days=6)
+    try:
+        return WateringScheduleService.get_agenda(db, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/upcoming-fertilizing", response_model=List[dict])
 async def get_upcoming_fertilizing(
     days: int = Query(7, ge=0, le=365, description="Nombre de jours à vérifier"),
@@ -0,0 +1,18 @@
+"""
+Pydantic schemas pour les exports de la collection
+"""
+
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class ExportResponse(BaseModel):
+    """Schéma pour l'état d'un export écrit dans EXPORTS_DIR"""
+    
+    filename: str
+    status: str = Field(..., description="running, done ou failed")
+    size: Optional[int] = Field(None, description="Taille en octets (export terminé)")
+    created_at: Optional[datetime] = None
+    error: Optional[str] = None
+    url: str = Field(..., description="Téléchargement (si terminé) ou suivi de l'export")
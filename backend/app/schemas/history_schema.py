@@ -1,5 +1,5 @@
-from pydantic import BaseModel, field_validator
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Optional
 from datetime import datetime, date
 from app.utils.validators import validate_not_future_date
 
@@ -197,3 +197,71 @@ class PlantHistoryResponse(BaseModel):
     category: Optional[str]
     created_at: datetime
     deleted_at: Optional[datetime] = None
+
+
+# ===== OPÉRATIONS GROUPÉES =====
+
+# Alias: un champ nommé "date" masque le type date dans les sous-classes
+OptionalDate = Optional[date]
+
+
+class HistoryBatchSelection(BaseModel):
+    """
+    Plantes ciblées par une opération groupée (critères combinés en ET)
+    Plantes supprimées et archivées exclues
+    """
+    plant_ids: Optional[List[int]] = Field(None, max_length=5000)
+    location_id: Optional[int] = None
+    tag_id: Optional[int] = None
+
+    def has_plant_criteria(self) -> bool:
+        return self.plant_ids is not None or self.location_id is not None or self.tag_id is not None
+
+
+class HistoryBatchTarget(HistoryBatchSelection):
+    """
+    Entrées ciblées par une suppression/mise à jour groupée:
+    ids d'entrées, ou plantes sélectionnées + date des entrées
+    """
+    ids: Optional[List[int]] = Field(None, max_length=5000)
+    date: OptionalDate = None
+
+    @model_validator(mode='after')
+    def validate_target(self):
+        if self.ids is None and not (self.has_plant_criteria() and self.date is not None):
+            raise ValueError("ids, ou un critère de plantes (plant_ids, location_id, tag_id) avec date, requis")
+        return self
+
+
+class WateringBatchCreate(HistoryBatchSelection):
+    data: WateringHistoryCreate
+
+    @model_validator(mode='after')
+    def validate_selection(self):
+        if not self.has_plant_criteria():
+            raise ValueError("plant_ids, location_id ou tag_id requis")
+        return self
+
+
+class FertilizingBatchCreate(HistoryBatchSelection):
+    data: FertilizingHistoryCreate
+
+    @model_validator(mode='after')
+    def validate_selection(self):
+        if not self.has_plant_criteria():
+            raise ValueError("plant_ids, location_id ou tag_id requis")
+        return self
+
+
+class WateringBatchUpdate(HistoryBatchTarget):
+    data: WateringHistoryUpdate
+
+
+class FertilizingBatchUpdate(HistoryBatchTarget):
+    data: FertilizingHistoryUpdate
+
+
+class HistoryBatchResponse(BaseModel):
+    """Résultat d'une opération groupée"""
+    count: int
+    plant_ids: List[int]
@@ -0,0 +1,23 @@
+"""
+Schémas pour l'import en masse
+"""
+
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+
+class ImportRowError(BaseModel):
+    """Ligne rejetée (numéro de ligne du fichier)"""
+    row: int
+    errors: List[str]
+
+
+class ImportReport(BaseModel):
+    """Rapport d'import"""
+    kind: str
+    total_rows: int
+    imported: Dict[str, int]
+    error_count: int
+    errors: List[ImportRowError]
+    elapsed_ms: float
+    rows_per_second: Optional[int] = None
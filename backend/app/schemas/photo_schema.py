@@ -3,7 +3,7 @@ Pydantic schemas pour Photo CRUD
 """
 
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -30,3 +30,45 @@ class PhotoUploadResponse(PhotoResponse):
     
     model_config = ConfigDict(from_attributes=True)
 
+
+
+class PhotoJobResponse(BaseModel):
+    """Schéma pour l'état d'une tâche d'ingestion de photo"""
+    
+    id: int
+    plant_id: int
+    status: str = Field(..., description="pending, processing, done ou failed")
+    original_filename: Optional[str] = None
+    upload_size: int
+    photo_id: Optional[int] = None
+    photo: Optional[PhotoResponse] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PhotoSpriteTile(BaseModel):
+    """Position de la thumbnail d'une plante dans le sprite"""
+    
+    plant_id: int
+    photo_id: int
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+class PhotoSpriteResponse(BaseModel):
+    """Carte d'un sprite de thumbnails (photos principales d'une page de plantes)"""
+    
+    key: Optional[str] = Field(None, description="Hash du contenu, None si aucune thumbnail")
+    url: Optional[str] = Field(None, description="URL de l'image WebP du sprite")
+    tile_size: int
+    columns: int
+    width: int
+    height: int
+    tiles: List[PhotoSpriteTile]
+    missing: List[int] = Field(default_factory=list, description="Plantes sans thumbnail")
@@ -3,8 +3,8 @@ Pydantic schemas pour Plant CRUD (Pydantic v2 with model_validator)
 """
 
 from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
-from typing import Optional
-from datetime import datetime
+from typing import List, Optional
+from datetime import date, datetime
 
 
 class PlantCreate(BaseModel):
@@ -141,12 +141,26 @@ class PlantResponse(BaseModel):
     archived_date: Optional[datetime] = None
     archived_reason: Optional[str] = None
     deleted_at: Optional[datetime] = None
+    last_watered_at: Optional[date] = None
+    last_fertilized_at: Optional[date] = None
+    last_repotted_at: Optional[date] = None
     created_at: datetime
     updated_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
 
 
+class PlantPrimaryPhoto(BaseModel):
+    """Photo principale d'une plante dans les listes (include=primary_photo)"""
+    
+    id: int
+    filename: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    url: str
+    thumb_url: str
+
+
 class PlantListResponse(BaseModel):
     """Schéma pour les réponses de liste (sans toutes les infos)"""
     
@@ -159,5 +173,15 @@ class PlantListResponse(BaseModel):
     is_favorite: bool
     is_archived: bool
     created_at: datetime
+    primary_photo: Optional[PlantPrimaryPhoto] = Field(
+        None, description="Photo principale (seulement avec include=primary_photo)"
+    )
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class PlantPage(BaseModel):
+    """Page de plantes en pagination par curseur (keyset)"""
+    
+    items: List[PlantListResponse]
+    next_cursor: Optional[str] = Field(None, description="Curseur à passer en ?after= pour la page suivante")
@@ -0,0 +1,162 @@
+"""
+Benchmark: latence des routes de lecture sous 50 clients parallèles, Session vs AsyncSession
+
+- sync: route async def + Session synchrone (comportement avant get_async_db):
+  chaque requête SQL bloque la boucle d'événements, une requête à la fois
+- async: route async def + AsyncSession (aiosqlite): la boucle reste libre
+  pendant les requêtes SQL, exécutées en parallèle (WAL, pool de connexions)
+
+Chaque mode a son propre serveur uvicorn (create_app, même base temporaire):
+en mode sync, dès que plus de clients que de connexions du pool attendent,
+les requêtes bloquées sur la boucle retiennent les connexions que seule la
+boucle peut rendre (QueuePool TimeoutError après DB_POOL_TIMEOUT), ce qui
+fausserait la mesure suivante. Les clients httpx envoient des requêtes en
+continu pendant --seconds secondes par route; une requête sans réponse après
+--timeout secondes compte comme une erreur.
+
+Usage (depuis backend/):
+    python -m app.scripts.bench_async_concurrency [--plants 5000] [--clients 50] [--seconds 5]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+PORT = 8765
+ROUTES = {
+    "list": "/{mode}/plants?limit=50&sort=name",
+    "search": "/{mode}/search?q=floraison&limit=20",
+    "dashboard": "/{mode}/dashboard",
+}
+
+
+def create_app():
+    """Application de mesure: mêmes services que les routes, en sync et en async"""
+    from fastapi import Depends, FastAPI
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import Session
+
+    from app.services.plant_service import AsyncPlantService, PlantService
+    from app.services.stats_service import AsyncStatsService, StatsService
+    from app.utils.db import get_async_db, get_db
+
+    bench_app = FastAPI()
+
+    @bench_app.get("/sync/plants")
+    async def sync_plants(db: Session = Depends(get_db)):
+        return len(PlantService.get_all(db, limit=50, sort="name"))
+
+    @bench_app.get("/async/plants")
+    async def async_plants(db: AsyncSession = Depends(get_async_db)):
+        return len(await AsyncPlantService.get_all(db, limit=50, sort="name"))
+
+    @bench_app.get("/sync/search")
+    async def sync_search(q: str, limit: int, db: Session = Depends(get_db)):
+        return len(PlantService.search(db, q, limit=limit))
+
+    @bench_app.get("/async/search")
+    async def async_search(q: str, limit: int, db: AsyncSession = Depends(get_async_db)):
+        return len(await AsyncPlantService.search(db, q, limit=limit))
+
+    @bench_app.get("/sync/dashboard")
+    async def sync_dashboard(db: Session = Depends(get_db)):
+        return StatsService.get_dashboard_stats(db)
+
+    @bench_app.get("/async/dashboard")
+    async def async_dashboard(db: AsyncSession = Depends(get_async_db)):
+        return await AsyncStatsService.get_dashboard_stats(db)
+
+    return bench_app
+
+
+async def load(url: str, clients: int, seconds: float, timeout: float) -> dict:
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+
+    async def client_loop(http: httpx.AsyncClient):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await http.get(url)
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - started) * 1000)
+            except httpx.HTTPError:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=timeout) as http:
+        await asyncio.gather(*(client_loop(http) for _ in range(clients)))
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / seconds,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+def wait_ready(server: subprocess.Popen) -> None:
+    for _ in range(200):
+        if server.poll() is not None:
+            raise RuntimeError("Le serveur de mesure s'est arrêté")
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/docs", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError("Le serveur de mesure ne répond pas")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plants", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        os.environ["DATABASE_URL"] = url
+        from app.scripts.bench_plant_fields import populate
+        from app.utils.db import init_db, make_engine
+
+        engine = make_engine(url)
+        init_db(engine)
+        populate(engine, args.plants)
+        engine.dispose()
+
+        print(f"🌱 {args.plants} plantes, {args.clients} clients parallèles, {args.seconds:.0f} s par mesure")
+        print(f"{'route':<10} {'mode':<6} {'req/s':>8} {'p50':>9} {'p99':>9} {'erreurs':>8}")
+        for mode in ("async", "sync"):
+            server = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "--factory", "app.scripts.bench_async_concurrency:create_app",
+                 "--port", str(PORT), "--log-level", "critical"],
+                env={**os.environ, "DATABASE_URL": url},
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            try:
+                wait_ready(server)
+                for name, path in ROUTES.items():
+                    stats = asyncio.run(load(path.format(mode=mode), args.clients, args.seconds, args.timeout))
+                    print(
+                        f"{name:<10} {mode:<6} {stats['rps']:>8.0f} {stats['p50']:>7.1f}ms "
+                        f"{stats['p99']:>7.1f}ms {stats['errors']:>8}"
+                    )
+            finally:
+                server.kill()
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
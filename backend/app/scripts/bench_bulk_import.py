@@ -0,0 +1,103 @@
+"""
+Benchmark: import en masse (ImportService) vs PlantService.create ligne par ligne
+
+- unitaire: PlantService.create par plante (un commit, un generate_reference
+  et une mise à jour de l'index FTS par plante)
+- import: ImportService.import_stream sur un CSV (validation PlantCreate,
+  références pré-allouées, executemany par lots de CHUNK_SIZE)
+
+Base SQLite temporaire; familles réparties sur 50 préfixes.
+
+Usage (depuis backend/):
+    python -m app.scripts.bench_bulk_import [--plants 50000] [--single 2000]
+"""
+
+import argparse
+import csv
+import io
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base
+from app.models.plant_search import ensure_search_index
+from app.schemas.plant_schema import PlantCreate
+from app.services.import_service import ImportService
+from app.services.plant_service import PlantService
+
+
+def make_rows(count: int, seed: int = 42) -> list:
+    """Plantes synthétiques (colonnes d'un CSV d'import)"""
+    rnd = random.Random(seed)
+    return [
+        {
+            "name": f"Plante {i:06d}",
+            "family": f"Famille{i % 50:02d}",
+            "genus": "genus",
+            "species": f"species{i % 500}",
+            "description": "Plante synthétique pour le benchmark d'import",
+            "health_status": rnd.choice(["excellent", "good", "poor"]),
+            "temperature_min": str(rnd.randint(5, 15)),
+            "is_favorite": str(i % 10 == 0).lower(),
+        }
+        for i in range(count)
+    ]
+
+
+def to_csv(rows: list) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def new_session(directory: Path, name: str):
+    engine = create_engine(f"sqlite:///{directory / name}")
+    event.listen(engine, "connect", lambda conn, _: conn.execute("PRAGMA foreign_keys=ON"))
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        ensure_search_index(conn)
+    return engine, sessionmaker(bind=engine)()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plants", type=int, default=50_000, help="Lignes importées en masse")
+    parser.add_argument("--single", type=int, default=2_000, help="Lignes créées une par une")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        print(f"🌱 import de {args.plants} plantes (lots de {ImportService.CHUNK_SIZE}), "
+              f"référence unitaire sur {args.single}")
+        print(f"{'mode':<10} {'lignes':>8} {'secondes':>9} {'lignes/s':>10}")
+
+        engine, db = new_session(directory, "single.db")
+        rows = make_rows(args.single)
+        started = time.perf_counter()
+        for row in rows:
+            PlantService.create(db, PlantCreate.model_validate(row))
+        single = time.perf_counter() - started
+        print(f"{'unitaire':<10} {len(rows):>8} {single:>9.2f} {len(rows) / single:>10.0f}")
+        db.close()
+        engine.dispose()
+
+        engine, db = new_session(directory, "bulk.db")
+        content = to_csv(make_rows(args.plants))
+        started = time.perf_counter()
+        report = ImportService.import_stream(db, io.StringIO(content), "csv")
+        bulk = time.perf_counter() - started
+        assert report["imported"]["plants"] == args.plants, report["errors"][:5]
+        print(f"{'import':<10} {args.plants:>8} {bulk:>9.2f} {args.plants / bulk:>10.0f}")
+        print(f"➡️  import ×{(args.plants / bulk) / (len(rows) / single):.1f}")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
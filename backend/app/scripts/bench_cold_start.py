@@ -0,0 +1,82 @@
+"""
+Benchmark: démarrage à froid du backend (sidecar Tauri)
+
+Chaque essai lance un interpréteur neuf qui importe app.main puis exécute le
+lifespan (bootstrap + reprise des jobs photo) sur une base déjà initialisée,
+comme un relancement de l'application de bureau.
+Affiche aussi les modules les plus coûteux (IMPORT_PROFILING=1) et vérifie que
+PIL n'est pas chargé au démarrage.
+
+Usage (depuis backend/):
+    python -m app.scripts.bench_cold_start [--runs 7] [--top 15]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+CHILD = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+import app.main as main
+imported = time.perf_counter()
+
+async def start():
+    async with main.app.router.lifespan_context(main.app):
+        pass
+
+asyncio.run(start())
+from app.utils import import_profiler
+profiler = import_profiler.get_profiler()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup": main.app.state.startup,
+    "pil_loaded": "PIL" in sys.modules,
+    "modules": profiler.report(limit=int(sys.argv[1])) if profiler else [],
+}))
+"""
+
+
+def run_once(env: dict, top: int) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, str(top)],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{Path(tmp) / 'plants.db'}"}
+        env.pop("IMPORT_PROFILING", None)
+        first = run_once(env, args.top)  # base neuve: schéma + seeds
+        print(f"🌱 premier démarrage: {first['startup']['cold_start_ms']:.0f} ms "
+              f"(bootstrap {first['startup']['bootstrap_status']})")
+
+        runs = [run_once(env, args.top) for _ in range(args.runs)]
+        for key in ("import_ms",):
+            values = [run[key] for run in runs]
+            print(f"{key:<16} médiane {statistics.median(values):7.0f} ms  min {min(values):7.0f} ms")
+        for key in ("bootstrap_ms", "cold_start_ms"):
+            values = [run["startup"][key] for run in runs]
+            print(f"{key:<16} médiane {statistics.median(values):7.0f} ms  min {min(values):7.0f} ms")
+        print(f"PIL chargé au démarrage: {'oui' if any(run['pil_loaded'] for run in runs) else 'non'}")
+
+        profiled = run_once({**env, "IMPORT_PROFILING": "1"}, args.top)
+        print(f"\n{'module':<45} {'propre':>9} {'cumulé':>9}")
+        for entry in profiled["modules"]:
+            print(f"{entry['module']:<45} {entry['self_ms']:>7.1f}ms {entry['cumulative_ms']:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
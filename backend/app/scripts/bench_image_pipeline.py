@@ -0,0 +1,156 @@
+"""
+Benchmark: pipeline d'images "décoder une fois" vs ancien pipeline
+
+- ancien: décodage complet en pleine résolution, puis chaque version
+  (large, medium, thumbnail) redimensionnée depuis l'image pleine taille
+- nouveau: decode_image (draft JPEG: décodage direct à 1/2, 1/4 ou 1/8),
+  puis derive_versions (chaque version depuis la précédente)
+
+Chaque mesure tourne dans un processus neuf: pic de RSS et temps CPU
+(utilisateur + système) ne concernent que le traitement d'une image.
+
+Usage (depuis backend/):
+    python -m app.scripts.bench_image_pipeline [dossier_jpeg] [--limit N] [--encode]
+
+Sans dossier, des JPEG synthétiques (12MP, 6MP, 2MP) sont générés.
+--encode ajoute l'encodage WebP des versions (identique dans les deux pipelines).
+"""
+
+import argparse
+import io
+import multiprocessing
+import resource
+import statistics
+import time
+from pathlib import Path
+from typing import List
+
+from PIL import Image
+
+from app.scripts.bench_webp_targeting import IMAGE_SUFFIXES, synthetic_corpus
+from app.utils.image_processor import (
+    VERSIONS, decode_image, derive_versions, encode_webp_to_target, to_rgb,
+)
+
+
+def synthetic_jpegs() -> List[bytes]:
+    """Photos de téléphone simulées: JPEG qualité 90"""
+    sizes = [(4000, 3000), (3000, 2000), (1600, 1200)]
+    jpegs = []
+    for image in synthetic_corpus(count=8):
+        if image.size not in sizes:
+            continue
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=90)
+        jpegs.append(buffer.getvalue())
+        sizes.remove(image.size)
+    return jpegs
+
+
+def legacy_pipeline(file_content: bytes) -> dict:
+    """Ancien process_image_to_webp: pleine résolution, chaque version depuis l'original"""
+    image = to_rgb(Image.open(io.BytesIO(file_content)))
+    versions = {}
+    for name, config in VERSIONS.items():
+        resized = image.copy()
+        resized.thumbnail(config["size"], Image.LANCZOS)
+        versions[name] = resized
+    return versions
+
+
+def decode_once_pipeline(file_content: bytes) -> dict:
+    """Pipeline actuel: un seul décodage réduit, réductions successives"""
+    sizes = {name: config["size"] for name, config in VERSIONS.items()}
+    image = decode_image(
+        Image.open(io.BytesIO(file_content)),
+        max(sizes.values(), key=lambda size: size[0] * size[1]),
+    )
+    return derive_versions(image, sizes)
+
+
+PIPELINES = {"ancien": legacy_pipeline, "nouveau": decode_once_pipeline}
+
+
+def _peak_rss_kb(reset: bool = False) -> int:
+    """
+    Pic de RSS du processus en Ko
+    Linux: VmHWM, remis à zéro via /proc/self/clear_refs (le ru_maxrss d'un
+    processus spawn hérite du pic du parent); ailleurs: ru_maxrss
+    """
+    try:
+        if reset:
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _measure(pipeline: str, file_content: bytes, encode: bool) -> dict:
+    """Exécuté dans un processus neuf"""
+    baseline_rss = _peak_rss_kb(reset=True)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    cpu_before = usage.ru_utime + usage.ru_stime
+    started = time.perf_counter()
+
+    versions = PIPELINES[pipeline](file_content)
+    if encode:
+        for name, image in versions.items():
+            encode_webp_to_target(image, VERSIONS[name]["max_size"])
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    peak_rss = _peak_rss_kb()
+    return {
+        "wall_ms": (time.perf_counter() - started) * 1000,
+        "cpu_ms": (usage.ru_utime + usage.ru_stime - cpu_before) * 1000,
+        "peak_rss_mb": peak_rss / 1024,
+        "rss_growth_mb": (peak_rss - baseline_rss) / 1024,
+    }
+
+
+def run(corpus: List[bytes], encode: bool) -> dict:
+    """Mesure chaque pipeline sur chaque image, un processus par mesure"""
+    context = multiprocessing.get_context("spawn")
+    results = {name: [] for name in PIPELINES}
+    for file_content in corpus:
+        for name in PIPELINES:
+            with context.Pool(1, maxtasksperchild=1) as pool:
+                results[name].append(pool.apply(_measure, (name, file_content, encode)))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?", type=Path, help="Dossier de photos (sinon JPEG synthétiques)")
+    parser.add_argument("--limit", type=int, default=20, help="Nombre max d'images")
+    parser.add_argument("--encode", action="store_true", help="Inclure l'encodage WebP des versions")
+    args = parser.parse_args()
+
+    if args.directory:
+        paths = sorted(p for p in args.directory.rglob("*") if p.suffix.lower() in IMAGE_SUFFIXES)
+        corpus = [p.read_bytes() for p in paths[:args.limit]]
+    else:
+        corpus = synthetic_jpegs()
+    if not corpus:
+        print("❌ Aucune image trouvée")
+        return
+
+    print(f"📷 {len(corpus)} images, versions: {', '.join(VERSIONS)}"
+          f"{' + encodage WebP' if args.encode else ''}")
+    print(f"{'pipeline':<9} {'ms/photo':>10} {'CPU ms':>10} {'pic RSS Mo':>11} {'+RSS Mo':>9}")
+    for name, measures in run(corpus, args.encode).items():
+        print(
+            f"{name:<9} "
+            f"{statistics.mean(m['wall_ms'] for m in measures):>10.1f} "
+            f"{statistics.mean(m['cpu_ms'] for m in measures):>10.1f} "
+            f"{max(m['peak_rss_mb'] for m in measures):>11.1f} "
+            f"{statistics.mean(m['rss_growth_mb'] for m in measures):>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: listes de plantes complètes vs projection (?fields=)
+
+- complet: objets Plant complets (toutes les colonnes, dont description)
+  puis PlantListResponse (chemin response_model des routes)
+- projection: SELECT limité aux colonnes demandées, lignes en dicts,
+  jsonable_encoder (chemin des routes avec fields=)
+
+Base SQLite temporaire de N plantes (50 000 par défaut, descriptions ~1 Ko),
+parcourue page par page en pagination keyset.
+
+Usage (depuis backend/):
+    python -m app.scripts.bench_plant_fields [--plants 50000] [--page 1000] [--fields id,name,health_status]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base
+from app.models.plant import Plant
+from app.schemas.plant_schema import PlantListResponse
+from app.services.plant_service import PlantService
+
+
+def populate(engine, count: int, seed: int = 42) -> None:
+    """Plantes synthétiques avec description longue"""
+    rnd = random.Random(seed)
+    words = ["feuille", "racine", "lumière", "arrosage", "terreau", "bouture", "tige", "floraison"]
+    now = datetime.utcnow()
+    rows = [
+        {
+            "name": f"Plante {i:06d}",
+            "scientific_name": f"Genus species{i % 500}",
+            "description": " ".join(rnd.choice(words) for _ in range(130)),
+            "health_status": rnd.choice(["healthy", "sick", "recovering"]),
+            "is_favorite": i % 10 == 0,
+            "is_archived": False,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+    with engine.begin() as conn:
+        for start in range(0, count, 5000):
+            conn.execute(insert(Plant), rows[start:start + 5000])
+
+
+def walk(db, page: int, fields) -> int:
+    """Parcourt toutes les plantes page par page, retourne le nombre de lignes"""
+    total, after = 0, None
+    while True:
+        plants = PlantService.get_all(db, limit=page, after=after, fields=fields)
+        if fields:
+            jsonable_encoder(plants)
+        else:
+            [PlantListResponse.model_validate(p).model_dump(mode="json") for p in plants]
+        db.expunge_all()
+        total += len(plants)
+        after = PlantService.next_cursor(plants, page)
+        if after is None:
+            return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plants", type=int, default=50_000, help="Nombre de plantes")
+    parser.add_argument("--page", type=int, default=1000, help="Taille de page")
+    parser.add_argument("--fields", default="id,name,health_status", help="Colonnes de la projection")
+    parser.add_argument("--repeat", type=int, default=3, help="Meilleur de N passes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        populate(engine, args.plants)
+        Session = sessionmaker(bind=engine)
+
+        modes = {"complet": None, "projection": PlantService.parse_fields(args.fields)}
+        print(f"🌱 {args.plants} plantes, pages de {args.page}, projection: {args.fields}")
+        print(f"{'mode':<11} {'lignes':>8} {'secondes':>9} {'lignes/s':>10}")
+        results = {}
+        for name, fields in modes.items():
+            best = None
+            for _ in range(args.repeat):
+                with Session() as db:
+                    started = time.perf_counter()
+                    rows = walk(db, args.page, fields)
+                    elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = rows / best
+            print(f"{name:<11} {rows:>8} {best:>9.2f} {results[name]:>10.0f}")
+        print(f"➡️  projection ×{results['projection'] / results['complet']:.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: charge mixte lecture/écriture, SQLite par défaut vs PRAGMA de connexion
+
+- défaut: journal rollback, synchronous=FULL (comportement avant configure_sqlite)
+- optimisé: PRAGMA de Settings (WAL, synchronous=NORMAL, mmap, cache, busy_timeout...)
+
+Lecteurs: requêtes du dashboard (compteurs par état de santé) + page de plantes.
+Écrivains: un arrosage (INSERT historique + UPDATE last_watered_at) par transaction,
+comme les écritures courtes de l'application (photo, historique).
+
+Usage (depuis backend/):
+    python -m app.scripts.bench_sqlite_pragmas [--plants 20000] [--readers 8] [--writers 2] [--seconds 5]
+"""
+
+import argparse
+import random
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import OperationalError
+
+from app.models import Base
+from app.models.histories import WateringHistory
+from app.models.plant import Plant
+from app.scripts.bench_plant_fields import populate
+from app.utils.db import make_engine, sqlite_pragmas
+
+# Avant configure_sqlite: seul le timeout pysqlite par défaut (5 s) s'appliquait
+DEFAULT_PRAGMAS = {"journal_mode": "DELETE", "synchronous": "FULL"}
+
+
+def reader(engine, plants: int, stop: threading.Event, stats: dict) -> None:
+    rnd = random.Random()
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                conn.execute(
+                    select(Plant.health_status, func.count())
+                    .where(Plant.is_archived == False, Plant.deleted_at.is_(None))
+                    .group_by(Plant.health_status)
+                ).all()
+                conn.execute(
+                    select(Plant.id, Plant.name, Plant.last_watered_at)
+                    .where(Plant.id > rnd.randint(0, plants))
+                    .order_by(Plant.id)
+                    .limit(50)
+                ).all()
+        except OperationalError:
+            stats["read_errors"] += 1
+            continue
+        stats["reads"] += 1
+        stats["read_latencies"].append(time.perf_counter() - started)
+
+
+def writer(engine, plants: int, stop: threading.Event, stats: dict) -> None:
+    rnd = random.Random()
+    while not stop.is_set():
+        plant_id = rnd.randint(1, plants)
+        try:
+            with engine.begin() as conn:
+                conn.execute(insert(WateringHistory), {"plant_id": plant_id, "date": date.today(), "amount_ml": 250})
+                conn.execute(update(Plant).where(Plant.id == plant_id).values(last_watered_at=date.today()))
+        except OperationalError:
+            stats["write_errors"] += 1
+            continue
+        stats["writes"] += 1
+
+
+def run(path: Path, pragmas: dict, args) -> dict:
+    engine = make_engine(f"sqlite:///{path}", pragmas)
+    stats = {"reads": 0, "writes": 0, "read_errors": 0, "write_errors": 0, "read_latencies": []}
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=reader, args=(engine, args.plants, stop, stats))
+        for _ in range(args.readers)
+    ] + [
+        threading.Thread(target=writer, args=(engine, args.plants, stop, stats))
+        for _ in range(args.writers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    latencies = sorted(stats["read_latencies"]) or [0.0]
+    stats["p95_ms"] = latencies[int(len(latencies) * 0.95)] * 1000
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plants", type=int, default=20_000, help="Nombre de plantes")
+    parser.add_argument("--readers", type=int, default=8, help="Threads lecteurs")
+    parser.add_argument("--writers", type=int, default=2, help="Threads écrivains")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Durée par configuration")
+    args = parser.parse_args()
+
+    modes = {"défaut": DEFAULT_PRAGMAS, "optimisé": sqlite_pragmas()}
+    print(f"🌱 {args.plants} plantes, {args.readers} lecteurs, {args.writers} écrivains, {args.seconds:.0f} s par mode")
+    print(f"{'mode':<9} {'lectures/s':>11} {'écritures/s':>12} {'p95 lecture':>12} {'erreurs':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, pragmas in modes.items():
+            path = Path(tmp) / f"{name}.db"
+            setup = make_engine(f"sqlite:///{path}", pragmas)
+            Base.metadata.create_all(bind=setup)
+            populate(setup, args.plants)
+            setup.dispose()
+
+            stats = run(path, pragmas, args)
+            errors = stats["read_errors"] + stats["write_errors"]
+            print(
+                f"{name:<9} {stats['reads'] / args.seconds:>11.0f} {stats['writes'] / args.seconds:>12.0f} "
+                f"{stats['p95_ms']:>9.1f} ms {errors:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Benchmark: recherche de qualité WebP (encode_webp_to_target) vs descente linéaire
+
+Pour chaque image du corpus, compare les anciennes descentes de qualité
+(PhotoService: -5 de 85 à 55; VERSIONS: -10, 5 essais) à la recherche par
+prédiction/interpolation (3 encodages max par taille): nombre d'encodages
+par photo, temps par photo et respect de max_size.
+
+Usage (depuis backend/):
+    python -m app.scripts.bench_webp_targeting [dossier_images] [--limit N] [--scale 0.25]
+
+Sans dossier, un corpus synthétique (dégradés + bruit, 800px à 4000px) est généré.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from PIL import Image, ImageFilter
+
+from app.services.photo_service import PhotoService
+from app.utils.image_processor import VERSIONS, WEBP_QUALITY, encode_webp, encode_webp_to_target
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tif", ".tiff"}
+
+
+def synthetic_corpus(count: int = 8, seed: int = 42) -> List[Image.Image]:
+    """Images type photo: dégradé + formes basse fréquence + grain plus ou moins fort"""
+    rnd = random.Random(seed)
+    sizes = [(800, 600), (1600, 1200), (3000, 2000), (4000, 3000)]
+    corpus = []
+    for i in range(count):
+        width, height = sizes[i % len(sizes)]
+        grain = rnd.choice([20, 40, 80])
+        gradient = Image.linear_gradient("L").resize((width, height))
+        shapes = Image.effect_noise((max(width // 16, 1), max(height // 16, 1)), 70).convert("L")
+        shapes = shapes.resize((width, height), Image.BICUBIC)
+        noise_a = Image.effect_noise((width, height), grain).convert("L")
+        noise_b = Image.effect_noise((width, height), grain).convert("L")
+        image = Image.merge("RGB", (
+            Image.blend(gradient, noise_a, 0.5),
+            Image.blend(shapes, noise_b, 0.5),
+            noise_a,
+        ))
+        corpus.append(image.filter(ImageFilter.GaussianBlur(rnd.choice([0, 0.5, 1]))))
+    return corpus
+
+
+def load_corpus(directory: Path, limit: int) -> List[Image.Image]:
+    """Charge les images d'un dossier (RGB)"""
+    paths = sorted(p for p in directory.rglob("*") if p.suffix.lower() in IMAGE_SUFFIXES)
+    return [Image.open(p).convert("RGB") for p in paths[:limit]]
+
+
+def linear_descent(image: Image.Image, max_size: int) -> dict:
+    """Ancien algorithme de process_image_to_webp: -10 de qualité, 5 essais max"""
+    quality, encodes = WEBP_QUALITY, 0
+    for _ in range(5):
+        data = encode_webp(image, quality)
+        encodes += 1
+        if len(data) <= max_size:
+            break
+        quality -= 10
+        if quality < 30:
+            break
+    return {"data": data, "quality": quality, "encodes": encodes, "fits": len(data) <= max_size}
+
+
+def legacy_compress_to_target(image: Image.Image, max_size: int) -> dict:
+    """Ancien PhotoService._compress_to_target: -5 de 85 à 55, puis 1500px et idem"""
+    encodes = 0
+    for candidate in (image, None):
+        if candidate is None:
+            candidate = image.copy()
+            candidate.thumbnail((1500, 1500), Image.LANCZOS)
+        quality = PhotoService.WEBP_QUALITY
+        while quality > 50:
+            data = encode_webp(candidate, quality)
+            encodes += 1
+            if len(data) <= max_size:
+                return {"data": data, "quality": quality, "encodes": encodes, "fits": True}
+            quality -= 5
+    return {"data": data, "quality": quality + 5, "encodes": encodes, "fits": False}
+
+
+def compress_to_target(image: Image.Image, max_size: int) -> dict:
+    """PhotoService._compress_to_target actuel, avec comptage des encodages"""
+    options = {"quality": PhotoService.WEBP_QUALITY, "min_quality": PhotoService.MIN_WEBP_QUALITY}
+    out = encode_webp_to_target(image, max_size, **options)
+    if out["fits"]:
+        return out
+    smaller = image.copy()
+    smaller.thumbnail((1500, 1500), Image.LANCZOS)
+    retry = encode_webp_to_target(smaller, max_size, **options)
+    retry["encodes"] += out["encodes"]
+    return retry
+
+
+def run(corpus: List[Image.Image], scale: float = 1.0) -> Dict[str, dict]:
+    """
+    Mesure chaque stratégie, agrégé par photo
+    - upload: image complète → PhotoService.MAX_FILE_SIZE (PhotoService.process_upload)
+    - versions: large/medium/thumbnail → max_size × scale (process_image_to_webp)
+    """
+    strategies = {
+        "upload": {"linéaire": legacy_compress_to_target, "cible": compress_to_target},
+        "versions": {"linéaire": linear_descent, "cible": encode_webp_to_target},
+    }
+    results = {}
+
+    for image in corpus:
+        jobs = {"upload": [(image, PhotoService.MAX_FILE_SIZE)], "versions": []}
+        for config in VERSIONS.values():
+            resized = image.copy()
+            resized.thumbnail(config["size"], Image.LANCZOS)
+            jobs["versions"].append((resized, int(config["max_size"] * scale)))
+
+        for pipeline, by_name in strategies.items():
+            for name, strategy in by_name.items():
+                res = results.setdefault(
+                    (pipeline, name), {"encodes": [], "seconds": [], "fits": 0, "outputs": 0}
+                )
+                started = time.perf_counter()
+                encodes = 0
+                for source, max_size in jobs[pipeline]:
+                    out = strategy(source, max_size)
+                    encodes += out["encodes"]
+                    res["fits"] += out["fits"]
+                    res["outputs"] += 1
+                res["seconds"].append(time.perf_counter() - started)
+                res["encodes"].append(encodes)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?", type=Path, help="Dossier d'images (sinon corpus synthétique)")
+    parser.add_argument("--limit", type=int, default=50, help="Nombre max d'images")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiplie les max_size de VERSIONS (ex: 0.25 pour un budget serré)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.directory, args.limit) if args.directory else synthetic_corpus()
+    if not corpus:
+        print("❌ Aucune image trouvée")
+        return
+
+    print(f"📷 {len(corpus)} images, versions: {', '.join(VERSIONS)} (budget × {args.scale})")
+    print(f"{'pipeline':<9} {'stratégie':<10} {'encodages/photo':>16} {'max':>5} "
+          f"{'ms/photo':>10} {'p95 ms':>8} {'tient':>8}")
+    for (pipeline, name), res in run(corpus, args.scale).items():
+        ms = sorted(s * 1000 for s in res["seconds"])
+        p95 = ms[min(int(len(ms) * 0.95), len(ms) - 1)]
+        print(
+            f"{pipeline:<9} {name:<10} {statistics.mean(res['encodes']):>16.2f} {max(res['encodes']):>5} "
+            f"{statistics.mean(ms):>10.1f} {p95:>8.1f} {res['fits']:>4}/{res['outputs']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
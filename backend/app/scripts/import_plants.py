@@ -0,0 +1,42 @@
+"""
+Import en masse depuis un fichier CSV ou NDJSON (même service que POST /api/imports)
+
+Usage (depuis backend/):
+    python -m app.scripts.import_plants plantes.csv
+    python -m app.scripts.import_plants export.ndjson --format ndjson
+    python -m app.scripts.import_plants arrosages.csv --kind watering
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from app.services.import_service import ImportService
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", type=Path, help="Fichier à importer")
+    parser.add_argument("--format", choices=ImportService.FORMATS, help="Par défaut: extension du fichier")
+    parser.add_argument("--kind", choices=ImportService.KINDS, default="plants", help="Type de lignes")
+    args = parser.parse_args()
+
+    fmt = args.format or ("ndjson" if args.path.suffix.lower() in (".ndjson", ".jsonl") else "csv")
+
+    from app.utils.db import SessionLocal
+
+    with SessionLocal() as db, args.path.open(encoding="utf-8-sig", newline="") as stream:
+        report = ImportService.import_stream(db, stream, fmt, args.kind)
+
+    imported = ", ".join(f"{kind}: {count}" for kind, count in report["imported"].items() if count)
+    print(f"✅ {report['total_rows']} lignes lues en {report['elapsed_ms']} ms "
+          f"({report['rows_per_second']} lignes/s) — importées: {imported or 'aucune'}")
+    if report["error_count"]:
+        print(f"⚠️  {report['error_count']} lignes rejetées")
+        for error in report["errors"][:20]:
+            print(f"   ligne {error['row']}: {'; '.join(error['errors'])}")
+    return 1 if report["error_count"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
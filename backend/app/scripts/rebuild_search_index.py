@@ -0,0 +1,26 @@
+"""
+Reconstruit l'index plein texte FTS5 des plantes (plants_fts)
+
+Usage (depuis backend/):
+    python -m app.scripts.rebuild_search_index
+"""
+
+from sqlalchemy.engine import Engine
+
+from app.models.plant_search import ensure_search_index, rebuild_search_index
+
+
+def rebuild(engine: Engine) -> None:
+    """Crée l'index s'il manque, sinon le reconstruit depuis la table plants"""
+    with engine.begin() as conn:
+        if ensure_search_index(conn):
+            print("✅ Index plants_fts créé et rempli")
+            return
+        rebuild_search_index(conn)
+        print("✅ Index plants_fts reconstruit")
+
+
+if __name__ == "__main__":
+    from app.utils.db import engine
+
+    rebuild(engine)
@@ -3,6 +3,7 @@ from datetime import date, timedelta
 from sqlalchemy.orm import Session
 from app.models.plant import Plant
 from app.models.histories import WateringHistory, FertilizingHistory, RepottingHistory, DiseaseHistory
+from app.services.history_service import HistoryService
 
 SAMPLE_PLANTS = [
     {
@@ -170,4 +171,6 @@ def seed_plant_histories(db: Session, plants: list):
         print(f"  ✓ Maladie x{len(disease_records)} pour {plant.name}")
     
     db.commit()
+    # Insertions directes: mettre à jour last_watered_at / last_fertilized_at / last_repotted_at
+    HistoryService.rebuild_last_care(db)
     print("✅ Plant histories seeded successfully!\n")
@@ -18,8 +18,8 @@ WATER_TYPES = [
 ]
 
 SEASONS = [
-    {"name": "Printemps", "start_month": 3, "end_month": 5, "description": "Croissance active, plus d'eau"},
-    {"name": "Été", "start_month": 6, "end_month": 8, "description": "Croissance active, maximum d'eau"},
-    {"name": "Automne", "start_month": 9, "end_month": 11, "description": "Repos végétatif, moins d'eau"},
-    {"name": "Hiver", "start_month": 12, "end_month": 2, "description": "Repos végétatif, minimum d'eau"},
+    {"name": "Printemps", "start_month": 3, "end_month": 5, "watering_factor": 1.0, "description": "Croissance active, plus d'eau"},
+    {"name": "Été", "start_month": 6, "end_month": 8, "watering_factor": 0.75, "description": "Croissance active, maximum d'eau"},
+    {"name": "Automne", "start_month": 9, "end_month": 11, "watering_factor": 1.25, "description": "Repos végétatif, moins d'eau"},
+    {"name": "Hiver", "start_month": 12, "end_month": 2, "watering_factor": 1.5, "description": "Repos végétatif, minimum d'eau"},
 ]
@@ -0,0 +1,344 @@
+"""
+Service d'export de la collection (NDJSON, CSV, ZIP)
+
+Les plantes sont lues par lots (curseur en flux: stream_results + yield_per),
+leurs tags, photos et historiques chargés lot par lot (une requête IN par
+table): la mémoire reste constante quelle que soit la taille de la collection.
+Chaque format est un générateur de blocs d'octets, servi tel quel par
+StreamingResponse ou écrit dans EXPORTS_DIR par une tâche de fond.
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import re
+import uuid
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import Connection, Engine
+
+from app.config import settings
+from app.models.histories import (
+    WateringHistory, FertilizingHistory, RepottingHistory, DiseaseHistory, PlantHistory,
+)
+from app.models.photo import Photo
+from app.models.plant import Plant
+from app.models.tags import Tag, plant_tag_association
+
+logger = logging.getLogger(__name__)
+
+
+class _ChunkBuffer:
+    """Flux en écriture seule (non seekable) vidé à chaque bloc produit"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _json_default(value):
+    """Types SQL non JSON: dates en ISO 8601, décimaux en float"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type non exportable: {type(value).__name__}")
+
+
+class ExportService:
+    """Service pour l'export de la collection"""
+
+    FORMATS = {
+        "ndjson": "application/x-ndjson",
+        "csv": "text/csv; charset=utf-8",
+        "zip": "application/zip",
+    }
+    BATCH_SIZE = 500
+    HISTORY_MODELS = {
+        "watering": WateringHistory,
+        "fertilizing": FertilizingHistory,
+        "repotting": RepottingHistory,
+        "disease": DiseaseHistory,
+        "notes": PlantHistory,
+    }
+    # Tables exportables en CSV (une par fichier)
+    TABLES = ("plants", "photos", *HISTORY_MODELS)
+    FILENAME_PATTERN = re.compile(r"^[a-z]+-\d{8}T\d{6}-[0-9a-f]{6}\.(ndjson|csv|zip)$")
+
+    # ===== LECTURE PAR LOTS =====
+
+    @staticmethod
+    def _batches(conn: Connection, statement) -> Iterator[List[dict]]:
+        """Exécute la requête en flux et produit des lots de BATCH_SIZE lignes (dicts)"""
+        result = conn.execution_options(
+            stream_results=True, yield_per=ExportService.BATCH_SIZE
+        ).execute(statement)
+        for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+
+    @staticmethod
+    def _plants_statement():
+        """Plantes non supprimées (archivées comprises), par id"""
+        return select(Plant.__table__).where(Plant.deleted_at.is_(None)).order_by(Plant.id)
+
+    @staticmethod
+    def _table_statement(table: str):
+        """Lignes d'une table fille pour les plantes non supprimées"""
+        if table == "plants":
+            return ExportService._plants_statement()
+        model = Photo if table == "photos" else ExportService.HISTORY_MODELS[table]
+        statement = select(model.__table__).where(
+            model.plant_id.in_(select(Plant.id).where(Plant.deleted_at.is_(None)))
+        )
+        if table != "photos":
+            statement = statement.where(model.deleted_at.is_(None))
+        return statement.order_by(model.plant_id, model.id)
+
+    @staticmethod
+    def _tags_by_plant(conn: Connection, plant_ids: List[int]) -> Dict[int, List[str]]:
+        """Noms des tags par plante, pour un lot de plantes"""
+        rows = conn.execute(
+            select(plant_tag_association.c.plant_id, Tag.name)
+            .join(Tag, Tag.id == plant_tag_association.c.tag_id)
+            .where(plant_tag_association.c.plant_id.in_(plant_ids))
+            .order_by(Tag.name)
+        )
+        tags: Dict[int, List[str]] = {}
+        for plant_id, name in rows:
+            tags.setdefault(plant_id, []).append(name)
+        return tags
+
+    @staticmethod
+    def _children_by_plant(conn: Connection, table: str, plant_ids: List[int]) -> Dict[int, List[dict]]:
+        """Photos ou historique (non supprimé) par plante, pour un lot de plantes"""
+        model = Photo if table == "photos" else ExportService.HISTORY_MODELS[table]
+        statement = select(model.__table__).where(model.plant_id.in_(plant_ids))
+        if table != "photos":
+            statement = statement.where(model.deleted_at.is_(None))
+        children: Dict[int, List[dict]] = {}
+        for row in conn.execute(statement.order_by(model.plant_id, model.id)).mappings():
+            children.setdefault(row["plant_id"], []).append(dict(row))
+        return children
+
+    @staticmethod
+    def iter_plant_batches(conn: Connection) -> Iterator[List[dict]]:
+        """
+        Lots de plantes complètes: colonnes + tags, photos et historiques
+        {..., "tags": [...], "photos": [...], "histories": {"watering": [...], ...}}
+        """
+        for plants in ExportService._batches(conn, ExportService._plants_statement()):
+            plant_ids = [plant["id"] for plant in plants]
+            tags = ExportService._tags_by_plant(conn, plant_ids)
+            photos = ExportService._children_by_plant(conn, "photos", plant_ids)
+            histories = {
+                name: ExportService._children_by_plant(conn, name, plant_ids)
+                for name in ExportService.HISTORY_MODELS
+            }
+            for plant in plants:
+                plant["tags"] = tags.get(plant["id"], [])
+                plant["photos"] = photos.get(plant["id"], [])
+                plant["histories"] = {
+                    name: rows.get(plant["id"], []) for name, rows in histories.items()
+                }
+            yield plants
+
+    # ===== FORMATS =====
+
+    @staticmethod
+    def ndjson_chunks(conn: Connection) -> Iterator[bytes]:
+        """Une ligne JSON par plante (avec tags, photos, historiques), un bloc par lot"""
+        for plants in ExportService.iter_plant_batches(conn):
+            yield "".join(
+                json.dumps(plant, default=_json_default, ensure_ascii=False) + "\n"
+                for plant in plants
+            ).encode("utf-8")
+
+    @staticmethod
+    def csv_chunks(conn: Connection, table: str = "plants") -> Iterator[bytes]:
+        """
+        Une table en CSV (en-tête + une ligne par enregistrement), un bloc par lot
+        plants: colonne tags supplémentaire (noms séparés par "|")
+        """
+        if table not in ExportService.TABLES:
+            raise ValueError(f"Table inconnue: {table} (valeurs: {', '.join(ExportService.TABLES)})")
+        statement = ExportService._table_statement(table)
+        columns = [column.name for column in statement.selected_columns]
+        if table == "plants":
+            columns.append("tags")
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns)
+        writer.writeheader()
+        for rows in ExportService._batches(conn, statement):
+            if table == "plants":
+                tags = ExportService._tags_by_plant(conn, [row["id"] for row in rows])
+                for row in rows:
+                    row["tags"] = "|".join(tags.get(row["id"], []))
+            writer.writerows(rows)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def zip_chunks(conn: Connection, include_photos: bool = False) -> Iterator[bytes]:
+        """
+        Archive ZIP produite en flux: plants.ndjson, un CSV par table,
+        et les fichiers photos (photos/{plant_id}/{filename}) si include_photos
+        """
+        out = _ChunkBuffer()
+        with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            with archive.open("plants.ndjson", "w") as entry:
+                for chunk in ExportService.ndjson_chunks(conn):
+                    entry.write(chunk)
+                    yield out.drain()
+            for table in ExportService.TABLES:
+                with archive.open(f"{table}.csv", "w") as entry:
+                    for chunk in ExportService.csv_chunks(conn, table):
+                        entry.write(chunk)
+                        yield out.drain()
+            if include_photos:
+                for photos in ExportService._batches(conn, ExportService._table_statement("photos")):
+                    for photo in photos:
+                        path = settings.PHOTOS_DIR / str(photo["plant_id"]) / photo["filename"]
+                        if not path.exists():
+                            continue
+                        # WebP déjà compressé: stocké tel quel
+                        archive.write(
+                            path,
+                            f"photos/{photo['plant_id']}/{photo['filename']}",
+                            compress_type=zipfile.ZIP_STORED,
+                        )
+                        yield out.drain()
+        yield out.drain()
+
+    @staticmethod
+    def stream(
+        bind: Engine,
+        fmt: str,
+        table: str = "plants",
+        include_photos: bool = False,
+    ) -> Iterator[bytes]:
+        """
+        Export complet dans le format demandé, sur sa propre connexion
+        (la session de la requête peut être fermée pendant le flux)
+        """
+        if fmt not in ExportService.FORMATS:
+            raise ValueError(f"Format inconnu: {fmt} (valeurs: {', '.join(ExportService.FORMATS)})")
+        if fmt == "csv" and table not in ExportService.TABLES:
+            raise ValueError(f"Table inconnue: {table} (valeurs: {', '.join(ExportService.TABLES)})")
+        with bind.connect() as conn:
+            if fmt == "ndjson":
+                yield from ExportService.ndjson_chunks(conn)
+            elif fmt == "csv":
+                yield from ExportService.csv_chunks(conn, table)
+            else:
+                yield from ExportService.zip_chunks(conn, include_photos)
+
+    # ===== EXPORTS EN FICHIER (EXPORTS_DIR) =====
+
+    @staticmethod
+    def new_filename(fmt: str, table: str = "plants") -> str:
+        """Nom de fichier d'export unique: {table}-{horodatage}-{hex}.{format}"""
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        prefix = table if fmt == "csv" else "plants"
+        return f"{prefix}-{stamp}-{uuid.uuid4().hex[:6]}.{fmt}"
+
+    @staticmethod
+    def write_export(
+        bind: Engine,
+        filename: str,
+        fmt: str,
+        table: str = "plants",
+        include_photos: bool = False,
+    ) -> None:
+        """
+        Écrit un export dans EXPORTS_DIR (tâche de fond)
+        Fichier .part pendant l'écriture, renommé à la fin; .error en cas d'échec
+        """
+        path = settings.EXPORTS_DIR / filename
+        part_path = path.with_name(f"{filename}.part")
+        try:
+            with open(part_path, "wb") as f:
+                for chunk in ExportService.stream(bind, fmt, table, include_photos):
+                    f.write(chunk)
+            os.replace(part_path, path)
+            logger.info(f"Export écrit: {path} ({path.stat().st_size} octets)")
+        except Exception as e:
+            logger.error(f"Erreur export {filename}: {str(e)}")
+            part_path.unlink(missing_ok=True)
+            path.with_name(f"{filename}.error").write_text(str(e), encoding="utf-8")
+
+    @staticmethod
+    def start_export(fmt: str, table: str = "plants") -> str:
+        """
+        Valide la demande et réserve le nom du fichier (.part visible par get_export)
+        Raises:
+            ValueError: Si le format ou la table est inconnu
+        """
+        if fmt not in ExportService.FORMATS:
+            raise ValueError(f"Format inconnu: {fmt} (valeurs: {', '.join(ExportService.FORMATS)})")
+        if fmt == "csv" and table not in ExportService.TABLES:
+            raise ValueError(f"Table inconnue: {table} (valeurs: {', '.join(ExportService.TABLES)})")
+        filename = ExportService.new_filename(fmt, table)
+        (settings.EXPORTS_DIR / f"{filename}.part").touch()
+        return filename
+
+    @staticmethod
+    def get_export(filename: str) -> Optional[dict]:
+        """
+        État d'un export: running, done ou failed; None si inconnu
+        Returns: {filename, status, size, created_at, error, path}
+        """
+        if not ExportService.FILENAME_PATTERN.match(filename):
+            return None
+        path = settings.EXPORTS_DIR / filename
+        for status, candidate in (
+            ("done", path),
+            ("running", path.with_name(f"{filename}.part")),
+            ("failed", path.with_name(f"{filename}.error")),
+        ):
+            if candidate.exists():
+                stat_result = candidate.stat()
+                return {
+                    "filename": filename,
+                    "status": status,
+                    "size": stat_result.st_size if status == "done" else None,
+                    "created_at": datetime.utcfromtimestamp(stat_result.st_mtime),
+                    "error": candidate.read_text(encoding="utf-8") if status == "failed" else None,
+                    "path": path if status == "done" else None,
+                }
+        return None
+
+    @staticmethod
+    def list_exports() -> List[dict]:
+        """Exports présents dans EXPORTS_DIR, du plus récent au plus ancien"""
+        names = {
+            re.sub(r"\.(part|error)$", "", path.name)
+            for path in Path(settings.EXPORTS_DIR).iterdir()
+        }
+        exports = [ExportService.get_export(name) for name in names]
+        return sorted(
+            (export for export in exports if export),
+            key=lambda export: export["created_at"],
+            reverse=True,
+        )
@@ -3,10 +3,14 @@ Service pour gérer les historiques
 Contient CRUD pour tous les types d'historique
 """
 
+from sqlalchemy import func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 
+from app.models.plant import Plant
+from app.models.tags import plant_tag_association
 from app.models.histories import (
     WateringHistory,
     FertilizingHistory,
@@ -20,12 +24,73 @@ from app.schemas.history_schema import (
     RepottingHistoryCreate, RepottingHistoryUpdate,
     DiseaseHistoryCreate, DiseaseHistoryUpdate,
     PlantHistoryCreate, PlantHistoryUpdate,
+    HistoryBatchSelection, HistoryBatchTarget,
 )
+from app.services.watering_schedule_service import WateringScheduleService
 
 
 class HistoryService:
     """Service pour gérer tous les historiques"""
     
+    # Colonne dénormalisée de Plant maintenue pour chaque type de soin
+    LAST_CARE_COLUMNS = {
+        WateringHistory: "last_watered_at",
+        FertilizingHistory: "last_fertilized_at",
+        RepottingHistory: "last_repotted_at",
+    }
+    
+    @staticmethod
+    def _sync_last_care(db: Session, history_model, plant_id: int) -> None:
+        """
+        Recalcule plants.last_*_at = max(date) des entrées non supprimées
+        Exécuté avant le commit: même transaction que l'écriture d'historique.
+        Lecture indexée (plant_id, date), donc valable aussi pour update/delete.
+        """
+        db.flush()
+        last_date = select(func.max(history_model.date)).where(
+            history_model.plant_id == plant_id,
+            history_model.deleted_at.is_(None),
+        ).scalar_subquery()
+        db.execute(
+            update(Plant)
+            .where(Plant.id == plant_id)
+            .values({HistoryService.LAST_CARE_COLUMNS[history_model]: last_date})
+            .execution_options(synchronize_session="fetch")
+        )
+    
+    @staticmethod
+    def _resync_last_care(db: Session, plant_filter, models=None) -> None:
+        """
+        UPDATE plants SET last_*_at = max(date) pour les plantes de plant_filter
+        (liste d'ids ou sous-requête, None = toutes), sans commit
+        """
+        models = HistoryService.LAST_CARE_COLUMNS if models is None else [
+            model for model in models if model in HistoryService.LAST_CARE_COLUMNS
+        ]
+        if not models:
+            return
+        values = {
+            HistoryService.LAST_CARE_COLUMNS[model]: select(func.max(model.date)).where(
+                model.plant_id == Plant.id,
+                model.deleted_at.is_(None),
+            ).scalar_subquery()
+            for model in models
+        }
+        statement = update(Plant).values(values)
+        if plant_filter is not None:
+            statement = statement.where(Plant.id.in_(plant_filter))
+        db.execute(statement.execution_options(synchronize_session=False))
+    
+    @staticmethod
+    def rebuild_last_care(db: Session, plant_ids: Optional[List[int]] = None) -> None:
+        """
+        Recalcule les colonnes last_*_at de toutes les plantes, ou de plant_ids (backfill)
+        À utiliser après des insertions d'historique hors HistoryService (seed, import)
+        """
+        HistoryService._resync_last_care(db, plant_ids)
+        db.commit()
+        db.expire_all()
+    
     # ===== WATERING HISTORY =====
     
     @staticmethod
@@ -36,7 +101,9 @@ class HistoryService:
             **data.model_dump()
         )
         db.add(history)
+        HistoryService._sync_last_care(db, WateringHistory, plant_id)
         db.commit()
+        WateringScheduleService.invalidate()
         db.refresh(history)
         return history
     
@@ -68,7 +135,9 @@ class HistoryService:
             if value is not None:
                 setattr(history, key, value)
         
+        HistoryService._sync_last_care(db, WateringHistory, plant_id)
         db.commit()
+        WateringScheduleService.invalidate()
         db.refresh(history)
         return history
     
@@ -80,7 +149,9 @@ class HistoryService:
             return False
         
         history.deleted_at = datetime.utcnow()
+        HistoryService._sync_last_care(db, WateringHistory, plant_id)
         db.commit()
+        WateringScheduleService.invalidate()
         return True
     
     # ===== FERTILIZING HISTORY =====
@@ -93,6 +164,7 @@ class HistoryService:
             **data.model_dump()
         )
         db.add(history)
+        HistoryService._sync_last_care(db, FertilizingHistory, plant_id)
         db.commit()
         db.refresh(history)
         return history
@@ -125,6 +197,7 @@ class HistoryService:
             if value is not None:
                 setattr(history, key, value)
         
+        HistoryService._sync_last_care(db, FertilizingHistory, plant_id)
         db.commit()
         db.refresh(history)
         return history
@@ -137,6 +210,7 @@ class HistoryService:
             return False
         
         history.deleted_at = datetime.utcnow()
+        HistoryService._sync_last_care(db, FertilizingHistory, plant_id)
         db.commit()
         return True
     
@@ -150,6 +224,7 @@ class HistoryService:
             **data.model_dump()
         )
         db.add(history)
+        HistoryService._sync_last_care(db, RepottingHistory, plant_id)
         db.commit()
         db.refresh(history)
         return history
@@ -182,6 +257,7 @@ class HistoryService:
             if value is not None:
                 setattr(history, key, value)
         
+        HistoryService._sync_last_care(db, RepottingHistory, plant_id)
         db.commit()
         db.refresh(history)
         return history
@@ -194,6 +270,7 @@ class HistoryService:
             return False
         
         history.deleted_at = datetime.utcnow()
+        HistoryService._sync_last_care(db, RepottingHistory, plant_id)
         db.commit()
         return True
     
@@ -310,3 +387,125 @@ class HistoryService:
         history.deleted_at = datetime.utcnow()
         db.commit()
         return True
+    
+    # ===== OPÉRATIONS GROUPÉES =====
+    # Une instruction par opération (INSERT ... SELECT / UPDATE ... RETURNING),
+    # une transaction, au lieu d'un appel (commit + refresh) par plante
+    
+    @staticmethod
+    def _batch_plants(selection: HistoryBatchSelection):
+        """Sous-requête des ids de plantes sélectionnées (hors supprimées et archivées)"""
+        query = select(Plant.id).where(
+            Plant.deleted_at.is_(None),
+            Plant.is_archived == False,
+        )
+        if selection.plant_ids is not None:
+            query = query.where(Plant.id.in_(selection.plant_ids))
+        if selection.location_id is not None:
+            query = query.where(Plant.location_id == selection.location_id)
+        if selection.tag_id is not None:
+            query = query.where(Plant.id.in_(
+                select(plant_tag_association.c.plant_id).where(
+                    plant_tag_association.c.tag_id == selection.tag_id
+                )
+            ))
+        return query
+    
+    @staticmethod
+    def _batch_entries(history_model, target: HistoryBatchTarget):
+        """Conditions des entrées ciblées (ids et/ou plantes + date)"""
+        conditions = [history_model.deleted_at.is_(None)]
+        if target.ids is not None:
+            conditions.append(history_model.id.in_(target.ids))
+        if target.has_plant_criteria():
+            conditions.append(history_model.plant_id.in_(HistoryService._batch_plants(target)))
+        if target.date is not None:
+            conditions.append(history_model.date == target.date)
+        return conditions
+    
+    @staticmethod
+    def _finish_batch(db: Session, history_model, plant_ids: List[int]) -> dict:
+        """
+        Resynchronise last_*_at des plantes touchées, commit, invalide le planning
+        plant_ids: plant_id de chaque entrée créée/modifiée (RETURNING)
+        """
+        touched = sorted(set(plant_ids))
+        if touched:
+            HistoryService._resync_last_care(db, touched, [history_model])
+        db.commit()
+        db.expire_all()
+        if history_model is WateringHistory:
+            WateringScheduleService.invalidate()
+        return {"count": len(plant_ids), "plant_ids": touched}
+    
+    @staticmethod
+    def create_batch(db: Session, history_model, selection: HistoryBatchSelection, data) -> dict:
+        """
+        Crée la même entrée pour toutes les plantes sélectionnées
+        (INSERT ... SELECT: une instruction, quel que soit le nombre de plantes)
+        
+        Returns:
+            {count: entrées créées, plant_ids}
+        """
+        table = history_model.__table__
+        now = datetime.utcnow()
+        values = {**data.model_dump(), "created_at": now, "updated_at": now}
+        plants = HistoryService._batch_plants(selection).subquery()
+        statement = insert(table).from_select(
+            ["plant_id", *values],
+            select(
+                plants.c.id,
+                *(literal(value, table.c[column].type) for column, value in values.items()),
+            ),
+        ).returning(table.c.plant_id)
+        plant_ids = list(db.execute(statement).scalars())
+        return HistoryService._finish_batch(db, history_model, plant_ids)
+    
+    @staticmethod
+    def update_batch(db: Session, history_model, target: HistoryBatchTarget, data) -> dict:
+        """
+        Met à jour les entrées ciblées (mêmes règles que update_*: champs None ignorés)
+        
+        Raises:
+            ValueError: Si aucun champ à mettre à jour
+        """
+        values = {
+            key: value for key, value in data.model_dump(exclude_unset=True).items()
+            if value is not None
+        }
+        if not values:
+            raise ValueError("Aucun champ à mettre à jour")
+        # Une entrée déplacée à une autre date change aussi last_*_at de sa plante
+        statement = (
+            update(history_model.__table__)
+            .where(*HistoryService._batch_entries(history_model, target))
+            .values(**values, updated_at=datetime.utcnow())
+            .returning(history_model.__table__.c.plant_id)
+        )
+        plant_ids = list(db.execute(statement).scalars())
+        return HistoryService._finish_batch(db, history_model, plant_ids)
+    
+    @staticmethod
+    def delete_batch(db: Session, history_model, target: HistoryBatchTarget) -> dict:
+        """Soft delete des entrées ciblées"""
+        statement = (
+            update(history_model.__table__)
+            .where(*HistoryService._batch_entries(history_model, target))
+            .values(deleted_at=datetime.utcnow())
+            .returning(history_model.__table__.c.plant_id)
+        )
+        plant_ids = list(db.execute(statement).scalars())
+        return HistoryService._finish_batch(db, history_model, plant_ids)
+
+
+class AsyncHistoryService:
+    """Lectures d'historiques sur AsyncSession (listes par plante)"""
+    
+    @staticmethod
+    async def get_all(db: AsyncSession, history_model, plant_id: int) -> list:
+        """Entrées non supprimées d'une plante, plus récentes d'abord (voir HistoryService.get_all_*)"""
+        statement = select(history_model).where(
+            history_model.plant_id == plant_id,
+            history_model.deleted_at.is_(None),
+        ).order_by(history_model.date.desc())
+        return list((await db.scalars(statement)).all())
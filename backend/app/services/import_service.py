@@ -0,0 +1,391 @@
+"""
+Service d'import en masse (plantes et historiques, CSV ou NDJSON)
+
+- Chaque ligne est validée par le schéma Pydantic de création existant
+  (PlantCreate, WateringHistoryCreate, ...); une ligne invalide est signalée
+  dans le rapport sans interrompre l'import
+- Insertions par lots de CHUNK_SIZE lignes (executemany), un commit par lot;
+  un lot rejeté par la base (contrainte d'unicité) est rejoué ligne par ligne
+  pour isoler les lignes fautives
+- Index FTS alimenté une fois par lot (deferred_insert_indexing) plutôt que
+  par le trigger d'insertion, ligne par ligne
+- Références réservées par bloc: un incrément de reference_sequences par
+  préfixe de famille et par lot, au lieu d'un generate_reference par plante
+- NDJSON: format de l'export (/api/exports), historiques imbriqués compris
+"""
+
+import csv
+import json
+import logging
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.histories import (
+    WateringHistory, FertilizingHistory, RepottingHistory, DiseaseHistory, PlantHistory,
+)
+from app.models.plant import Plant
+from app.models.plant_search import deferred_insert_indexing
+from app.schemas.history_schema import (
+    WateringHistoryCreate, FertilizingHistoryCreate, RepottingHistoryCreate,
+    DiseaseHistoryCreate, PlantHistoryCreate,
+)
+from app.schemas.plant_schema import PlantCreate
+from app.services.history_service import HistoryService
+from app.services.plant_service import PlantService
+from app.services.stats_service import StatsService
+from app.services.watering_schedule_service import WateringScheduleService
+
+logger = logging.getLogger(__name__)
+
+# Valeurs des colonnes absentes d'une ligne (executemany: mêmes clés pour toutes les lignes d'un lot)
+PLANT_COLUMN_DEFAULTS = {
+    name: (
+        Plant.__table__.c[name].default.arg
+        if Plant.__table__.c[name].default is not None and Plant.__table__.c[name].default.is_scalar
+        else None
+    )
+    for name in PlantCreate.model_fields
+}
+
+
+class ImportService:
+    """Service pour l'import en masse"""
+
+    FORMATS = ("csv", "ndjson")
+    CHUNK_SIZE = 5000
+    MAX_REPORTED_ERRORS = 1000
+    HISTORY_KINDS = {
+        "watering": (WateringHistory, WateringHistoryCreate),
+        "fertilizing": (FertilizingHistory, FertilizingHistoryCreate),
+        "repotting": (RepottingHistory, RepottingHistoryCreate),
+        "disease": (DiseaseHistory, DiseaseHistoryCreate),
+        "notes": (PlantHistory, PlantHistoryCreate),
+    }
+    KINDS = ("plants", *HISTORY_KINDS)
+
+    # ===== LECTURE =====
+
+    @staticmethod
+    def read_records(stream: TextIO, fmt: str) -> Iterator[Tuple[int, object]]:
+        """
+        Lit un flux CSV (en-tête) ou NDJSON ligne par ligne
+        Produit (numéro de ligne, dict) ou (numéro de ligne, exception) si illisible
+        CSV: cellules vides ignorées (valeurs par défaut du schéma)
+        """
+        if fmt == "csv":
+            reader = csv.DictReader(stream)
+            for record in reader:
+                yield reader.line_num, {
+                    key: value for key, value in record.items()
+                    if key and value is not None and value.strip() != ""
+                }
+            return
+        if fmt != "ndjson":
+            raise ValueError(f"Format inconnu: {fmt} (valeurs: {', '.join(ImportService.FORMATS)})")
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, ValueError(f"JSON invalide: {e.msg}")
+                continue
+            if not isinstance(record, dict):
+                yield line_number, ValueError("Objet JSON attendu")
+                continue
+            yield line_number, record
+
+    @staticmethod
+    def _chunks(records: Iterable, size: int) -> Iterator[list]:
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _validation_messages(error: Exception) -> List[str]:
+        """Messages d'erreur lisibles (champ: message)"""
+        if isinstance(error, ValidationError):
+            return [
+                f"{'.'.join(str(part) for part in err['loc']) or 'ligne'}: {err['msg']}"
+                for err in error.errors()
+            ]
+        return [str(error)]
+
+    # ===== RAPPORT =====
+
+    @staticmethod
+    def _new_report(kind: str) -> dict:
+        return {
+            "kind": kind,
+            "total_rows": 0,
+            "imported": {"plants": 0, **{name: 0 for name in ImportService.HISTORY_KINDS}},
+            "error_count": 0,
+            "errors": [],
+        }
+
+    @staticmethod
+    def _add_error(report: dict, line: int, messages: List[str]) -> None:
+        report["error_count"] += 1
+        if len(report["errors"]) < ImportService.MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": line, "errors": messages})
+
+    # ===== VALIDATION =====
+
+    @staticmethod
+    def _history_rows(plant_record: dict) -> List[Tuple[str, dict]]:
+        """Historiques imbriqués d'une plante (NDJSON), validés"""
+        rows = []
+        histories = plant_record.get("histories") or {}
+        if not isinstance(histories, dict):
+            raise ValueError("histories: objet {type: [entrées]} attendu")
+        for kind, entries in histories.items():
+            if kind not in ImportService.HISTORY_KINDS:
+                raise ValueError(f"histories: type inconnu {kind}")
+            schema = ImportService.HISTORY_KINDS[kind][1]
+            for entry in entries or []:
+                rows.append((kind, schema.model_validate(entry).model_dump()))
+        return rows
+
+    @staticmethod
+    def _plant_row(data: PlantCreate) -> dict:
+        """Colonnes d'une plante, mêmes règles que PlantService.create"""
+        row = data.model_dump(exclude_unset=True)
+        if not row.get("scientific_name") and row.get("genus") and row.get("species"):
+            row["scientific_name"] = f"{row['genus'].strip().capitalize()} {row['species'].strip().lower()}"
+        return row
+
+    @staticmethod
+    def _reserve_references(db: Session, rows: List[dict], synced: Set[str]) -> None:
+        """
+        Attribue PREFIX-NNN aux plantes sans référence avec famille: un bloc de
+        numéros réservé par préfixe et par lot (reference_sequences), après les
+        références fournies par le lot
+        synced: préfixes déjà resynchronisés avec les références existantes pendant l'import
+        """
+        by_prefix: Dict[str, List[dict]] = {}
+        for row in rows:
+            if not row.get("reference") and row.get("family") and row["family"].strip():
+                by_prefix.setdefault(PlantService.reference_prefix(row["family"]), []).append(row)
+        # Références fournies par le fichier: séquences avancées avant de réserver
+        explicit: Dict[str, int] = {}
+        for row in rows:
+            parsed = PlantService.parse_reference(row.get("reference"))
+            if parsed:
+                explicit[parsed[0]] = max(explicit.get(parsed[0], 0), parsed[1])
+        for prefix, number in explicit.items():
+            PlantService.sync_reference_sequence(db, prefix, number + 1)
+        for prefix, prefix_rows in by_prefix.items():
+            if prefix not in synced:
+                PlantService.sync_reference_sequence(db, prefix)
+                synced.add(prefix)
+            first = PlantService.allocate_references(db, prefix, len(prefix_rows))
+            for offset, row in enumerate(prefix_rows):
+                row["reference"] = PlantService.format_reference(prefix, first + offset)
+
+    # ===== INSERTION =====
+
+    @staticmethod
+    def _insert_each(db: Session, items: list, insert_fn, report: dict) -> list:
+        """
+        Insère un lot dans un savepoint; en cas de violation de contrainte,
+        rejoue ligne par ligne et signale les lignes rejetées
+        Returns: éléments insérés
+        """
+        try:
+            with db.begin_nested():
+                insert_fn(items)
+            return items
+        except IntegrityError:
+            pass
+        inserted = []
+        for item in items:
+            try:
+                with db.begin_nested():
+                    insert_fn([item])
+                inserted.append(item)
+            except IntegrityError as e:
+                ImportService._add_error(report, item[0], [f"Rejeté par la base: {e.orig}"])
+        return inserted
+
+    @staticmethod
+    def _insert_plants(db: Session, items: list) -> None:
+        """
+        items: (ligne, colonnes, historiques)
+        Plantes sans historique: executemany simple; plantes avec historiques:
+        RETURNING ordonné (une instruction par ligne sous SQLite) pour rattacher les entrées
+        """
+        # Colonnes fournies par au moins une ligne du lot, les autres gardent leur défaut;
+        # horodatage commun au lot (évite un datetime.utcnow() par ligne)
+        columns = set().union(*(row for _, row, _ in items))
+        now = datetime.utcnow()
+        for _, row, _ in items:
+            for column in columns.difference(row):
+                row[column] = PLANT_COLUMN_DEFAULTS[column]
+            row.setdefault("created_at", now)
+            row.setdefault("updated_at", now)
+        plain = [row for _, row, histories in items if not histories]
+        if plain:
+            db.execute(insert(Plant.__table__), plain)
+        parents = [(row, histories) for _, row, histories in items if histories]
+        if not parents:
+            return
+        result = db.execute(
+            insert(Plant.__table__).returning(Plant.__table__.c.id, sort_by_parameter_order=True),
+            [row for row, _ in parents],
+        )
+        for (row, _), (plant_id,) in zip(parents, result.all()):
+            row["id"] = plant_id
+        ImportService._insert_histories(db, [
+            (kind, {**history, "plant_id": row["id"]})
+            for row, histories in parents
+            for kind, history in histories
+        ])
+
+    @staticmethod
+    def _insert_histories(db: Session, histories: List[Tuple[str, dict]]) -> None:
+        """executemany par type d'historique"""
+        by_kind: Dict[str, List[dict]] = {}
+        for kind, row in histories:
+            by_kind.setdefault(kind, []).append(row)
+        for kind, rows in by_kind.items():
+            db.execute(insert(ImportService.HISTORY_KINDS[kind][0].__table__), rows)
+
+    @staticmethod
+    def _import_plants_chunk(db: Session, chunk: list, report: dict, synced: Set[str]) -> None:
+        items = []
+        for line, record in chunk:
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                row = ImportService._plant_row(PlantCreate.model_validate(record))
+                items.append((line, row, ImportService._history_rows(record)))
+            except (ValidationError, ValueError, TypeError) as e:
+                ImportService._add_error(report, line, ImportService._validation_messages(e))
+        if not items:
+            return
+
+        ImportService._reserve_references(db, [row for _, row, _ in items], synced)
+        with deferred_insert_indexing(db.connection()):
+            inserted = ImportService._insert_each(
+                db, items, lambda batch: ImportService._insert_plants(db, batch), report
+            )
+
+        delta: Dict[str, int] = {}
+        for _, row, _ in inserted:
+            snapshot = StatsService.plant_snapshot(SimpleNamespace(
+                is_archived=bool(row.get("is_archived")), health_status=row.get("health_status")
+            ))
+            for key, value in snapshot.items():
+                delta[key] = delta.get(key, 0) + value
+        StatsService.apply_delta(db, delta)
+        if any(histories for _, _, histories in inserted):
+            HistoryService.rebuild_last_care(db, [row["id"] for _, row, histories in inserted if histories])
+        db.commit()
+        report["imported"]["plants"] += len(inserted)
+        for _, _, histories in inserted:
+            for kind, _ in histories:
+                report["imported"][kind] += 1
+
+    @staticmethod
+    def _import_history_chunk(db: Session, kind: str, chunk: list, report: dict) -> None:
+        """Lignes d'historique rattachées par plant_id ou plant_reference"""
+        schema = ImportService.HISTORY_KINDS[kind][1]
+        parsed = []
+        for line, record in chunk:
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                data = schema.model_validate(record).model_dump()
+                parsed.append((line, record.get("plant_id"), record.get("plant_reference"), data))
+            except (ValidationError, ValueError, TypeError) as e:
+                ImportService._add_error(report, line, ImportService._validation_messages(e))
+
+        # Plantes cibles: une requête pour tout le lot
+        ids = {int(plant_id) for _, plant_id, _, _ in parsed if str(plant_id or "").isdigit()}
+        references = {reference for _, _, reference, _ in parsed if reference}
+        known_ids, by_reference = set(), {}
+        if ids or references:
+            rows = db.execute(
+                select(Plant.id, Plant.reference).where(
+                    Plant.deleted_at.is_(None),
+                    (Plant.id.in_(ids)) | (Plant.reference.in_(references)),
+                )
+            ).all()
+            known_ids = {plant_id for plant_id, _ in rows}
+            by_reference = {reference: plant_id for plant_id, reference in rows if reference}
+
+        items = []
+        for line, plant_id, reference, data in parsed:
+            if str(plant_id or "").isdigit() and int(plant_id) in known_ids:
+                target = int(plant_id)
+            elif reference in by_reference:
+                target = by_reference[reference]
+            else:
+                ImportService._add_error(report, line, ["Plante introuvable (plant_id ou plant_reference)"])
+                continue
+            items.append((line, (kind, {**data, "plant_id": target})))
+        if not items:
+            return
+
+        inserted = ImportService._insert_each(
+            db, items, lambda batch: ImportService._insert_histories(db, [history for _, history in batch]), report
+        )
+        if ImportService.HISTORY_KINDS[kind][0] in HistoryService.LAST_CARE_COLUMNS:
+            HistoryService.rebuild_last_care(db, sorted({history["plant_id"] for _, (_, history) in inserted}))
+        db.commit()
+        report["imported"][kind] += len(inserted)
+
+    # ===== POINT D'ENTRÉE =====
+
+    @staticmethod
+    def import_records(db: Session, records: Iterable[Tuple[int, object]], kind: str = "plants") -> dict:
+        """
+        Importe des enregistrements (numéro de ligne, dict) par lots
+        Returns: {kind, total_rows, imported: {plants, watering, ...}, error_count,
+                  errors: [{row, errors}], elapsed_ms, rows_per_second}
+        """
+        if kind not in ImportService.KINDS:
+            raise ValueError(f"Type inconnu: {kind} (valeurs: {', '.join(ImportService.KINDS)})")
+        report = ImportService._new_report(kind)
+        synced: Set[str] = set()
+        started = time.perf_counter()
+        try:
+            for chunk in ImportService._chunks(records, ImportService.CHUNK_SIZE):
+                report["total_rows"] += len(chunk)
+                if kind == "plants":
+                    ImportService._import_plants_chunk(db, chunk, report, synced)
+                else:
+                    ImportService._import_history_chunk(db, kind, chunk, report)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            WateringScheduleService.invalidate()
+
+        elapsed = time.perf_counter() - started
+        report["elapsed_ms"] = round(elapsed * 1000, 1)
+        report["rows_per_second"] = round(report["total_rows"] / elapsed) if elapsed else None
+        logger.info(
+            f"Import {kind}: {report['total_rows']} lignes, {report['error_count']} erreurs, "
+            f"{report['elapsed_ms']} ms"
+        )
+        return report
+
+    @staticmethod
+    def import_stream(db: Session, stream: TextIO, fmt: str, kind: str = "plants") -> dict:
+        """Importe un flux CSV ou NDJSON (voir read_records et import_records)"""
+        if fmt not in ImportService.FORMATS:
+            raise ValueError(f"Format inconnu: {fmt} (valeurs: {', '.join(ImportService.FORMATS)})")
+        return ImportService.import_records(db, ImportService.read_records(stream, fmt), kind)
@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from app.utils.db import commit_delete
 from app.models.lookup import Unit, DiseaseType, TreatmentType, PlantHealthStatus, FertilizerType
 from app.schemas.lookup_schema import (
     UnitCreate, UnitUpdate, UnitResponse,
@@ -40,8 +41,7 @@ class UnitService:
     def delete(db: Session, unit_id: int):
         db_unit = db.query(Unit).filter(Unit.id == unit_id).first()
         if db_unit:
-            db.delete(db_unit)
-            db.commit()
+            commit_delete(db, db_unit, "unité")
         return db_unit
 
 
@@ -77,8 +77,7 @@ class DiseaseTypeService:
     def delete(db: Session, disease_type_id: int):
         db_disease_type = db.query(DiseaseType).filter(DiseaseType.id == disease_type_id).first()
         if db_disease_type:
-            db.delete(db_disease_type)
-            db.commit()
+            commit_delete(db, db_disease_type, "type de maladie")
         return db_disease_type
 
 
@@ -114,8 +113,7 @@ class TreatmentTypeService:
     def delete(db: Session, treatment_type_id: int):
         db_treatment_type = db.query(TreatmentType).filter(TreatmentType.id == treatment_type_id).first()
         if db_treatment_type:
-            db.delete(db_treatment_type)
-            db.commit()
+            commit_delete(db, db_treatment_type, "type de traitement")
         return db_treatment_type
 
 
@@ -151,8 +149,7 @@ class PlantHealthStatusService:
     def delete(db: Session, status_id: int):
         db_status = db.query(PlantHealthStatus).filter(PlantHealthStatus.id == status_id).first()
         if db_status:
-            db.delete(db_status)
-            db.commit()
+            commit_delete(db, db_status, "état de santé")
         return db_status
 
 
@@ -188,6 +185,5 @@ class FertilizerTypeService:
     def delete(db: Session, fertilizer_type_id: int):
         db_fertilizer_type = db.query(FertilizerType).filter(FertilizerType.id == fertilizer_type_id).first()
         if db_fertilizer_type:
-            db.delete(db_fertilizer_type)
-            db.commit()
+            commit_delete(db, db_fertilizer_type, "type d'engrais")
         return db_fertilizer_type
@@ -0,0 +1,197 @@
+"""
+Service pour l'ingestion asynchrone des photos
+L'upload brut est écrit sur disque et la réponse part immédiatement (202);
+l'encodage WebP + thumbnail est fait en tâche de fond dans le pool d'images.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.models.photo_job import PhotoJob
+from app.services.photo_service import PhotoService
+from app.utils.image_processor import MAX_UPLOAD_SIZE
+from app.utils.image_workers import image_pool, ImagePoolSaturated
+
+logger = logging.getLogger(__name__)
+
+
+class UploadTooLarge(Exception):
+    """Upload brut au-delà de PhotoJobService.MAX_UPLOAD_SIZE (413)"""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"Fichier trop volumineux (max {max_size // (1024 * 1024)}MB)")
+        self.max_size = max_size
+
+
+class PhotoJobService:
+    """Service pour les tâches d'ingestion de photos"""
+
+    CHUNK_SIZE = 1024 * 1024  # Copie de l'upload par blocs de 1MB
+    MAX_UPLOAD_SIZE = MAX_UPLOAD_SIZE  # Photo de téléphone brute (l'upload synchrone: 1MB)
+    ACTIVE_STATUSES = (PhotoJob.STATUS_PENDING, PhotoJob.STATUS_PROCESSING)
+
+    @staticmethod
+    def count_active(db: Session) -> int:
+        """Nombre de tâches en attente ou en cours"""
+        return db.query(PhotoJob).filter(
+            PhotoJob.status.in_(PhotoJobService.ACTIVE_STATUSES)
+        ).count()
+
+    @staticmethod
+    def create_job(db: Session, plant_id: int, source: BinaryIO, filename: Optional[str]) -> PhotoJob:
+        """
+        Copie l'upload brut dans UPLOADS_DIR (sans le décoder) et crée la tâche
+        Bloquant (disque): à appeler via run_in_threadpool depuis une route async
+
+        Raises:
+            UploadTooLarge: Au-delà de MAX_UPLOAD_SIZE (copie partielle supprimée)
+        """
+        suffix = Path(filename or "").suffix.lower()[:10]
+        upload_path = settings.UPLOADS_DIR / f"{uuid.uuid4()}{suffix}"
+        upload_size = 0
+
+        try:
+            with open(upload_path, "wb") as f:
+                while True:
+                    chunk = source.read(PhotoJobService.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    upload_size += len(chunk)
+                    if upload_size > PhotoJobService.MAX_UPLOAD_SIZE:
+                        raise UploadTooLarge(PhotoJobService.MAX_UPLOAD_SIZE)
+                    f.write(chunk)
+        except Exception:
+            upload_path.unlink(missing_ok=True)
+            raise
+
+        try:
+            job = PhotoJob(
+                plant_id=plant_id,
+                status=PhotoJob.STATUS_PENDING,
+                upload_path=str(upload_path),
+                original_filename=filename,
+                upload_size=upload_size,
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            return job
+        except Exception:
+            db.rollback()
+            upload_path.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def get_job(db: Session, job_id: int) -> Optional[PhotoJob]:
+        """Récupère une tâche"""
+        return db.query(PhotoJob).filter(PhotoJob.id == job_id).first()
+
+    @staticmethod
+    async def _encode(file_content: bytes) -> dict:
+        """Encode dans le pool d'images; une tâche de fond attend au lieu d'échouer"""
+        while True:
+            try:
+                return await image_pool.run(
+                    PhotoService.encode_upload, file_content, PhotoJobService.MAX_UPLOAD_SIZE
+                )
+            except ImagePoolSaturated as e:
+                await asyncio.sleep(e.retry_after)
+
+    @staticmethod
+    def _start(db: Session, job_id: int) -> Optional[Tuple[PhotoJob, int, Path]]:
+        """Passe la tâche en cours; None si elle n'est plus en attente (bloquant: DB)"""
+        job = PhotoJobService.get_job(db, job_id)
+        if not job or job.status != PhotoJob.STATUS_PENDING:
+            return None
+        job.status = PhotoJob.STATUS_PROCESSING
+        db.commit()
+        return job, job.plant_id, Path(job.upload_path)
+
+    @staticmethod
+    def _read_upload(plant_id: int, upload_path: Path) -> Tuple[Optional[bytes], Optional[str]]:
+        """Vérifie le quota puis lit l'upload brut (bloquant: disque)"""
+        error = PhotoService.check_quota(plant_id)
+        if error:
+            return None, error
+        return upload_path.read_bytes(), None
+
+    @staticmethod
+    def _save(db: Session, job: PhotoJob, plant_id: int, encoded: dict) -> Optional[str]:
+        """Écrit les fichiers et la photo, retourne l'erreur éventuelle (bloquant: disque + DB)"""
+        success, photo, msg = PhotoService.save_upload(plant_id, encoded, db)
+        if not success:
+            return msg
+        job.photo_id = photo.id
+        return None
+
+    @staticmethod
+    def _finish(db: Session, job: PhotoJob, upload_path: Path, error: Optional[str]) -> None:
+        """Enregistre le résultat et supprime l'upload brut (bloquant: DB + disque)"""
+        job.status = PhotoJob.STATUS_FAILED if error else PhotoJob.STATUS_DONE
+        job.error = error
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        upload_path.unlink(missing_ok=True)
+
+    @staticmethod
+    async def process_job(job_id: int, bind: Engine) -> None:
+        """
+        Traite une tâche en attente: encodage WebP + thumbnail, fichiers, DB
+        Utilise sa propre session (la session de la requête est fermée)
+        Tourne sur la boucle d'événements: DB et disque passent par le
+        threadpool, l'encodage par le pool d'images
+        """
+        db = sessionmaker(autocommit=False, autoflush=False, bind=bind)()
+        try:
+            started = await run_in_threadpool(PhotoJobService._start, db, job_id)
+            if started is None:
+                return
+            job, plant_id, upload_path = started
+
+            error = None
+            try:
+                file_content, error = await run_in_threadpool(
+                    PhotoJobService._read_upload, plant_id, upload_path
+                )
+                if not error:
+                    encoded = await PhotoJobService._encode(file_content)
+                    if not encoded["ok"]:
+                        error = encoded["message"]
+                    else:
+                        error = await run_in_threadpool(PhotoJobService._save, db, job, plant_id, encoded)
+                        if not error:
+                            logger.info(f"Tâche photo {job_id} terminée: {encoded['timings']}")
+            except Exception as e:
+                await run_in_threadpool(db.rollback)
+                error = f"Erreur traitement: {str(e)}"
+
+            await run_in_threadpool(PhotoJobService._finish, db, job, upload_path, error)
+        except Exception as e:
+            logger.error(f"Erreur tâche photo {job_id}: {str(e)}")
+        finally:
+            await run_in_threadpool(db.close)
+
+    @staticmethod
+    def reset_interrupted(db: Session) -> List[int]:
+        """
+        Remet en attente les tâches interrompues par un arrêt de l'application
+        Returns: ids des tâches à relancer
+        """
+        db.query(PhotoJob).filter(
+            PhotoJob.status == PhotoJob.STATUS_PROCESSING
+        ).update({"status": PhotoJob.STATUS_PENDING})
+        db.commit()
+        return [
+            job_id for (job_id,) in db.query(PhotoJob.id).filter(
+                PhotoJob.status == PhotoJob.STATUS_PENDING
+            ).order_by(PhotoJob.id).all()
+        ]
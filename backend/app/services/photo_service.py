@@ -1,20 +1,32 @@
 """
 Service pour gérer les photos de plantes
 Upload, conversion WebP, compression, stockage
+PIL importé à la première utilisation (hors démarrage de l'application)
 """
 
+from __future__ import annotations
+
 import os
+import time
 import uuid
 import logging
 from pathlib import Path
 from io import BytesIO
-from PIL import Image
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 
 from app.models.photo import Photo
 from app.config import settings
+from app.services.stats_service import StatsService
+from app.utils.derived_cache import derived_cache
+from app.utils.image_processor import (
+    decode_image, derive_versions, encode_webp, encode_webp_to_target, to_rgb,
+)
+
+if TYPE_CHECKING:
+    from PIL import Image
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +40,41 @@ class PhotoService:
     ALLOWED_FORMATS = {"JPEG", "PNG", "GIF", "BMP", "TIFF", "WEBP"}
     THUMBNAIL_SIZE = (300, 300)
     WEBP_QUALITY = 85
+    MIN_WEBP_QUALITY = 55  # En dessous: redimensionner plutôt que dégrader
     MAX_IMAGE_SIZE = (2000, 2000)
+    KNOWN_FILES_MAX = 100_000
+    
+    # Fichiers confirmés en DB (plant_id, filename): noms UUID, contenu immuable
+    _known_files: Set[Tuple[int, str]] = set()
+    
+    @staticmethod
+    def is_known_file(plant_id: int, filename: str) -> bool:
+        """True si le fichier a déjà été confirmé en DB"""
+        return (plant_id, filename) in PhotoService._known_files
+    
+    @staticmethod
+    def remember_file(plant_id: int, filename: str) -> None:
+        """Mémorise un fichier confirmé en DB (ensemble vidé s'il devient trop grand)"""
+        if len(PhotoService._known_files) >= PhotoService.KNOWN_FILES_MAX:
+            PhotoService._known_files.clear()
+        PhotoService._known_files.add((plant_id, filename))
+    
+    @staticmethod
+    def forget_file(plant_id: int, filename: str) -> None:
+        """Oublie un fichier (photo supprimée)"""
+        PhotoService._known_files.discard((plant_id, filename))
+    
+    @staticmethod
+    def forget_plant_files(plant_id: int) -> None:
+        """Oublie tous les fichiers d'une plante (plante supprimée)"""
+        PhotoService._known_files = {
+            key for key in PhotoService._known_files if key[0] != plant_id
+        }
+    
+    @staticmethod
+    def clear_known_files() -> None:
+        """Vide l'ensemble des fichiers connus"""
+        PhotoService._known_files.clear()
     
     @staticmethod
     def _get_plant_photos_path(plant_id: int) -> Path:
@@ -45,86 +91,75 @@ class PhotoService:
         return path
     
     @staticmethod
-    def _validate_file(file_content: bytes) -> Tuple[bool, str]:
-        """Valide le fichier avant traitement"""
+    def _open_validated(file_content: bytes, max_size: Optional[int] = None) -> Tuple[Optional[Image.Image], str]:
+        """
+        Valide le fichier avant traitement
+        Image.open ne lit que l'en-tête: l'image retournée n'est pas encore décodée
+        max_size: taille brute acceptée (défaut: 2x MAX_FILE_SIZE, upload synchrone)
+        """
+        from PIL import Image
         # Vérifier la taille
-        if len(file_content) > PhotoService.MAX_FILE_SIZE * 2:  # 2x car non compressé
-            return False, f"Fichier trop volumineux (max 500KB après compression)"
+        if max_size is None:
+            if len(file_content) > PhotoService.MAX_FILE_SIZE * 2:  # 2x car non compressé
+                return None, f"Fichier trop volumineux (max 500KB après compression)"
+        elif len(file_content) > max_size:
+            return None, f"Fichier trop volumineux (max {max_size // (1024 * 1024)}MB)"
         
         # Vérifier que c'est une image
         try:
             img = Image.open(BytesIO(file_content))
             if img.format and img.format.upper() not in PhotoService.ALLOWED_FORMATS:
-                return False, f"Format non accepté. Acceptés: {', '.join(PhotoService.ALLOWED_FORMATS)}"
-            return True, "OK"
+                return None, f"Format non accepté. Acceptés: {', '.join(PhotoService.ALLOWED_FORMATS)}"
+            return img, "OK"
         except Exception as e:
-            return False, f"Fichier invalide: {str(e)}"
+            return None, f"Fichier invalide: {str(e)}"
+    
+    @staticmethod
+    def _validate_file(file_content: bytes) -> Tuple[bool, str]:
+        """Valide le fichier avant traitement"""
+        img, msg = PhotoService._open_validated(file_content)
+        return img is not None, msg
     
     @staticmethod
     def _convert_to_webp(image: Image.Image, quality: int = 85) -> bytes:
         """Convertit une image en WebP"""
-        output = BytesIO()
-        
-        # Convertir en RGB si nécessaire (pour support WebP)
-        if image.mode in ("RGBA", "LA", "P"):
-            # Créer un fond blanc pour les images avec transparence
-            background = Image.new("RGB", image.size, (255, 255, 255))
-            if image.mode == "P":
-                image = image.convert("RGBA")
-            background.paste(image, mask=image.split()[-1] if image.mode == "RGBA" else None)
-            image = background
-        elif image.mode != "RGB":
-            image = image.convert("RGB")
-        
-        image.save(output, format="WEBP", quality=quality, method=6)
-        return output.getvalue()
+        return encode_webp(to_rgb(image), quality)
     
     @staticmethod
-    def _compress_to_target(image_bytes: bytes, target_size: int = MAX_FILE_SIZE) -> bytes:
-        """Compresse l'image jusqu'à atteindre la taille cible"""
-        img = Image.open(BytesIO(image_bytes))
-        
-        quality = PhotoService.WEBP_QUALITY
-        while quality > 50:
-            webp_data = PhotoService._convert_to_webp(img, quality)
-            if len(webp_data) <= target_size:
-                return webp_data
-            quality -= 5
+    def _compress_image_to_target(img: Image.Image, target_size: int = MAX_FILE_SIZE) -> bytes:
+        """
+        Compresse une image RGB décodée jusqu'à atteindre la taille cible
+        Qualité cherchée par interpolation (3 encodages max), entre WEBP_QUALITY et
+        MIN_WEBP_QUALITY; si rien ne tient, redimensionne en 1500px et recommence.
+        """
+        encoded = encode_webp_to_target(
+            img, target_size,
+            quality=PhotoService.WEBP_QUALITY,
+            min_quality=PhotoService.MIN_WEBP_QUALITY,
+        )
+        if encoded["fits"]:
+            return encoded["data"]
         
         # Si encore trop volumineux, redimensionner
-        if len(webp_data) > target_size:
-            img.thumbnail((1500, 1500), Image.Resampling.LANCZOS)
-            quality = PhotoService.WEBP_QUALITY
-            while quality > 50:
-                webp_data = PhotoService._convert_to_webp(img, quality)
-                if len(webp_data) <= target_size:
-                    return webp_data
-                quality -= 5
-        
-        return webp_data
+        from PIL import Image
+        img = img.copy()
+        img.thumbnail((1500, 1500), Image.Resampling.LANCZOS)
+        return encode_webp_to_target(
+            img, target_size,
+            quality=PhotoService.WEBP_QUALITY,
+            min_quality=PhotoService.MIN_WEBP_QUALITY,
+        )["data"]
     
     @staticmethod
-    def process_upload(
-        plant_id: int,
-        file_content: bytes,
-        filename: str,
-        db: Session,
-    ) -> Tuple[bool, Optional[Photo], str]:
-        """
-        Traite l'upload d'une photo:
-        1. Valide le fichier
-        2. Redimensionne si besoin
-        3. Convertit en WebP + compression
-        4. Génère thumbnail
-        5. Sauvegarde fichiers et metadata
-        """
-        
-        # 1. Valider
-        valid, msg = PhotoService._validate_file(file_content)
-        if not valid:
-            return False, None, msg
-        
-        # 2. Vérifier quota total de la plante
+    def _compress_to_target(image_bytes: bytes, target_size: int = MAX_FILE_SIZE) -> bytes:
+        """Compresse l'image (octets bruts) jusqu'à atteindre la taille cible"""
+        from PIL import Image
+        img = decode_image(Image.open(BytesIO(image_bytes)), PhotoService.MAX_IMAGE_SIZE)
+        return PhotoService._compress_image_to_target(img, target_size)
+    
+    @staticmethod
+    def check_quota(plant_id: int) -> Optional[str]:
+        """Retourne un message d'erreur si le quota de la plante est atteint"""
         plant_photos_dir = PhotoService._get_plant_photos_path(plant_id)
         total_size = sum(
             f.stat().st_size for f in plant_photos_dir.rglob("*.webp")
@@ -132,36 +167,87 @@ class PhotoService:
         )
         
         if total_size > PhotoService.MAX_TOTAL_PER_PLANT:
-            return False, None, f"Quota de 5MB atteint pour cette plante"
+            return f"Quota de 5MB atteint pour cette plante"
+        return None
+    
+    @staticmethod
+    def encode_upload(file_content: bytes, max_size: Optional[int] = None) -> dict:
+        """
+        Partie CPU de l'upload: validation, WebP compressé, thumbnail
+        Sans accès disque ni DB: exécutable dans un processus du pool d'images
+        (app.utils.image_workers).
+        max_size: taille brute acceptée (voir _open_validated); l'ingestion
+        asynchrone accepte les photos de téléphone non compressées
+        
+        Returns:
+            dict: {ok, message, webp, thumb, width, height, timings}
+            timings: durée de chaque étape en ms
+        """
+        timings = {}
+        started = time.perf_counter()
+        
+        def stage(name: str) -> None:
+            nonlocal started
+            now = time.perf_counter()
+            timings[name] = round((now - started) * 1000, 2)
+            started = now
+        
+        result = {"ok": False, "message": "", "webp": None, "thumb": None,
+                  "width": None, "height": None, "timings": timings}
         
-        # 3. Ouvrir et redimensionner
-        img = Image.open(BytesIO(file_content))
-        img.thumbnail(PhotoService.MAX_IMAGE_SIZE, Image.Resampling.LANCZOS)
+        # 1. Valider (lecture de l'en-tête seulement)
+        img, msg = PhotoService._open_validated(file_content, max_size)
+        stage("validate")
+        if img is None:
+            result["message"] = msg
+            return result
         
-        # 4. Convertir en WebP + compression
-        webp_data = PhotoService._compress_to_target(file_content)
+        # 2. Décoder une seule fois, directement à MAX_IMAGE_SIZE (draft JPEG)
+        result["width"], result["height"] = img.size
+        img = decode_image(img, PhotoService.MAX_IMAGE_SIZE)
+        stage("decode")
+        
+        # 3. Convertir en WebP + compression (depuis l'image déjà réduite)
+        webp_data = PhotoService._compress_image_to_target(img)
+        stage("encode")
         
         if len(webp_data) > PhotoService.MAX_FILE_SIZE:
-            return False, None, "Impossible de compresser le fichier assez (>500KB)"
+            result["message"] = "Impossible de compresser le fichier assez (>500KB)"
+            return result
+        
+        # 4. Générer thumbnail depuis l'image réduite
+        thumb = derive_versions(img, {"thumb": PhotoService.THUMBNAIL_SIZE})["thumb"]
+        thumb_data = encode_webp(thumb, PhotoService.WEBP_QUALITY)
+        stage("thumbnail")
         
-        # 5. Générer thumbnail
-        img.thumbnail(PhotoService.THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
-        thumb_data = PhotoService._convert_to_webp(img, PhotoService.WEBP_QUALITY)
+        result.update(ok=True, message="OK", webp=webp_data, thumb=thumb_data)
+        return result
+    
+    @staticmethod
+    def save_upload(plant_id: int, encoded: dict, db: Session) -> Tuple[bool, Optional[Photo], str]:
+        """
+        Écrit les fichiers produits par encode_upload et enregistre la photo en DB
+        Ajoute les étapes "save" et "db" à encoded["timings"]
+        """
+        timings = encoded.setdefault("timings", {})
+        started = time.perf_counter()
         
-        # 6. Générer UUID et sauver fichiers
+        # Générer UUID et sauver fichiers
         file_uuid = str(uuid.uuid4())
         file_path = PhotoService._get_plant_photos_path(plant_id) / f"{file_uuid}.webp"
         thumb_path = PhotoService._get_plant_thumbs_path(plant_id) / f"{file_uuid}.webp"
         
         try:
             with open(file_path, "wb") as f:
-                f.write(webp_data)
+                f.write(encoded["webp"])
             with open(thumb_path, "wb") as f:
-                f.write(thumb_data)
+                f.write(encoded["thumb"])
         except Exception as e:
             return False, None, f"Erreur lors de la sauvegarde: {str(e)}"
+        timings["save"] = round((time.perf_counter() - started) * 1000, 2)
+        started = time.perf_counter()
         
-        # 7. Sauver metadata en DB
+        # Sauver metadata en DB
         try:
             # Si c'est la première photo, la marquer comme primary
             existing_photos = db.query(Photo).filter(
@@ -171,12 +257,16 @@ class PhotoService:
             photo = Photo(
                 plant_id=plant_id,
                 filename=f"{file_uuid}.webp",
-                file_size=len(webp_data),
+                file_size=len(encoded["webp"]),
+                width=encoded.get("width"),
+                height=encoded.get("height"),
                 is_primary=(existing_photos == 0),  # Première photo = primary
             )
             db.add(photo)
+            StatsService.apply_delta(db, {"total_photos": 1})
             db.commit()
             db.refresh(photo)
+            timings["db"] = round((time.perf_counter() - started) * 1000, 2)
             
             return True, photo, "Photo uploadée avec succès"
         except Exception as e:
@@ -185,6 +275,32 @@ class PhotoService:
             thumb_path.unlink(missing_ok=True)
             return False, None, f"Erreur DB: {str(e)}"
     
+    @staticmethod
+    def process_upload(
+        plant_id: int,
+        file_content: bytes,
+        filename: str,
+        db: Session,
+    ) -> Tuple[bool, Optional[Photo], str]:
+        """
+        Traite l'upload d'une photo de façon synchrone:
+        1. Vérifie le quota de la plante
+        2. Valide, redimensionne, convertit en WebP + thumbnail (encode_upload)
+        3. Sauvegarde fichiers et metadata (save_upload)
+        
+        La route d'upload enchaîne les mêmes étapes mais exécute encode_upload
+        dans le pool d'images pour ne pas bloquer la boucle d'événements.
+        """
+        quota_error = PhotoService.check_quota(plant_id)
+        if quota_error:
+            return False, None, quota_error
+        
+        encoded = PhotoService.encode_upload(file_content)
+        if not encoded["ok"]:
+            return False, None, encoded["message"]
+        
+        return PhotoService.save_upload(plant_id, encoded, db)
+    
     @staticmethod
     def get_photos(db: Session, plant_id: int) -> list:
         """Récupère toutes les photos d'une plante"""
@@ -192,6 +308,46 @@ class PhotoService:
             Photo.plant_id == plant_id
         ).order_by(Photo.is_primary.desc(), Photo.created_at.asc()).all()
     
+    @staticmethod
+    def get_primary_photos(db: Session, plant_ids: List[int]) -> Dict[int, dict]:
+        """
+        Photo principale de chaque plante, en une requête (ROW_NUMBER par plante)
+        Même ordre que get_photos: la primary, sinon la plus ancienne
+        
+        Returns:
+            {plant_id: {id, filename, width, height, url, thumb_url}}
+        """
+        if not plant_ids:
+            return {}
+        rows = db.execute(PhotoService._primary_photos_query(plant_ids)).all()
+        return PhotoService._format_primary_photos(rows)
+    
+    @staticmethod
+    def _primary_photos_query(plant_ids: List[int]):
+        """Requête de get_primary_photos (partagée avec AsyncPlantService)"""
+        ranked = select(
+            Photo.id, Photo.plant_id, Photo.filename, Photo.width, Photo.height,
+            func.row_number().over(
+                partition_by=Photo.plant_id,
+                order_by=(Photo.is_primary.desc(), Photo.created_at.asc(), Photo.id.asc()),
+            ).label("position"),
+        ).where(Photo.plant_id.in_(plant_ids)).subquery()
+        return select(ranked).where(ranked.c.position == 1)
+    
+    @staticmethod
+    def _format_primary_photos(rows) -> Dict[int, dict]:
+        return {
+            row.plant_id: {
+                "id": row.id,
+                "filename": row.filename,
+                "width": row.width,
+                "height": row.height,
+                "url": f"/api/photos/{row.plant_id}/{row.filename}",
+                "thumb_url": f"/api/photos/{row.plant_id}/{row.filename}?size=thumb",
+            }
+            for row in rows
+        }
+    
     @staticmethod
     def get_photo(db: Session, photo_id: int, plant_id: int) -> Optional[Photo]:
         """Récupère une photo spécifique"""
@@ -218,6 +374,9 @@ class PhotoService:
             thumb_path = PhotoService.get_thumbnail_path(photo)
             if thumb_path.exists():
                 thumb_path.unlink()
+            
+            # Supprimer les variantes générées à la demande
+            derived_cache.discard(plant_id, photo.filename)
         except Exception as e:
             # Log l'erreur mais continue la suppression en DB
             logger.error(f"Erreur suppression fichiers photo {photo_id}: {str(e)}")
@@ -236,7 +395,9 @@ class PhotoService:
                     db.add(next_photo)
             
             db.delete(photo)
+            StatsService.apply_delta(db, {"total_photos": -1})
             db.commit()
+            PhotoService.forget_file(plant_id, photo.filename)
             return True
         except Exception as e:
             logger.error(f"Erreur suppression photo en DB {photo_id}: {str(e)}")
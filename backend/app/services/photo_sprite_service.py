@@ -0,0 +1,118 @@
+"""
+Service pour les sprites de thumbnails (grille des plantes)
+Une page de plantes = une image WebP (thumbnails des photos principales)
++ une carte JSON des coordonnées, au lieu d'une requête par carte.
+"""
+
+import hashlib
+import math
+from pathlib import Path
+from typing import List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.photo import Photo
+from app.utils.derived_cache import derived_cache
+from app.utils.image_processor import render_sprite
+from app.utils.image_workers import image_pool
+
+
+class PhotoSpriteService:
+    """Service pour les sprites de thumbnails"""
+
+    TILE_SIZE = 150  # Cellule carrée (thumbnail recadrée au centre)
+    COLUMNS = 10
+    MAX_PLANTS = 200
+
+    @staticmethod
+    def get_members(db: Session, plant_ids: List[int]) -> Tuple[List[dict], List[int]]:
+        """
+        Photos principales des plantes, dans l'ordre demandé (une requête)
+        Returns: (membres avec thumbnail présente, plant_ids sans thumbnail)
+        """
+        rows = db.query(
+            Photo.id, Photo.plant_id, Photo.filename, Photo.updated_at
+        ).filter(
+            Photo.plant_id.in_(plant_ids),
+            Photo.is_primary == True
+        ).all()
+        by_plant = {row.plant_id: row for row in rows}
+
+        members, missing = [], []
+        for plant_id in plant_ids:
+            row = by_plant.get(plant_id)
+            source = settings.PHOTOS_DIR / str(plant_id) / "thumbs" / row.filename if row else None
+            if source is None or not source.exists():
+                missing.append(plant_id)
+                continue
+            members.append({
+                "plant_id": plant_id,
+                "photo_id": row.id,
+                "updated_at": row.updated_at,
+                "source": str(source),
+            })
+        return members, missing
+
+    @staticmethod
+    def sprite_key(members: List[dict]) -> str:
+        """Hash du contenu du sprite: (plante, photo, updated_at) dans l'ordre + grille"""
+        digest = hashlib.sha256(
+            f"{PhotoSpriteService.TILE_SIZE}x{PhotoSpriteService.COLUMNS}".encode()
+        )
+        for member in members:
+            digest.update(
+                f"|{member['plant_id']}:{member['photo_id']}:{member['updated_at'].isoformat()}".encode()
+            )
+        return digest.hexdigest()[:32]
+
+    @staticmethod
+    def sprite_path(key: str) -> Path:
+        """Chemin du sprite dans le cache des images dérivées"""
+        return derived_cache.directory / "sprites" / f"{key}.webp"
+
+    @staticmethod
+    def layout(members: List[dict]) -> dict:
+        """Dimensions du sprite et coordonnées de chaque cellule (ligne par ligne)"""
+        tile, columns = PhotoSpriteService.TILE_SIZE, PhotoSpriteService.COLUMNS
+        tiles = []
+        for index, member in enumerate(members):
+            row, column = divmod(index, columns)
+            tiles.append({
+                "plant_id": member["plant_id"],
+                "photo_id": member["photo_id"],
+                "x": column * tile,
+                "y": row * tile,
+                "width": tile,
+                "height": tile,
+            })
+        return {
+            "width": min(len(members), columns) * tile,
+            "height": math.ceil(len(members) / columns) * tile,
+            "tiles": tiles,
+        }
+
+    @staticmethod
+    async def build(db: Session, plant_ids: List[int]) -> dict:
+        """
+        Carte du sprite d'une page de plantes; le sprite est rendu (pool d'images)
+        s'il n'est pas déjà en cache
+        """
+        members, missing = PhotoSpriteService.get_members(db, plant_ids)
+        key = PhotoSpriteService.sprite_key(members) if members else None
+        if key:
+            sources = [member["source"] for member in members]
+            await derived_cache.get_or_render(
+                PhotoSpriteService.sprite_path(key),
+                lambda: image_pool.run(
+                    render_sprite, sources, PhotoSpriteService.TILE_SIZE, PhotoSpriteService.COLUMNS
+                ),
+            )
+        return {
+            "key": key,
+            "url": f"/api/photo-sprites/{key}.webp" if key else None,
+            "tile_size": PhotoSpriteService.TILE_SIZE,
+            "columns": PhotoSpriteService.COLUMNS,
+            **PhotoSpriteService.layout(members),
+            "missing": missing,
+        }
@@ -3,19 +3,167 @@ Service métier pour les plantes
 Gestion CRUD + logique métier (référence generation, etc)
 """
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, or_
-from typing import List, Optional
-from datetime import datetime
+from sqlalchemy import or_, and_, cast, func, select, update, literal, literal_column, table, column, Float, Integer
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional, Tuple
+from datetime import date, datetime, timedelta
 import re
 
 from app.models.plant import Plant
+from app.models.reference_sequence import ReferenceSequence
+from app.models.plant_search import FTS_TABLE, BM25_WEIGHTS, build_match_query, search_index_exists
 from app.schemas.plant_schema import PlantCreate, PlantUpdate
+from app.services.photo_service import PhotoService
+from app.services.stats_service import StatsService
+from app.services.watering_schedule_service import WateringScheduleService
+from app.utils.derived_cache import derived_cache
+from app.utils.pagination import encode_cursor, decode_cursor
+
+# Référence PREFIX-NNN (préfixe de famille, numéro de séquence)
+REFERENCE_PATTERN = re.compile(r"^(.+)-(\d+)$")
 
 
 class PlantService:
     """Service pour gérer les plantes et leur logique métier"""
     
+    # Tentatives de création quand la référence générée est déjà prise
+    REFERENCE_RETRIES = 3
+    
+    # Recherche sans index FTS5: score constant (tri "relevance" = ordre des id)
+    NO_RELEVANCE = 0.0
+    
+    # Clés de tri autorisées pour les listes (toujours départagées par id)
+    SORT_KEYS = {
+        "id": Plant.id,
+        "name": Plant.name,
+    }
+    
+    # ===== PAGINATION =====
+    
+    @staticmethod
+    def _paginate(query, skip: int, limit: int, after: Optional[str] = None, sort: str = "id", key=None):
+        """
+        Applique le tri et la pagination à une requête de plantes
+        
+        Deux modes:
+        - offset (compatibilité): OFFSET skip LIMIT limit
+        - keyset (si after fourni): WHERE (clé, id) > (curseur) LIMIT limit
+          → coût constant quelle que soit la profondeur de la page
+        
+        Args:
+            key: Expression de tri explicite (ex: score bm25), sinon SORT_KEYS[sort]
+        
+        Raises:
+            ValueError: Si le tri est inconnu ou le curseur invalide
+        """
+        if key is None:
+            if sort not in PlantService.SORT_KEYS:
+                raise ValueError(f"Tri inconnu: {sort}")
+            key = PlantService.SORT_KEYS[sort]
+        order = [Plant.id] if sort == "id" else [key, Plant.id]
+        
+        if after:
+            sort_value, last_id = decode_cursor(after, sort)
+            if sort == "id":
+                query = query.filter(Plant.id > last_id)
+            else:
+                query = query.filter(or_(
+                    key > sort_value,
+                    and_(key == sort_value, Plant.id > last_id),
+                ))
+            return query.order_by(*order).limit(limit)
+        
+        return query.order_by(*order).offset(skip).limit(limit)
+    
+    @staticmethod
+    def next_cursor(plants: list, limit: int, sort: str = "id") -> Optional[str]:
+        """
+        Curseur de la page suivante, None si la page courante est la dernière
+        
+        Une page incomplète signifie qu'il n'y a plus rien après.
+        """
+        if not plants or len(plants) < limit:
+            return None
+        last = plants[-1]
+        if isinstance(last, dict):  # Projection (fields=)
+            return encode_cursor(sort, last[sort], last["id"])
+        return encode_cursor(sort, getattr(last, sort), last.id)
+    
+    @staticmethod
+    def parse_fields(fields: Optional[str], sort: str = "id") -> Optional[List[str]]:
+        """
+        Colonnes demandées via ?fields=a,b (sparse fieldset), None = plante complète
+        id et la clé de tri sont toujours sélectionnés (curseur de pagination)
+        
+        Raises:
+            ValueError: Si un champ n'est pas une colonne de plants
+        """
+        if not fields:
+            return None
+        requested = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in requested if name not in Plant.__table__.c]
+        if unknown:
+            raise ValueError(f"Champs inconnus: {', '.join(unknown)}")
+        keys = ["id"] + ([sort] if sort in PlantService.SORT_KEYS else [])
+        return list(dict.fromkeys(keys + requested))
+    
+    @staticmethod
+    def _fetch(query, fields: Optional[List[str]] = None, *extra) -> list:
+        """
+        Exécute une requête de plantes
+        - sans fields: objets Plant complets
+        - avec fields: SELECT limité à ces colonnes, lignes en dicts (pas d'objets ORM)
+        
+        Args:
+            extra: Expressions supplémentaires à sélectionner (ex: score bm25)
+        """
+        if not fields:
+            return query.all()
+        return [dict(row._mapping) for row in query.with_entities(*PlantService._columns(fields), *extra)]
+    
+    @staticmethod
+    def _columns(fields: List[str]) -> list:
+        """Colonnes de plants correspondant à fields (voir parse_fields)"""
+        return [Plant.__table__.c[name] for name in fields]
+    
+    # ===== CRITÈRES PARTAGÉS (Session et AsyncSession) =====
+    
+    @staticmethod
+    def _list_filters(include_archived: bool = False, include_deleted: bool = False) -> list:
+        """Critères de get_all"""
+        filters = []
+        if not include_deleted:
+            filters.append(Plant.deleted_at.is_(None))
+        if not include_archived:
+            filters.append(Plant.is_archived == False)
+        return filters
+    
+    @staticmethod
+    def _search_matches(match: str):
+        """Sous-requête FTS5 (plant_id, rank bm25) des plantes correspondant à match"""
+        fts = table(FTS_TABLE, column("rowid", Integer))
+        fts_ref = literal_column(FTS_TABLE)
+        return select(
+            fts.c.rowid.label("plant_id"),
+            func.bm25(fts_ref, *BM25_WEIGHTS).label("rank"),
+        ).where(fts_ref.op("MATCH")(match)).subquery("matches")
+    
+    @staticmethod
+    def _ilike_filters(q: str) -> list:
+        """Critères de la recherche ILIKE (bases sans index FTS5)"""
+        pattern = f"%{q.strip()}%"
+        return [
+            *PlantService._list_filters(),
+            or_(
+                Plant.name.ilike(pattern),
+                Plant.scientific_name.ilike(pattern),
+                Plant.description.ilike(pattern),
+            ),
+        ]
+    
     # ===== RÉFÉRENCE GENERATION =====
     
     @staticmethod
@@ -25,9 +173,10 @@ class PlantService:
         
         Règles:
         - Préfixe: 5 premières lettres de la famille (MAJUSCULES)
-        - Numéro: compteur séquentiel (3 chiffres padded avec zéros)
+        - Numéro: séquence du préfixe (table reference_sequences, 3 chiffres min.)
         - Exemples: "ARACA-001", "ARACA-042", "PHALA-001"
-        - Unicité: garantie par unique constraint en BD
+        - Unicité: numéro réservé dans la transaction courante (pas de doublon
+          entre créations concurrentes) + unique constraint en BD
         
         Args:
             db: Session SQLAlchemy
@@ -42,34 +191,117 @@ class PlantService:
         if not family or not family.strip():
             raise ValueError("La famille est requise pour générer une référence")
         
-        # 1. Extraire les 5 premières lettres en MAJUSCULES
-        prefix = family.strip()[:5].upper()
+        prefix = PlantService.reference_prefix(family)
+        return PlantService.format_reference(prefix, PlantService.allocate_references(db, prefix))
+    
+    @staticmethod
+    def reference_prefix(family: str) -> str:
+        """Préfixe de référence d'une famille (5 premières lettres, majuscules)"""
+        return family.strip()[:5].upper()
+    
+    @staticmethod
+    def format_reference(prefix: str, number: int) -> str:
+        """PREFIX-NNN (numéro sur 3 chiffres minimum)"""
+        return f"{prefix}-{str(number).zfill(3)}"
+    
+    @staticmethod
+    def _last_reference_number(prefix: str):
+        """
+        Plus grand numéro utilisé par les plantes pour un préfixe (sous-requête)
+        Comparaison numérique: "ARACA-1000" après "ARACA-999"
+        """
+        return select(
+            func.coalesce(func.max(cast(func.substr(Plant.reference, len(prefix) + 2), Integer)), 0)
+        ).where(
+            func.upper(func.substr(Plant.reference, 1, len(prefix) + 1)) == f"{prefix}-"
+        ).scalar_subquery()
+    
+    @staticmethod
+    def allocate_references(db: Session, prefix: str, count: int = 1) -> int:
+        """
+        Réserve count numéros consécutifs pour un préfixe, sans commit
         
-        # 2. Chercher toutes les références avec ce préfixe
-        #    Pattern: "{PREFIX}-NNN"
-        pattern = f"{prefix}-%"
+        Cas courant: un UPDATE ... RETURNING sur la clé primaire (temps constant).
+        Le verrou d'écriture est pris dans la transaction de l'appelant: deux
+        créations concurrentes obtiennent des numéros différents, et un rollback
+        ne laisse qu'un trou dans la séquence.
+        Première réservation d'un préfixe: séquence initialisée depuis les
+        références existantes (INSERT ... ON CONFLICT si un autre appel l'a créée).
         
-        last_plant = db.query(Plant).filter(
-            Plant.reference.ilike(pattern)
-        ).order_by(desc(Plant.reference)).first()
+        Returns:
+            int: Premier numéro réservé (les suivants: +1 .. +count-1)
+        """
+        sequences = ReferenceSequence.__table__
+        next_value = db.execute(
+            update(sequences)
+            .where(sequences.c.prefix == prefix)
+            .values(next_value=sequences.c.next_value + count)
+            .returning(sequences.c.next_value)
+        ).scalar()
+        if next_value is None:
+            next_value = db.execute(
+                sqlite_insert(sequences)
+                .values(prefix=prefix, next_value=PlantService._last_reference_number(prefix) + 1 + count)
+                .on_conflict_do_update(
+                    index_elements=[sequences.c.prefix],
+                    set_={"next_value": sequences.c.next_value + count},
+                )
+                .returning(sequences.c.next_value)
+            ).scalar()
+        return next_value - count
+    
+    @staticmethod
+    def sync_reference_sequence(db: Session, prefix: str, minimum: int = 1) -> None:
+        """
+        Avance la séquence au-delà des références existantes (saisies manuelles,
+        imports avec référence) et d'au moins minimum; sans commit
+        """
+        sequences = ReferenceSequence.__table__
+        floor = func.max(PlantService._last_reference_number(prefix) + 1, minimum)
+        statement = sqlite_insert(sequences).values(prefix=prefix, next_value=floor)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[sequences.c.prefix],
+            set_={"next_value": func.max(sequences.c.next_value, statement.excluded.next_value)},
+        ))
+    
+    @staticmethod
+    def parse_reference(reference: Optional[str]) -> Optional[Tuple[str, int]]:
+        """(PREFIX, numéro) d'une référence PREFIX-NNN, None sinon"""
+        match = REFERENCE_PATTERN.match((reference or "").strip())
+        if not match:
+            return None
+        return match.group(1).upper(), int(match.group(2))
+    
+    @staticmethod
+    def sync_manual_reference(db: Session, reference: Optional[str]) -> None:
+        """Référence écrite telle quelle (saisie, import): la séquence de son préfixe passe au-delà"""
+        parsed = PlantService.parse_reference(reference)
+        if parsed:
+            prefix, number = parsed
+            PlantService.sync_reference_sequence(db, prefix, number + 1)
+    
+    @staticmethod
+    def assign_reference(db: Session, plant: Plant, family: str) -> str:
+        """
+        Génère une référence pour la plante et l'écrit (flush), sans commit
+        Référence déjà prise (saisie manuelle non suivie par la séquence):
+        séquence resynchronisée puis nouvel essai
         
-        # 3. Extraire le numéro courant
-        current_number = 0
-        if last_plant and last_plant.reference:
+        Raises:
+            IntegrityError: Après REFERENCE_RETRIES essais
+        """
+        for attempt in range(PlantService.REFERENCE_RETRIES):
+            reference = PlantService.generate_reference(db, family)
             try:
-                # Format: "ARACA-001" → extraire 001
-                parts = last_plant.reference.split('-')
-                if len(parts) == 2:
-                    current_number = int(parts[1])
-            except (ValueError, IndexError):
-                # Si format invalide, commencer à 0
-                current_number = 0
-        
-        # 4. Incrémenter et formater
-        next_number = current_number + 1
-        reference = f"{prefix}-{str(next_number).zfill(3)}"
-        
-        return reference
+                with db.begin_nested():
+                    plant.reference = reference
+                    db.add(plant)
+                    db.flush()
+                return reference
+            except IntegrityError:
+                if attempt == PlantService.REFERENCE_RETRIES - 1:
+                    raise
+                PlantService.sync_reference_sequence(db, PlantService.reference_prefix(family))
     
     # ===== CRUD OPERATIONS =====
     
@@ -101,20 +333,18 @@ class PlantService:
                 plant_dict['scientific_name'] = f"{genus} {species}"
             
             # 2. Générer reference si absent mais family présente
-            if (not plant_dict.get('reference') and plant_dict.get('family')):
-                try:
-                    plant_dict['reference'] = PlantService.generate_reference(
-                        db, 
-                        plant_dict['family']
-                    )
-                except ValueError:
-                    # Si génération échoue, laisser vide (sera geré par UI)
-                    pass
-            
-            # 3. Créer la plante
             plant = Plant(**plant_dict)
-            db.add(plant)
+            family = plant_dict.get('family')
+            if not plant_dict.get('reference') and family and family.strip():
+                PlantService.assign_reference(db, plant, family)
+            else:
+                db.add(plant)
+                db.flush()
+                PlantService.sync_manual_reference(db, plant.reference)
+            
+            StatsService.track_plant_change(db, {}, StatsService.plant_snapshot(plant))
             db.commit()
+            WateringScheduleService.invalidate()
             db.refresh(plant)
             return plant
             
@@ -129,31 +359,198 @@ class PlantService:
         limit: int = 100,
         include_archived: bool = False,
         include_deleted: bool = False,
+        after: Optional[str] = None,
+        sort: str = "id",
+        fields: Optional[List[str]] = None,
     ) -> List[Plant]:
         """
         Récupère toutes les plantes avec filtres
         
         Args:
             db: Session SQLAlchemy
-            skip: Nombre de plantes à sauter (pagination)
+            skip: Nombre de plantes à sauter (pagination offset)
             limit: Nombre max de plantes à retourner
             include_archived: Inclure les plantes archivées
             include_deleted: Inclure les plantes supprimées (soft delete)
+            after: Curseur de la page précédente (pagination keyset, ignore skip)
+            sort: Clé de tri ("id" ou "name")
+            fields: Colonnes à sélectionner (voir parse_fields), None = plantes complètes
         
         Returns:
-            List[Plant]: Liste des plantes
+            List[Plant]: Liste des plantes (dicts si fields)
         """
-        query = db.query(Plant)
+        # Filtrer soft deleted / archived
+        query = db.query(Plant).filter(*PlantService._list_filters(include_archived, include_deleted))
         
-        # Filtrer soft deleted
-        if not include_deleted:
-            query = query.filter(Plant.deleted_at.is_(None))
+        return PlantService._fetch(PlantService._paginate(query, skip, limit, after, sort), fields)
+    
+    @staticmethod
+    def get_archived(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+        sort: str = "id",
+        fields: Optional[List[str]] = None,
+    ) -> List[Plant]:
+        """Récupère les plantes archivées (non supprimées)"""
+        query = db.query(Plant).filter(
+            Plant.deleted_at.is_(None),
+            Plant.is_archived == True,
+        )
+        return PlantService._fetch(PlantService._paginate(query, skip, limit, after, sort), fields)
+    
+    @staticmethod
+    def search(
+        db: Session,
+        q: str,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+        sort: str = "relevance",
+        fields: Optional[List[str]] = None,
+    ) -> List[Plant]:
+        """
+        Recherche plein texte dans name, scientific_name et description
         
-        # Filtrer archived
-        if not include_archived:
-            query = query.filter(Plant.is_archived == False)
+        Utilise l'index FTS5 plants_fts (préfixes, insensible aux accents,
+        classement bm25). Repli sur ILIKE si l'index est absent.
         
-        return query.offset(skip).limit(limit).all()
+        Args:
+            db: Session SQLAlchemy
+            q: Terme de recherche (chaque mot est traité comme un préfixe)
+            skip, limit, after: Pagination (voir get_all)
+            sort: "relevance" (bm25), "id" ou "name"
+            fields: Colonnes à sélectionner (voir get_all)
+        
+        Returns:
+            List[Plant]: Plantes actives correspondantes (dicts si fields)
+        """
+        match = build_match_query(q)
+        if match is None:
+            return []
+        
+        if not search_index_exists(db.connection()):
+            return PlantService._search_ilike(db, q, skip, limit, after, sort, fields)
+        
+        matches = PlantService._search_matches(match)
+        query = db.query(Plant, matches.c.rank).join(
+            matches, matches.c.plant_id == Plant.id
+        ).filter(*PlantService._list_filters())
+        
+        key = matches.c.rank if sort == "relevance" else None
+        query = PlantService._paginate(query, skip, limit, after, sort, key=key)
+        if fields:
+            return PlantService._fetch(query, fields, matches.c.rank.label("relevance"))
+        rows = query.all()
+        
+        plants = []
+        for plant, rank in rows:
+            # bm25 (plus petit = plus pertinent), sert aussi de clé de curseur
+            plant.relevance = rank
+            plants.append(plant)
+        return plants
+    
+    @staticmethod
+    def _search_ilike(
+        db: Session,
+        q: str,
+        skip: int,
+        limit: int,
+        after: Optional[str],
+        sort: str,
+        fields: Optional[List[str]] = None,
+    ) -> List[Plant]:
+        """
+        Recherche par ILIKE (bases sans index FTS5)
+        Tri "relevance": score constant NO_RELEVANCE, départagé par id; le
+        curseur reste celui du tri demandé
+        """
+        query = db.query(Plant).filter(*PlantService._ilike_filters(q))
+        if sort != "relevance":
+            return PlantService._fetch(PlantService._paginate(query, skip, limit, after, sort), fields)
+        relevance = PlantService._ilike_relevance()
+        query = PlantService._paginate(query, skip, limit, after, sort, key=relevance)
+        if fields:
+            return PlantService._fetch(query, fields, relevance.label("relevance"))
+        return PlantService._with_relevance(query.all())
+    
+    @staticmethod
+    def _ilike_relevance():
+        return literal(PlantService.NO_RELEVANCE, Float)
+    
+    @staticmethod
+    def _with_relevance(plants: List[Plant]) -> List[Plant]:
+        for plant in plants:
+            plant.relevance = PlantService.NO_RELEVANCE
+        return plants
+    
+    @staticmethod
+    def filter_plants(
+        db: Session,
+        location_id: Optional[int] = None,
+        difficulty: Optional[str] = None,
+        health_status: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+        sort: str = "id",
+        fields: Optional[List[str]] = None,
+    ) -> List[Plant]:
+        """Filtre les plantes actives par localisation, difficulté et santé"""
+        query = db.query(Plant).filter(
+            Plant.deleted_at.is_(None),
+            Plant.is_archived == False,
+        )
+        
+        if location_id is not None:
+            query = query.filter(Plant.location_id == location_id)
+        if difficulty:
+            query = query.filter(Plant.difficulty_level == difficulty)
+        if health_status:
+            query = query.filter(Plant.health_status == health_status)
+        
+        return PlantService._fetch(PlantService._paginate(query, skip, limit, after, sort), fields)
+    
+    @staticmethod
+    def get_favorites(db: Session, fields: Optional[List[str]] = None) -> List[Plant]:
+        """Récupère les plantes favorites actives, par nom (dicts si fields)"""
+        query = db.query(Plant).filter(
+            Plant.deleted_at.is_(None),
+            Plant.is_archived == False,
+            Plant.is_favorite == True,
+        ).order_by(Plant.name, Plant.id)
+        return PlantService._fetch(query, fields)
+    
+    @staticmethod
+    def attach_primary_photos(db: Session, plants: List[Plant]) -> List[Plant]:
+        """
+        Renseigne primary_photo (dict ou None) pour une liste de plantes (ou de dicts)
+        Une seule requête pour toute la page (voir PhotoService.get_primary_photos)
+        """
+        if plants and isinstance(plants[0], dict):
+            photos = PhotoService.get_primary_photos(db, [plant["id"] for plant in plants])
+            for plant in plants:
+                plant["primary_photo"] = photos.get(plant["id"])
+            return plants
+        photos = PhotoService.get_primary_photos(db, [plant.id for plant in plants])
+        for plant in plants:
+            plant.primary_photo = photos.get(plant.id)
+        return plants
+    
+    @staticmethod
+    def get_plants_to_fertilize(db: Session, days_ago: int = 0) -> List[dict]:
+        """
+        Plantes actives jamais fertilisées ou fertilisées il y a days_ago jours ou plus
+        Parcours d'index sur Plant.last_fertilized_at (pas d'agrégat sur l'historique)
+        Retourne: [{id, name, last_fertilized, days_since, reason}]
+        """
+        today = date.today()
+        cutoff_date = today - timedelta(days=days_ago)
+        rows = db.execute(StatsService._last_care_query(Plant.last_fertilized_at, cutoff_date)).all()
+        return StatsService._format_upcoming(
+            rows, today, "last_fertilized", "Jamais fertilisée", "Fertilisée"
+        )
     
     @staticmethod
     def get_by_id(db: Session, plant_id: int, include_deleted: bool = False) -> Optional[Plant]:
@@ -214,15 +611,21 @@ class PlantService:
             if 'archived_date' in update_data:
                 raise ValueError("Use archive/restore endpoints to manage archived_date")
             
+            before = StatsService.plant_snapshot(plant)
+            
             # Mettre à jour les champs autorisés
             for field, value in update_data.items():
                 if hasattr(plant, field):
                     setattr(plant, field, value)
+            if update_data.get('reference'):
+                PlantService.sync_manual_reference(db, update_data['reference'])
             
             # Mettre à jour updated_at
             plant.updated_at = datetime.utcnow()
             
+            StatsService.track_plant_change(db, before, StatsService.plant_snapshot(plant))
             db.commit()
+            WateringScheduleService.invalidate()
             db.refresh(plant)
             return plant
             
@@ -253,10 +656,15 @@ class PlantService:
                 plant.deleted_at = datetime.utcnow()
                 db.commit()
             else:
-                # Hard delete: supprimer complètement
+                # Hard delete: supprimer complètement (photos en cascade)
+                StatsService.track_plant_change(db, StatsService.plant_snapshot(plant), {})
+                StatsService.apply_delta(db, {"total_photos": -len(plant.photos)})
                 db.delete(plant)
                 db.commit()
+                PhotoService.forget_plant_files(plant_id)
+                derived_cache.discard(plant_id)
             
+            WateringScheduleService.invalidate()
             return True
         except Exception as e:
             db.rollback()
@@ -285,12 +693,15 @@ class PlantService:
             return None
         
         try:
+            before = StatsService.plant_snapshot(plant)
             plant.is_archived = True
             plant.archived_date = datetime.utcnow()
             if reason:
                 plant.archived_reason = reason[:255]  # Limiter à 255 chars
             
+            StatsService.track_plant_change(db, before, StatsService.plant_snapshot(plant))
             db.commit()
+            WateringScheduleService.invalidate()
             db.refresh(plant)
             return plant
         except Exception as e:
@@ -322,13 +733,118 @@ class PlantService:
             return plant  # Déjà active
         
         try:
+            before = StatsService.plant_snapshot(plant)
             plant.is_archived = False
             plant.archived_date = None
             plant.archived_reason = None
             
+            StatsService.track_plant_change(db, before, StatsService.plant_snapshot(plant))
             db.commit()
+            WateringScheduleService.invalidate()
             db.refresh(plant)
             return plant
         except Exception as e:
             db.rollback()
             raise Exception(f"Erreur restauration plante: {str(e)}")
+
+
+class AsyncPlantService:
+    """
+    Lectures de plantes sur AsyncSession (routes de lecture fréquentes)
+    Mêmes critères, tri et pagination que PlantService (méthodes partagées)
+    """
+    
+    @staticmethod
+    async def _fetch(db: AsyncSession, statement, fields: Optional[List[str]] = None, *extra) -> list:
+        """Voir PlantService._fetch (statement: select(Plant)...)"""
+        if not fields:
+            return list((await db.scalars(statement)).all())
+        statement = statement.with_only_columns(
+            *PlantService._columns(fields), *extra, maintain_column_froms=True
+        )
+        return [dict(row._mapping) for row in await db.execute(statement)]
+    
+    @staticmethod
+    async def get_all(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        include_archived: bool = False,
+        include_deleted: bool = False,
+        after: Optional[str] = None,
+        sort: str = "id",
+        fields: Optional[List[str]] = None,
+    ) -> List[Plant]:
+        """Voir PlantService.get_all"""
+        statement = select(Plant).where(*PlantService._list_filters(include_archived, include_deleted))
+        return await AsyncPlantService._fetch(
+            db, PlantService._paginate(statement, skip, limit, after, sort), fields
+        )
+    
+    @staticmethod
+    async def search(
+        db: AsyncSession,
+        q: str,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+        sort: str = "relevance",
+        fields: Optional[List[str]] = None,
+    ) -> List[Plant]:
+        """Voir PlantService.search (FTS5 bm25, repli ILIKE sans index)"""
+        match = build_match_query(q)
+        if match is None:
+            return []
+        
+        has_index = await db.run_sync(lambda session: search_index_exists(session.connection()))
+        if not has_index:
+            statement = select(Plant).where(*PlantService._ilike_filters(q))
+            if sort != "relevance":
+                return await AsyncPlantService._fetch(
+                    db, PlantService._paginate(statement, skip, limit, after, sort), fields
+                )
+            relevance = PlantService._ilike_relevance()
+            statement = PlantService._paginate(statement, skip, limit, after, sort, key=relevance)
+            if fields:
+                return await AsyncPlantService._fetch(db, statement, fields, relevance.label("relevance"))
+            return PlantService._with_relevance(await AsyncPlantService._fetch(db, statement))
+        
+        matches = PlantService._search_matches(match)
+        statement = select(Plant, matches.c.rank).join(
+            matches, matches.c.plant_id == Plant.id
+        ).where(*PlantService._list_filters())
+        
+        key = matches.c.rank if sort == "relevance" else None
+        statement = PlantService._paginate(statement, skip, limit, after, sort, key=key)
+        if fields:
+            return await AsyncPlantService._fetch(db, statement, fields, matches.c.rank.label("relevance"))
+        
+        plants = []
+        for plant, rank in await db.execute(statement):
+            plant.relevance = rank
+            plants.append(plant)
+        return plants
+    
+    @staticmethod
+    async def get_by_id(db: AsyncSession, plant_id: int, include_deleted: bool = False) -> Optional[Plant]:
+        """Voir PlantService.get_by_id"""
+        statement = select(Plant).where(Plant.id == plant_id)
+        if not include_deleted:
+            statement = statement.where(Plant.deleted_at.is_(None))
+        return (await db.scalars(statement.limit(1))).first()
+    
+    @staticmethod
+    async def attach_primary_photos(db: AsyncSession, plants: List[Plant]) -> List[Plant]:
+        """Voir PlantService.attach_primary_photos"""
+        is_dict = bool(plants) and isinstance(plants[0], dict)
+        ids = [plant["id"] if is_dict else plant.id for plant in plants]
+        photos = {}
+        if ids:
+            rows = await db.execute(PhotoService._primary_photos_query(ids))
+            photos = PhotoService._format_primary_photos(rows)
+        for plant in plants:
+            if is_dict:
+                plant["primary_photo"] = photos.get(plant["id"])
+            else:
+                plant.primary_photo = photos.get(plant.id)
+        return plants
@@ -14,6 +14,8 @@ from app.models.lookup import (
     LightRequirement, FertilizerType, DiseaseType, TreatmentType, PlantHealthStatus
 )
 from app.models.tags import Tag, TagCategory
+from app.services.watering_schedule_service import WateringScheduleService
+from app.utils.db import commit_delete
 
 
 class SettingsService:
@@ -61,8 +63,7 @@ class SettingsService:
         location = SettingsService.get_location(db, location_id)
         if not location:
             return False
-        db.delete(location)
-        db.commit()
+        commit_delete(db, location, "localisation")
         return True
     
     # ===== PURCHASE PLACES =====
@@ -107,8 +108,7 @@ class SettingsService:
         place = SettingsService.get_purchase_place(db, place_id)
         if not place:
             return False
-        db.delete(place)
-        db.commit()
+        commit_delete(db, place, "lieu d'achat")
         return True
     
     # ===== WATERING FREQUENCIES =====
@@ -155,6 +155,7 @@ class SettingsService:
         frequency.name = name
         frequency.days_interval = days
         db.commit()
+        WateringScheduleService.invalidate()
         db.refresh(frequency)
         return frequency
     
@@ -164,8 +165,8 @@ class SettingsService:
         frequency = SettingsService.get_watering_frequency(db, frequency_id)
         if not frequency:
             return False
-        db.delete(frequency)
-        db.commit()
+        commit_delete(db, frequency, "fréquence d'arrosage")
+        WateringScheduleService.invalidate()
         return True
     
     # ===== LIGHT REQUIREMENTS =====
@@ -215,8 +216,7 @@ class SettingsService:
         requirement = SettingsService.get_light_requirement(db, requirement_id)
         if not requirement:
             return False
-        db.delete(requirement)
-        db.commit()
+        commit_delete(db, requirement, "exigence lumineuse")
         return True
     
     # ===== FERTILIZER TYPES =====
@@ -270,8 +270,7 @@ class SettingsService:
         fert_type = SettingsService.get_fertilizer_type(db, fert_type_id)
         if not fert_type:
             return False
-        db.delete(fert_type)
-        db.commit()
+        commit_delete(db, fert_type, "type d'engrais")
         return True
     
     # ===== TAG CATEGORIES =====
@@ -319,8 +318,7 @@ class SettingsService:
         category = SettingsService.get_tag_category(db, category_id)
         if not category:
             return False
-        db.delete(category)
-        db.commit()
+        commit_delete(db, category, "catégorie de tags")
         return True
     
     # ===== TAGS =====
@@ -384,8 +382,7 @@ class SettingsService:
         tag = SettingsService.get_tag(db, tag_id)
         if not tag:
             return False
-        db.delete(tag)
-        db.commit()
+        commit_delete(db, tag, "tag")
         return True
 
     # ===== DISEASE TYPES =====
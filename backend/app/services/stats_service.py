@@ -2,17 +2,68 @@
 Service de statistiques pour le dashboard
 """
 
+import logging
 from datetime import datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, case, and_, or_, update, delete
 
+from app.config import settings
 from app.models.plant import Plant
-from app.models.histories import WateringHistory, FertilizingHistory
+from app.models.photo import Photo
+from app.models.plant_stats import PlantStat
+from app.services.watering_schedule_service import WateringScheduleService
+
+logger = logging.getLogger(__name__)
 
 
 class StatsService:
     """Service pour calculer les statistiques du dashboard"""
 
+    # Les 7 KPI du dashboard (aussi les clés de la table plant_stats)
+    STAT_KEYS = (
+        "total_plants",
+        "active_plants",
+        "archived_plants",
+        "health_excellent",
+        "health_good",
+        "health_poor",
+        "total_photos",
+    )
+
+    # ===== DASHBOARD =====
+
+    @staticmethod
+    def _dashboard_query():
+        """
+        Requête agrégée unique: un seul passage sur plants (sommes conditionnelles)
+        + un COUNT sur photos en sous-requête scalaire
+        """
+        active = Plant.is_archived == False
+
+        def count_if(condition):
+            return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+        return select(
+            func.count(Plant.id).label("total_plants"),
+            count_if(active).label("active_plants"),
+            count_if(Plant.is_archived == True).label("archived_plants"),
+            count_if(and_(active, Plant.health_status == "excellent")).label("health_excellent"),
+            count_if(and_(active, Plant.health_status == "good")).label("health_good"),
+            count_if(and_(active, Plant.health_status == "poor")).label("health_poor"),
+            select(func.count(Photo.id)).scalar_subquery().label("total_photos"),
+        )
+
+    @staticmethod
+    def _dashboard_row(row) -> Dict[str, int]:
+        return {key: int(getattr(row, key) or 0) for key in StatsService.STAT_KEYS}
+
+    @staticmethod
+    def compute_dashboard_stats(db: Session) -> Dict[str, int]:
+        """Calcule les KPI directement depuis les tables (1 requête)"""
+        return StatsService._dashboard_row(db.execute(StatsService._dashboard_query()).one())
+
     @staticmethod
     def get_dashboard_stats(db: Session) -> dict:
         """
@@ -24,110 +75,156 @@ class StatsService:
         - health_good: Plantes en bonne santé
         - health_poor: Plantes en mauvaise santé
         - total_photos: Nombre total de photos
+
+        Si STATS_COUNTERS_ENABLED: lecture O(1) de la table plant_stats
+        (initialisée à la première lecture), sinon requête agrégée.
         """
         try:
-            total_plants = db.query(Plant).count()
-            active_plants = db.query(Plant).filter(Plant.is_archived == False).count()
-            archived_plants = db.query(Plant).filter(Plant.is_archived == True).count()
-            
-            health_excellent = db.query(Plant).filter(
-                Plant.is_archived == False,
-                Plant.health_status == "excellent"
-            ).count()
-            health_good = db.query(Plant).filter(
-                Plant.is_archived == False,
-                Plant.health_status == "good"
-            ).count()
-            health_poor = db.query(Plant).filter(
-                Plant.is_archived == False,
-                Plant.health_status == "poor"
-            ).count()
-            
-            # Compter les photos via la relation
-            total_photos = db.query(func.count(Plant.id)).filter(
-                Plant.photos != None
-            ).scalar() or 0
-            
-            return {
-                "total_plants": total_plants,
-                "active_plants": active_plants,
-                "archived_plants": archived_plants,
-                "health_excellent": health_excellent,
-                "health_good": health_good,
-                "health_poor": health_poor,
-                "total_photos": total_photos
-            }
+            if settings.STATS_COUNTERS_ENABLED:
+                counters = StatsService.read_counters(db)
+                if counters is None:
+                    counters = StatsService.rebuild_counters(db)
+                return counters
+            return StatsService.compute_dashboard_stats(db)
         except Exception as e:
             print(f"Erreur StatsService.get_dashboard_stats: {e}")
-            return {
-                "total_plants": 0,
-                "active_plants": 0,
-                "archived_plants": 0,
-                "health_excellent": 0,
-                "health_good": 0,
-                "health_poor": 0,
-                "total_photos": 0
-            }
+            return {key: 0 for key in StatsService.STAT_KEYS}
+
+    # ===== COMPTEURS INCRÉMENTAUX (plant_stats) =====
+
+    @staticmethod
+    def plant_snapshot(plant: Optional[Plant]) -> Dict[str, int]:
+        """
+        Contribution d'une plante aux compteurs (mêmes règles que _dashboard_query)
+        None = plante absente (avant création / après suppression)
+        """
+        if plant is None:
+            return {}
+        active = plant.is_archived == False
+        return {
+            "total_plants": 1,
+            "active_plants": int(active),
+            "archived_plants": int(plant.is_archived == True),
+            "health_excellent": int(active and plant.health_status == "excellent"),
+            "health_good": int(active and plant.health_status == "good"),
+            "health_poor": int(active and plant.health_status == "poor"),
+        }
+
+    @staticmethod
+    def apply_delta(db: Session, delta: Dict[str, int]) -> None:
+        """
+        Applique des variations aux compteurs dans la transaction courante
+        (sans commit: l'appelant commit avec son écriture)
+
+        Compteurs désactivés: plant_stats est vidée, pour que la première
+        lecture après réactivation les reconstruise au lieu de servir des
+        valeurs périmées
+        """
+        if not settings.STATS_COUNTERS_ENABLED:
+            if any(delta.values()):
+                db.execute(delete(PlantStat))
+            return
+        for key, change in delta.items():
+            if change:
+                db.execute(
+                    update(PlantStat)
+                    .where(PlantStat.key == key)
+                    .values(value=PlantStat.value + change)
+                )
+
+    @staticmethod
+    def track_plant_change(db: Session, before: Dict[str, int], after: Dict[str, int]) -> None:
+        """Met à jour les compteurs avec la différence entre deux snapshots de plante"""
+        keys = set(before) | set(after)
+        StatsService.apply_delta(db, {key: after.get(key, 0) - before.get(key, 0) for key in keys})
+
+    @staticmethod
+    def read_counters(db: Session) -> Optional[Dict[str, int]]:
+        """Lit la table plant_stats, None si elle n'est pas (complètement) initialisée"""
+        return StatsService._counters(db.execute(select(PlantStat.key, PlantStat.value)).all())
+
+    @staticmethod
+    def _counters(rows) -> Optional[Dict[str, int]]:
+        rows = dict(rows)
+        if any(key not in rows for key in StatsService.STAT_KEYS):
+            return None
+        return {key: int(rows[key]) for key in StatsService.STAT_KEYS}
+
+    @staticmethod
+    def rebuild_counters(db: Session) -> Dict[str, int]:
+        """Recalcule la table plant_stats depuis les tables sources"""
+        stats = StatsService.compute_dashboard_stats(db)
+        db.execute(delete(PlantStat))
+        db.add_all([PlantStat(key=key, value=value) for key, value in stats.items()])
+        db.commit()
+        return stats
+
+    @staticmethod
+    def check_counters(db: Session) -> dict:
+        """
+        Vérifie la cohérence des compteurs avec les tables sources
+        Retourne: {consistent, counters, actual, drift}
+        """
+        counters = StatsService.read_counters(db)
+        actual = StatsService.compute_dashboard_stats(db)
+        if counters is None:
+            return {"consistent": False, "counters": None, "actual": actual, "drift": None}
+        drift = {
+            key: counters[key] - actual[key]
+            for key in StatsService.STAT_KEYS
+            if counters[key] != actual[key]
+        }
+        return {"consistent": not drift, "counters": counters, "actual": actual, "drift": drift}
+
+    # ===== SOINS À VENIR =====
+
+    @staticmethod
+    def _last_care_query(last_care_column, cutoff_date):
+        """
+        Plantes actives jamais soignées ou dont le dernier soin date d'avant cutoff_date
+        Lit la colonne dénormalisée (Plant.last_*_at, indexée): simple parcours d'index
+        Retourne des lignes (id, name, last_date)
+        """
+        return select(
+            Plant.id,
+            Plant.name,
+            last_care_column.label("last_date"),
+        ).where(
+            Plant.is_archived == False,
+            Plant.deleted_at.is_(None),
+            or_(last_care_column.is_(None), last_care_column <= cutoff_date),
+        )
+
+    @staticmethod
+    def _format_upcoming(rows, today, date_key: str, never_reason: str, reason_prefix: str) -> list:
+        """Met en forme les lignes (id, name, last_date), jamais soignées en dernier"""
+        result = []
+        for row in rows:
+            last_date = row.last_date
+            days_since = (today - last_date).days if last_date else None
+            if last_date is None:
+                reason = never_reason
+            else:
+                reason = f"{reason_prefix} il y a {days_since} jours" if days_since else None
+            result.append({
+                "id": row.id,
+                "name": row.name,
+                date_key: last_date.isoformat() if last_date else None,
+                "days_since": days_since,
+                "reason": reason,
+            })
+        return sorted(result, key=lambda x: (x["days_since"] is None, x["days_since"] or 0))
 
     @staticmethod
     def get_upcoming_waterings(db: Session, days: int = 7) -> list:
         """
-        Récupère les plantes à arroser dans N jours
-        Retourne: [{id, name, last_watered, days_since}]
+        Récupère les plantes à arroser dans N jours, selon l'intervalle de chaque plante
+        (WateringFrequency × coefficient saisonnier). Les plantes sans fréquence
+        gardent la règle historique: arrosées il y a N jours ou plus.
+        Retourne: [{id, name, last_watered, days_since, next_due, days_interval, reason}]
         """
         try:
-            today = datetime.now().date()
-            cutoff_date = today - timedelta(days=days)
-            
-            # Plantes jamais arrosées ou arrosées avant la cutoff_date
-            result = []
-            
-            # 1. Plantes jamais arrosées
-            # Plants without any watering history are considered 'never watered'
-            never_watered = db.query(Plant).filter(
-                Plant.is_archived == False,
-                ~Plant.watering_histories.any()
-            ).all()
-            
-            for plant in never_watered:
-                result.append({
-                    "id": plant.id,
-                    "name": plant.name,
-                    "last_watered": None,
-                    "days_since": None,
-                    "reason": "Jamais arrosée"
-                })
-            
-            # 2. Plantes arrosées avant cutoff_date
-            recent_waterings = db.query(
-                WateringHistory.plant_id,
-                func.max(WateringHistory.date).label("last_date")
-            ).group_by(WateringHistory.plant_id).subquery()
-            
-            plants_to_water = db.query(Plant).join(
-                recent_waterings,
-                Plant.id == recent_waterings.c.plant_id
-            ).filter(
-                Plant.is_archived == False,
-                recent_waterings.c.last_date <= cutoff_date
-            ).all()
-            
-            for plant in plants_to_water:
-                last_watering = db.query(
-                    func.max(WateringHistory.date)
-                ).filter(WateringHistory.plant_id == plant.id).scalar()
-
-                days_since = (today - last_watering).days if last_watering else None
-
-                result.append({
-                    "id": plant.id,
-                    "name": plant.name,
-                    "last_watered": last_watering.isoformat() if last_watering else None,
-                    "days_since": days_since,
-                    "reason": f"Arrosée il y a {days_since} jours" if days_since else None
-                })
-            
-            return sorted(result, key=lambda x: (x["days_since"] is None, x.get("days_since", 0)))
+            return WateringScheduleService.get_due(db, horizon_days=days, fallback_days=days)
         except Exception as e:
             print(f"Erreur StatsService.get_upcoming_waterings: {e}")
             return []
@@ -141,55 +238,45 @@ class StatsService:
         try:
             today = datetime.now().date()
             cutoff_date = today - timedelta(days=days)
-            
-            result = []
-            
-            # 1. Plantes jamais fertilisées
-            # Plants without any fertilizing history
-            never_fertilized = db.query(Plant).filter(
-                Plant.is_archived == False,
-                ~Plant.fertilizing_histories.any()
-            ).all()
-            
-            for plant in never_fertilized:
-                result.append({
-                    "id": plant.id,
-                    "name": plant.name,
-                    "last_fertilized": None,
-                    "days_since": None,
-                    "reason": "Jamais fertilisée"
-                })
-            
-            # 2. Plantes fertilisées avant cutoff_date
-            recent_fertilizings = db.query(
-                FertilizingHistory.plant_id,
-                func.max(FertilizingHistory.date).label("last_date")
-            ).group_by(FertilizingHistory.plant_id).subquery()
-            
-            plants_to_fertilize = db.query(Plant).join(
-                recent_fertilizings,
-                Plant.id == recent_fertilizings.c.plant_id
-            ).filter(
-                Plant.is_archived == False,
-                recent_fertilizings.c.last_date <= cutoff_date
-            ).all()
-            
-            for plant in plants_to_fertilize:
-                last_fertilizing = db.query(
-                    func.max(FertilizingHistory.date)
-                ).filter(FertilizingHistory.plant_id == plant.id).scalar()
-
-                days_since = (today - last_fertilizing).days if last_fertilizing else None
-
-                result.append({
-                    "id": plant.id,
-                    "name": plant.name,
-                    "last_fertilized": last_fertilizing.isoformat() if last_fertilizing else None,
-                    "days_since": days_since,
-                    "reason": f"Fertilisée il y a {days_since} jours" if days_since else None
-                })
-            
-            return sorted(result, key=lambda x: (x["days_since"] is None, x.get("days_since", 0)))
+            rows = db.execute(StatsService._last_care_query(Plant.last_fertilized_at, cutoff_date)).all()
+            return StatsService._format_upcoming(
+                rows, today, "last_fertilized", "Jamais fertilisée", "Fertilisée"
+            )
         except Exception as e:
             print(f"Erreur StatsService.get_upcoming_fertilizing: {e}")
             return []
+
+
+class AsyncStatsService:
+    """Dashboard sur AsyncSession (mêmes requêtes que StatsService)"""
+
+    @staticmethod
+    async def compute_dashboard_stats(db: AsyncSession) -> Dict[str, int]:
+        row = (await db.execute(StatsService._dashboard_query())).one()
+        return StatsService._dashboard_row(row)
+
+    @staticmethod
+    async def read_counters(db: AsyncSession) -> Optional[Dict[str, int]]:
+        return StatsService._counters((await db.execute(select(PlantStat.key, PlantStat.value))).all())
+
+    @staticmethod
+    async def rebuild_counters(db: AsyncSession) -> Dict[str, int]:
+        stats = await AsyncStatsService.compute_dashboard_stats(db)
+        await db.execute(delete(PlantStat))
+        db.add_all([PlantStat(key=key, value=value) for key, value in stats.items()])
+        await db.commit()
+        return stats
+
+    @staticmethod
+    async def get_dashboard_stats(db: AsyncSession) -> dict:
+        """Voir StatsService.get_dashboard_stats"""
+        try:
+            if settings.STATS_COUNTERS_ENABLED:
+                counters = await AsyncStatsService.read_counters(db)
+                if counters is None:
+                    counters = await AsyncStatsService.rebuild_counters(db)
+                return counters
+            return await AsyncStatsService.compute_dashboard_stats(db)
+        except Exception:
+            logger.exception("Erreur AsyncStatsService.get_dashboard_stats")
+            return {key: 0 for key in StatsService.STAT_KEYS}
@@ -0,0 +1,318 @@
+"""
+Planification des arrosages
+Calcule la prochaine date d'arrosage de chaque plante à partir de:
+- son intervalle (watering_frequency_id → WateringFrequency.days_interval)
+- son dernier arrosage (Plant.last_watered_at, maintenu par HistoryService)
+- le coefficient de la saison du dernier arrosage (Season.watering_factor
+  appliqué sur start_month/end_month, les saisons peuvent chevaucher l'année)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import Date, Integer, and_, cast, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.lookup import Season, WateringFrequency
+from app.models.plant import Plant
+
+
+class WateringScheduleService:
+    """Moteur de planification des arrosages (avec cache invalidé par les écritures)"""
+
+    # Planning calculé par base (URL du moteur) → (horodatage, entrées)
+    _cache: Dict[str, tuple] = {}
+    _seasons_cache: Dict[str, tuple] = {}
+    _lock = threading.Lock()
+
+    # Longueur max d'un agenda (jours)
+    MAX_AGENDA_DAYS = 366
+
+    # ===== CACHE =====
+
+    @staticmethod
+    def invalidate() -> None:
+        """
+        Vide le planning calculé
+        Appelé après tout arrosage créé/modifié/supprimé et toute modification de plante.
+        Cache local au processus: WATERING_SCHEDULE_CACHE_TTL borne l'obsolescence
+        si plusieurs workers écrivent dans la même base.
+        """
+        with WateringScheduleService._lock:
+            WateringScheduleService._cache.clear()
+            WateringScheduleService._seasons_cache.clear()
+
+    @staticmethod
+    def _cache_key(db) -> str:
+        """Base de la session: même clé en Session et AsyncSession (driver ignoré)"""
+        return str(db.get_bind().url.set(drivername=db.get_bind().url.get_backend_name()))
+
+    @staticmethod
+    def _cache_get(store: Dict[str, tuple], key: str):
+        with WateringScheduleService._lock:
+            hit = store.get(key)
+            if hit and time.monotonic() - hit[0] < settings.WATERING_SCHEDULE_CACHE_TTL:
+                return hit[1]
+        return None
+
+    @staticmethod
+    def _cache_put(store: Dict[str, tuple], key: str, started: float, value) -> None:
+        with WateringScheduleService._lock:
+            store[key] = (started, value)
+
+    @staticmethod
+    def _cached(store: Dict[str, tuple], db: Session, compute):
+        key = WateringScheduleService._cache_key(db)
+        value = WateringScheduleService._cache_get(store, key)
+        if value is None:
+            started = time.monotonic()
+            value = compute()
+            WateringScheduleService._cache_put(store, key, started, value)
+        return value
+
+    # ===== CALCUL =====
+
+    @staticmethod
+    def _schedule_query():
+        """
+        Une seule requête pour toutes les plantes actives:
+        plants (last_watered_at dénormalisé) LEFT JOIN watering_frequencies
+        LEFT JOIN seasons (saison du dernier arrosage) → next_due calculée en SQL
+        """
+        last_date = Plant.last_watered_at
+
+        month = cast(func.strftime("%m", last_date), Integer)
+        in_season = or_(
+            and_(Season.start_month <= Season.end_month,
+                 month >= Season.start_month, month <= Season.end_month),
+            and_(Season.start_month > Season.end_month,
+                 or_(month >= Season.start_month, month <= Season.end_month)),
+        )
+        factor = func.coalesce(Season.watering_factor, 1.0)
+        interval = func.max(
+            cast(func.round(WateringFrequency.days_interval * factor), Integer), 1
+        )
+        next_due = func.date(
+            last_date,
+            func.printf("+%d days", interval),
+            type_=Date,
+        )
+
+        return select(
+            Plant.id,
+            Plant.name,
+            WateringFrequency.days_interval,
+            factor.label("season_factor"),
+            last_date.label("last_date"),
+            next_due.label("next_due"),
+        ).outerjoin(
+            WateringFrequency, WateringFrequency.id == Plant.watering_frequency_id
+        ).outerjoin(
+            Season, in_season
+        ).where(
+            Plant.is_archived == False,
+            Plant.deleted_at.is_(None),
+        ).order_by(Plant.id)
+
+    @staticmethod
+    def _build_schedule(rows) -> List[dict]:
+        """Convertit les lignes SQL en entrées de planning (une par plante)"""
+        entries: "OrderedDict[int, dict]" = OrderedDict()
+        for row in rows:
+            if row.id in entries:
+                continue  # saisons qui se chevauchent: la première l'emporte
+            has_interval = bool(row.days_interval)
+            entries[row.id] = {
+                "id": row.id,
+                "name": row.name,
+                "days_interval": row.days_interval,
+                "season_factor": float(row.season_factor) if has_interval and row.last_date else None,
+                "last_watered": row.last_date,
+                "next_due": row.next_due if has_interval else None,
+            }
+        return list(entries.values())
+
+    @staticmethod
+    def get_schedule(db: Session) -> List[dict]:
+        """Planning de toutes les plantes actives (mis en cache jusqu'à invalidation)"""
+        return WateringScheduleService._cached(
+            WateringScheduleService._cache,
+            db,
+            lambda: WateringScheduleService._build_schedule(
+                db.execute(WateringScheduleService._schedule_query()).all()
+            ),
+        )
+
+    @staticmethod
+    def _get_seasons(db: Session) -> List[tuple]:
+        """Saisons (start_month, end_month, watering_factor), pour projeter l'agenda"""
+        return WateringScheduleService._cached(
+            WateringScheduleService._seasons_cache,
+            db,
+            lambda: [
+                (s.start_month, s.end_month, s.watering_factor or 1.0)
+                for s in db.query(Season).order_by(Season.id).all()
+            ],
+        )
+
+    @staticmethod
+    def season_factor(seasons: List[tuple], day: date) -> float:
+        """Coefficient de la saison contenant day (1.0 si aucune)"""
+        for start, end, factor in seasons:
+            if start <= end:
+                if start <= day.month <= end:
+                    return factor
+            elif day.month >= start or day.month <= end:
+                return factor
+        return 1.0
+
+    # ===== REQUÊTES MÉTIER =====
+
+    @staticmethod
+    def get_due(
+        db: Session,
+        horizon_days: int = 0,
+        fallback_days: Optional[int] = None,
+        today: Optional[date] = None,
+    ) -> List[dict]:
+        """
+        Plantes à arroser d'ici today + horizon_days
+
+        - plante avec intervalle: next_due <= today + horizon_days
+        - plante jamais arrosée: toujours due
+        - plante sans intervalle: règle historique, dernier arrosage il y a
+          fallback_days jours ou plus (ignorée si fallback_days est None)
+
+        Retourne: [{id, name, last_watered, days_since, next_due, days_interval, reason}]
+        """
+        return WateringScheduleService._due(
+            WateringScheduleService.get_schedule(db), horizon_days, fallback_days, today
+        )
+
+    @staticmethod
+    def _due(
+        schedule: List[dict],
+        horizon_days: int,
+        fallback_days: Optional[int],
+        today: Optional[date],
+    ) -> List[dict]:
+        """Filtre et met en forme le planning pour get_due"""
+        today = today or date.today()
+        limit = today + timedelta(days=horizon_days)
+        result = []
+
+        for entry in schedule:
+            last = entry["last_watered"]
+            next_due = entry["next_due"]
+            days_since = (today - last).days if last else None
+
+            if last is None:
+                reason = "Jamais arrosée"
+            elif next_due is not None:
+                if next_due > limit:
+                    continue
+                overdue = (today - next_due).days
+                if overdue > 0:
+                    reason = f"En retard de {overdue} jours"
+                elif overdue == 0:
+                    reason = "À arroser aujourd'hui"
+                else:
+                    reason = f"Arrosage prévu le {next_due.isoformat()}"
+            else:
+                if fallback_days is None or days_since < fallback_days:
+                    continue
+                reason = f"Arrosée il y a {days_since} jours" if days_since else None
+
+            result.append({
+                "id": entry["id"],
+                "name": entry["name"],
+                "last_watered": last.isoformat() if last else None,
+                "days_since": days_since,
+                "next_due": next_due.isoformat() if next_due else None,
+                "days_interval": entry["days_interval"],
+                "reason": reason,
+            })
+
+        return sorted(result, key=lambda x: (x["days_since"] is None, x["days_since"] or 0))
+
+    @staticmethod
+    def get_agenda(db: Session, start: date, end: date, today: Optional[date] = None) -> List[dict]:
+        """
+        Agenda des arrosages prévus entre start et end (inclus)
+
+        Une plante en retard ou jamais arrosée est due aujourd'hui; les
+        occurrences suivantes sont projetées avec l'intervalle de la saison
+        de chaque date. Les plantes sans intervalle n'apparaissent pas.
+
+        Retourne: [{date, plants: [{id, name, overdue_days}]}] trié par date
+
+        Raises:
+            ValueError: Si la période est invalide ou trop longue
+        """
+        if end < start:
+            raise ValueError("La date de fin doit être postérieure à la date de début")
+        if (end - start).days >= WateringScheduleService.MAX_AGENDA_DAYS:
+            raise ValueError(f"Période limitée à {WateringScheduleService.MAX_AGENDA_DAYS} jours")
+
+        today = today or date.today()
+        if (end - today).days >= 2 * WateringScheduleService.MAX_AGENDA_DAYS:
+            raise ValueError("L'agenda est limité aux deux prochaines années")
+        seasons = WateringScheduleService._get_seasons(db)
+        agenda: Dict[date, List[dict]] = {}
+
+        for entry in WateringScheduleService.get_schedule(db):
+            interval = entry["days_interval"]
+            if not interval:
+                continue
+
+            due = entry["next_due"] or today
+            overdue_days = max((today - due).days, 0)
+            day = max(due, today)
+
+            while day <= end:
+                if day >= start:
+                    agenda.setdefault(day, []).append({
+                        "id": entry["id"],
+                        "name": entry["name"],
+                        "overdue_days": overdue_days if day == max(due, today) else 0,
+                    })
+                step = round(interval * WateringScheduleService.season_factor(seasons, day))
+                day += timedelta(days=max(step, 1))
+
+        return [
+            {"date": day.isoformat(), "plants": plants}
+            for day, plants in sorted(agenda.items())
+        ]
+
+
+class AsyncWateringScheduleService:
+    """Planning des arrosages sur AsyncSession (même cache que WateringScheduleService)"""
+
+    @staticmethod
+    async def get_schedule(db: AsyncSession) -> List[dict]:
+        """Voir WateringScheduleService.get_schedule"""
+        store = WateringScheduleService._cache
+        key = WateringScheduleService._cache_key(db)
+        schedule = WateringScheduleService._cache_get(store, key)
+        if schedule is None:
+            started = time.monotonic()
+            rows = (await db.execute(WateringScheduleService._schedule_query())).all()
+            schedule = WateringScheduleService._build_schedule(rows)
+            WateringScheduleService._cache_put(store, key, started, schedule)
+        return schedule
+
+    @staticmethod
+    async def get_due(
+        db: AsyncSession,
+        horizon_days: int = 0,
+        fallback_days: Optional[int] = None,
+        today: Optional[date] = None,
+    ) -> List[dict]:
+        """Voir WateringScheduleService.get_due"""
+        schedule = await AsyncWateringScheduleService.get_schedule(db)
+        return WateringScheduleService._due(schedule, horizon_days, fallback_days, today)
@@ -0,0 +1,100 @@
+"""
+Initialisation de la base au démarrage (lifespan de l'application)
+
+Schéma (init_db), lookups et plantes d'exemple ne sont préparés qu'une fois:
+l'empreinte (SEED_VERSION + schéma déclaré + données de seed) est enregistrée
+dans app_metadata. Démarrage suivant avec la même empreinte: une seule lecture
+"""
+
+import hashlib
+import json
+import logging
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.models import AppMetadata, Base
+from app.scripts.seed_lookups import LOOKUP_SEEDS, seed_all
+from app.scripts.seed_plants import SAMPLE_PLANTS, seed_plants
+from app.utils.db import engine, init_db
+
+logger = logging.getLogger(__name__)
+
+# Incrémenter pour forcer un nouveau passage (ex: seed_plants modifié)
+SEED_VERSION = 1
+SEED_VERSION_KEY = "seed_version"
+CHECKSUM_KEY = "bootstrap_checksum"
+
+
+def bootstrap_checksum() -> str:
+    """Empreinte sha256 du schéma déclaré et des données de seed"""
+    digest = hashlib.sha256(f"seed-v{SEED_VERSION}".encode())
+    for table in Base.metadata.sorted_tables:
+        columns = ",".join(f"{c.name}:{c.type}" for c in table.columns)
+        indexes = ",".join(sorted(i.name for i in table.indexes))
+        digest.update(f"|{table.name}({columns})[{indexes}]".encode())
+    seeds = [[model.__tablename__, rows] for model, rows in LOOKUP_SEEDS]
+    digest.update(json.dumps(seeds, sort_keys=True, default=str).encode())
+    digest.update(json.dumps(SAMPLE_PLANTS, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def read_checksum(bind: Engine) -> Optional[str]:
+    """Empreinte enregistrée (None: base neuve, table app_metadata absente)"""
+    try:
+        with bind.connect() as conn:
+            return conn.execute(
+                select(AppMetadata.value).where(AppMetadata.key == CHECKSUM_KEY)
+            ).scalar()
+    except OperationalError:
+        return None
+
+
+def write_metadata(db: Session, values: Dict[str, str]) -> None:
+    """Upsert de paires clé/valeur dans app_metadata (ne commite pas)"""
+    stmt = sqlite_insert(AppMetadata).values(
+        [{"key": key, "value": value} for key, value in values.items()]
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[AppMetadata.key],
+        set_={"value": stmt.excluded.value, "updated_at": stmt.excluded.updated_at},
+    ))
+
+
+def bootstrap(bind: Optional[Engine] = None) -> Dict[str, object]:
+    """
+    Prépare la base si l'empreinte enregistrée n'est pas à jour
+
+    Returns:
+        {"status": "current" | "seeded", "checksum": str, "elapsed_ms": float}
+    """
+    bind = engine if bind is None else bind
+    started = time.perf_counter()
+    checksum = bootstrap_checksum()
+
+    if read_checksum(bind) == checksum:
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"Bootstrap à jour, seeds ignorés ({elapsed_ms} ms)")
+        return {"status": "current", "checksum": checksum, "elapsed_ms": elapsed_ms}
+
+    init_db(bind)
+    db = Session(bind=bind)
+    try:
+        seed_all(db)
+        seed_plants(db)
+        write_metadata(db, {SEED_VERSION_KEY: str(SEED_VERSION), CHECKSUM_KEY: checksum})
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"Bootstrap: schéma et seeds appliqués (v{SEED_VERSION}, {elapsed_ms} ms)")
+    return {"status": "seeded", "checksum": checksum, "elapsed_ms": elapsed_ms}
@@ -1,17 +1,138 @@
-from sqlalchemy import create_engine, event
+from typing import AsyncIterator, Dict, Optional
+
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
 from app.models.base import Base
+from app.models.plant_search import ensure_search_index
+from app.utils.slow_queries import watch_slow_queries
+
+
+def sqlite_pragmas() -> Dict[str, object]:
+    """
+    PRAGMA de connexion depuis Settings (ordre d'application)
+    busy_timeout d'abord: le passage en WAL attend un éventuel verrou
+    """
+    return {
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "foreign_keys": "ON" if settings.SQLITE_FOREIGN_KEYS else "OFF",
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: Dict[str, object]) -> None:
+    """Exécute les PRAGMA sur une connexion DBAPI (hors transaction)"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def configure_sqlite(engine: Engine, pragmas: Optional[Dict[str, object]] = None) -> None:
+    """Applique les PRAGMA à chaque nouvelle connexion du pool (event connect)"""
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+
+def _is_file_database(url: str) -> bool:
+    return ":memory:" not in url and make_url(url).database not in (None, "")
+
+
+def _pool_options() -> Dict[str, object]:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+def make_engine(url: str, pragmas: Optional[Dict[str, object]] = None) -> Engine:
+    """
+    Engine configuré pour l'application
+    SQLite fichier: PRAGMA de connexion + pool dimensionné pour WAL (lecteurs
+    concurrents); SQLite mémoire: pool par défaut (une base par connexion)
+    Requêtes lentes journalisées (SLOW_QUERY_ENABLED, app.utils.slow_queries)
+    """
+    if not url.startswith("sqlite"):
+        return create_engine(url)
+    options = {"connect_args": {"check_same_thread": False}}
+    if _is_file_database(url):
+        options.update(_pool_options())
+    engine = create_engine(url, **options)
+    configure_sqlite(engine, pragmas)
+    if settings.SLOW_QUERY_ENABLED:
+        watch_slow_queries(engine)
+    return engine
+
+
+def async_url(url: str) -> str:
+    """URL du driver asynchrone équivalent (sqlite:// → sqlite+aiosqlite://)"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.get_driver_name() != "aiosqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+def make_async_engine(url: str, pragmas: Optional[Dict[str, object]] = None, **options) -> AsyncEngine:
+    """
+    Engine asynchrone (aiosqlite) sur la même base que make_engine
+    Mêmes PRAGMA de connexion; SQLite fichier: pool de connexions réutilisées
+    (aiosqlite utilise NullPool par défaut: une connexion + un thread par session)
+    """
+    url = async_url(url)
+    if not url.startswith("sqlite"):
+        return create_async_engine(url, **options)
+    if _is_file_database(url) and "poolclass" not in options:
+        options = {"poolclass": AsyncAdaptedQueuePool, **_pool_options(), **options}
+    engine = create_async_engine(url, **options)
+    configure_sqlite(engine.sync_engine, pragmas)
+    if settings.SLOW_QUERY_ENABLED:
+        watch_slow_queries(engine.sync_engine)
+    return engine
+
 
 # Create engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+engine = make_engine(settings.DATABASE_URL)
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Accès asynchrone (routes de lecture fréquentes): requêtes hors boucle d'événements
+async_engine = make_async_engine(settings.DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+class RowInUseError(Exception):
+    """Suppression refusée: la ligne est encore référencée (PRAGMA foreign_keys=ON) → 409"""
+
+
+def commit_delete(db: Session, instance, label: str) -> None:
+    """
+    Supprime instance et valide
+    
+    Raises:
+        RowInUseError: Si des lignes y font encore référence (transaction annulée)
+    """
+    db.delete(instance)
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise RowInUseError(f"Suppression impossible: {label} encore utilisé(e)") from e
+
+
 # Dependency
 def get_db():
     db = SessionLocal()
@@ -20,6 +141,23 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Initialize DB
-def init_db():
-    Base.metadata.create_all(bind=engine)
+def init_db(bind: Optional[Engine] = None):
+    bind = engine if bind is None else bind
+    Base.metadata.create_all(bind=bind)
+    # create_all ignore les tables existantes: ajouter les index déclarés depuis
+    # (sauf sur des colonnes pas encore ajoutées: voir alembic upgrade head)
+    inspector = inspect(bind)
+    for table in Base.metadata.sorted_tables:
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for index in table.indexes:
+            if all(c.name in existing for c in index.columns):
+                index.create(bind=bind, checkfirst=True)
+    # Bases créées avant l'index FTS5: le créer et le remplir
+    with bind.begin() as conn:
+        ensure_search_index(conn)
@@ -0,0 +1,152 @@
+"""
+Cache disque des variantes de photos (redimensionnements à la demande)
+
+- Une variante est rendue au premier accès puis servie depuis DERIVED_DIR
+- Éviction LRU bornée par DERIVED_CACHE_MAX_BYTES (ordre d'accès en mémoire,
+  reconstruit depuis les mtime au premier usage)
+- Rendus concurrents d'une même variante dédupliqués: un seul rendu (tâche
+  détachée des requêtes), toutes les requêtes attendent son résultat
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DerivedImageCache:
+    """Fichiers dérivés sur disque, LRU borné en octets"""
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: Optional[int] = None):
+        # None: valeurs lues dans settings à chaque usage (modifiables à chaud)
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[Path, int]" = OrderedDict()
+        self._total = 0
+        self._loaded_from: Optional[Path] = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[Path, asyncio.Task] = {}
+
+    @property
+    def directory(self) -> Path:
+        return self._directory or settings.DERIVED_DIR
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes if self._max_bytes is not None else settings.DERIVED_CACHE_MAX_BYTES
+
+    @property
+    def total_bytes(self) -> int:
+        """Taille totale des variantes en cache"""
+        with self._lock:
+            self._load()
+            return self._total
+
+    def _load(self) -> None:
+        """Indexe les fichiers existants, du plus ancien au plus récent (verrou tenu)"""
+        directory = self.directory
+        if self._loaded_from == directory:
+            return
+        files = []
+        for path in directory.rglob("*.webp") if directory.exists() else []:
+            try:
+                stat_result = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat_result.st_mtime, path, stat_result.st_size))
+        files.sort()
+        self._entries = OrderedDict((path, size) for _, path, size in files)
+        self._total = sum(self._entries.values())
+        self._loaded_from = directory
+
+    def path_for(self, plant_id: int, filename: str, width: int) -> Path:
+        """Chemin de la variante `width` d'une photo"""
+        return self.directory / str(plant_id) / f"{Path(filename).stem}_{width}.webp"
+
+    def lookup(self, path: Path) -> bool:
+        """True si la variante est en cache (et la marque récemment utilisée)"""
+        with self._lock:
+            self._load()
+            if path not in self._entries:
+                return False
+            if not path.exists():
+                self._total -= self._entries.pop(path)
+                return False
+            self._entries.move_to_end(path)
+            return True
+
+    def store(self, path: Path, data: bytes) -> None:
+        """Écrit une variante (atomique) puis évince les moins récemment utilisées"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._load()
+            self._total -= self._entries.pop(path, 0)
+            self._entries[path] = len(data)
+            self._total += len(data)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Supprime les plus anciennes jusqu'au budget, en gardant la plus récente"""
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            path, size = self._entries.popitem(last=False)
+            self._total -= size
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.error(f"Erreur suppression variante {path}: {str(e)}")
+
+    def discard(self, plant_id: int, filename: Optional[str] = None) -> None:
+        """Supprime les variantes d'une photo, ou de toutes les photos d'une plante"""
+        plant_dir = self.directory / str(plant_id)
+        prefix = f"{Path(filename).stem}_" if filename else ""
+        with self._lock:
+            self._load()
+            for path in [p for p in self._entries if p.parent == plant_dir and p.name.startswith(prefix)]:
+                self._total -= self._entries.pop(path)
+                path.unlink(missing_ok=True)
+
+    async def _render_and_store(self, path: Path, render: Callable[[], Awaitable[bytes]]) -> Path:
+        data = await render()
+        await run_in_threadpool(self.store, path, data)
+        return path
+
+    def _render_done(self, path: Path, task: asyncio.Task) -> None:
+        if self._inflight.get(path) is task:
+            del self._inflight[path]
+        if not task.cancelled():
+            task.exception()  # Marque l'exception comme lue s'il n'y a plus d'attente
+
+    async def get_or_render(self, path: Path, render: Callable[[], Awaitable[bytes]]) -> Path:
+        """
+        Retourne le chemin de la variante, rendue via `render` si absente
+        Un seul rendu par variante à la fois: les appels concurrents attendent le même.
+        Le rendu est une tâche qu'aucun appelant ne possède (asyncio.shield):
+        l'annulation d'une requête n'interrompt pas les autres
+        """
+        if await run_in_threadpool(self.lookup, path):
+            return path
+
+        task = self._inflight.get(path)
+        if task is None:
+            task = asyncio.ensure_future(self._render_and_store(path, render))
+            task.add_done_callback(lambda done: self._render_done(path, done))
+            self._inflight[path] = task
+        return await asyncio.shield(task)
+
+
+# Cache partagé par l'application
+derived_cache = DerivedImageCache()
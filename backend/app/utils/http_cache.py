@@ -0,0 +1,142 @@
+"""
+Réponses fichiers cachables (photos)
+- ETag fort fourni par l'appelant (contenu immuable: UUID + taille)
+- Cache-Control immutable, Last-Modified
+- 304 sur If-None-Match / If-Modified-Since
+- Requêtes partielles Range (un seul intervalle) → 206, 416 si hors limites
+"""
+
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def strong_etag(*parts) -> str:
+    """ETag fort à partir d'identifiants stables du contenu"""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Comparaison faible (RFC 9110) d'un en-tête If-None-Match avec l'ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified_since(if_modified_since: str, mtime: float) -> bool:
+    """True si le fichier n'a pas changé depuis la date If-Modified-Since"""
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return int(mtime) <= since.timestamp()
+
+
+def parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Intervalle (début, fin incluse) d'un en-tête Range "bytes=..."
+    Retourne None si l'en-tête est à ignorer (autre unité, plusieurs intervalles,
+    syntaxe invalide): la réponse est alors le fichier complet.
+
+    Raises:
+        ValueError: Si l'intervalle est hors du fichier (416)
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_text, sep, end_text = spec.strip().partition("-")
+    if not sep:
+        return None
+    if not (start_text + end_text).isdigit():
+        return None
+    if not start_text:
+        # bytes=-N: les N derniers octets
+        length = int(end_text)
+        if length == 0 or size == 0:
+            raise ValueError("Intervalle vide")
+        return max(size - length, 0), size - 1
+    start = int(start_text)
+    end = int(end_text) if end_text else size - 1
+    if start >= size:
+        raise ValueError("Intervalle hors du fichier")
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def _read_range(path: Path, start: int, end: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start + 1)
+
+
+def cached_file_response(
+    request: Request,
+    path: Path,
+    etag: str,
+    media_type: str,
+    filename: Optional[str] = None,
+) -> Response:
+    """
+    Sert un fichier immuable avec validation conditionnelle et Range
+
+    Raises:
+        FileNotFoundError: Si le fichier n'existe pas
+    """
+    stat_result = os.stat(path)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Accept-Ranges": "bytes",
+    }
+
+    # Requêtes conditionnelles: If-None-Match prime sur If-Modified-Since
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+    elif if_modified_since and not_modified_since(if_modified_since, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    # Range, ignoré si If-Range ne correspond plus à l'ETag
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        size = stat_result.st_size
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{size}"},
+            )
+        if byte_range is not None:
+            start, end = byte_range
+            return Response(
+                content=_read_range(path, start, end),
+                status_code=206,
+                media_type=media_type,
+                headers={**headers, "Content-Range": f"bytes {start}-{end}/{size}"},
+            )
+
+    return FileResponse(
+        path=path,
+        media_type=media_type,
+        filename=filename,
+        headers=headers,
+        stat_result=stat_result,
+    )
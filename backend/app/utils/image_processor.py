@@ -1,14 +1,24 @@
 """
 Image processing utilities for WebP conversion and optimization
+
+PIL is imported inside the functions that need it: importing this module
+(variant constants, resolve_variant) does not load PIL, which is only paid
+for on the first photo request instead of at application startup.
 """
 
+from __future__ import annotations
+
 import io
+import math
 import os
 from pathlib import Path
-from PIL import Image, ImageOps
+from typing import TYPE_CHECKING
 import logging
 from app.config import settings
 
+if TYPE_CHECKING:
+    from PIL import Image
+
 logger = logging.getLogger(__name__)
 
 # Configuration
@@ -16,6 +26,16 @@ MAX_UPLOAD_SIZE = 5 * 1024 * 1024  # 5MB
 MAX_STORED_SIZE = 800 * 1024        # 800KB
 WEBP_QUALITY = 80
 
+# Size targeting (encode_webp_to_target)
+MIN_WEBP_QUALITY = 40
+MAX_TARGET_ENCODES = 3
+# log(size) ~ linear in quality: default slope until two encodes give a real one
+DEFAULT_QUALITY_SLOPE = 0.02
+# Aim slightly under max_size when interpolating (size is not strictly monotonic)
+TARGET_MARGIN = 0.97
+# A fitting encode using this share of max_size is good enough: stop refining
+GOOD_ENOUGH_FILL = 0.85
+
 # Image versions to generate
 VERSIONS = {
     'large': {'size': (1200, 1200), 'max_size': 800 * 1024},
@@ -23,6 +43,12 @@ VERSIONS = {
     'thumbnail': {'size': (150, 150), 'max_size': 100 * 1024},
 }
 
+# On-demand variants (GET /api/photos/...?size=): whitelisted bounding boxes
+VARIANT_WIDTHS = (150, 400, 800, 1200)
+VARIANT_ALIASES = {
+    name: config['size'][0] for name, config in VERSIONS.items()
+}
+
 
 def validate_image_upload(file_content: bytes, filename: str) -> dict:
     """
@@ -30,6 +56,7 @@ def validate_image_upload(file_content: bytes, filename: str) -> dict:
     
     Returns: {'valid': bool, 'error': str or None, 'mime_type': str}
     """
+    from PIL import Image
     # Check size
     if len(file_content) > MAX_UPLOAD_SIZE:
         return {
@@ -64,6 +91,197 @@ def validate_image_upload(file_content: bytes, filename: str) -> dict:
         }
 
 
+def to_rgb(image: Image.Image) -> Image.Image:
+    """Convert to RGB for WebP, flattening transparency on a white background"""
+    from PIL import Image
+    if image.mode in ('RGBA', 'LA', 'P'):
+        if image.mode == 'P':
+            image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        return background
+    if image.mode != 'RGB':
+        return image.convert('RGB')
+    return image
+
+
+def decode_image(image: Image.Image, max_size: tuple) -> Image.Image:
+    """
+    Decode an opened (not yet loaded) image once, at no more than max_size
+    
+    JPEG: draft mode makes libjpeg decode directly at 1/2, 1/4 or 1/8 scale
+    (the smallest scale still >= max_size), so a 12MP photo is never
+    materialized at full resolution. The result is then LANCZOS-resized
+    to fit max_size and converted to RGB.
+    """
+    from PIL import Image
+    if image.format == 'JPEG':
+        image.draft('RGB', max_size)
+    image = to_rgb(image)
+    image.thumbnail(max_size, Image.LANCZOS)
+    return image
+
+
+def derive_versions(image: Image.Image, sizes: dict) -> dict:
+    """
+    Resize an RGB image to several bounding boxes, largest first
+    Each version is resized from the previous one (progressive downscale),
+    not from the full decoded image: every LANCZOS pass works on fewer pixels.
+    
+    Returns: {name: Image} in the order of `sizes`
+    """
+    from PIL import Image
+    versions = {}
+    current = image
+    for name, size in sorted(sizes.items(), key=lambda item: item[1][0] * item[1][1], reverse=True):
+        current = current.copy()
+        current.thumbnail(size, Image.LANCZOS)
+        versions[name] = current
+    return {name: versions[name] for name in sizes}
+
+
+def encode_webp(image: Image.Image, quality: int) -> bytes:
+    """Encode an RGB image to WebP (method=6)"""
+    buffer = io.BytesIO()
+    image.save(buffer, format='WebP', quality=quality, method=6)
+    return buffer.getvalue()
+
+
+def resolve_variant(size: str):
+    """
+    Map a ?size= value (alias like 'medium' or a whitelisted width) to a width
+    
+    Returns: width in pixels, or None if the size is not allowed
+    """
+    width = VARIANT_ALIASES.get(size)
+    if width is None and size.isdigit():
+        width = int(size)
+    return width if width in VARIANT_WIDTHS else None
+
+
+def render_variant(source_path: str, width: int) -> bytes:
+    """
+    Render a stored photo into a width x width bounding box, as WebP
+    Runs in the image worker pool (picklable, no DB access).
+    """
+    from PIL import Image
+    with Image.open(source_path) as image:
+        resized = decode_image(image, (width, width))
+    return encode_webp(resized, WEBP_QUALITY)
+
+
+def render_sprite(sources: list, tile: int, columns: int) -> bytes:
+    """
+    Pack thumbnails into one WebP sprite sheet, row-major, tile x tile cells
+    Each source is center-cropped to its square cell, so the layout only
+    depends on the number of sources (see PhotoSpriteService.layout).
+    Unreadable sources leave an empty cell.
+    """
+    from PIL import Image, ImageOps
+    rows = math.ceil(len(sources) / columns)
+    sheet = Image.new('RGB', (min(len(sources), columns) * tile, rows * tile), (255, 255, 255))
+    for index, source in enumerate(sources):
+        try:
+            with Image.open(source) as image:
+                cell = ImageOps.fit(to_rgb(image), (tile, tile), Image.LANCZOS)
+        except (OSError, ValueError) as e:
+            logger.error(f"Sprite source unreadable {source}: {e}")
+            continue
+        row, column = divmod(index, columns)
+        sheet.paste(cell, (column * tile, row * tile))
+    return encode_webp(sheet, WEBP_QUALITY)
+
+
+def _next_quality(too_big: list, fits: list, max_size: int, min_quality: int, last: bool = False):
+    """
+    Pick the next quality to try from previous (quality, size) encodes
+    - a fitting and a too big encode: interpolate between them (log size)
+    - only too big encodes: extrapolate down (slope from two encodes, or default);
+      for the last allowed encode the step is doubled, since the size curve
+      flattens at low quality and fitting matters more than quality
+    Returns None when no untried quality can improve the result
+    """
+    target = math.log(max_size * TARGET_MARGIN)
+    hi_q, hi_size = min(too_big)  # lowest quality still too big
+
+    if fits:
+        lo_q, lo_size = max(fits)  # highest quality that fits
+        if hi_q - lo_q <= 1:
+            return None
+        slope = (math.log(hi_size) - math.log(lo_size)) / (hi_q - lo_q)
+        if slope <= 0:
+            return (lo_q + hi_q) // 2
+        quality = lo_q + (target - math.log(lo_size)) / slope
+        return int(min(max(quality, lo_q + 1), hi_q - 1))
+
+    if hi_q <= min_quality:
+        return None
+    slope = DEFAULT_QUALITY_SLOPE
+    if len(too_big) >= 2:
+        (q1, s1), (q2, s2) = sorted(too_big)[:2]
+        measured = (math.log(s2) - math.log(s1)) / (q2 - q1)
+        if measured > 0:
+            slope = measured
+    if last:
+        slope /= 2
+    quality = hi_q - (math.log(hi_size) - target) / slope
+    return int(min(max(math.floor(quality), min_quality), hi_q - 1))
+
+
+def encode_webp_to_target(
+    image: Image.Image,
+    max_size: int,
+    quality: int = WEBP_QUALITY,
+    min_quality: int = MIN_WEBP_QUALITY,
+    max_encodes: int = MAX_TARGET_ENCODES,
+) -> dict:
+    """
+    Encode to WebP under max_size bytes in at most max_encodes encodes
+    
+    First encode at `quality`; if too big, the next quality is predicted from
+    the bytes produced (log(size) is roughly linear in quality), then refined by
+    interpolating between the closest encodes on each side of max_size.
+    
+    Returns: {
+        'data': bytes (highest quality that fits, else the smallest encode),
+        'quality': int,
+        'encodes': int,
+        'fits': bool
+    }
+    """
+    too_big, fits, results = [], [], {}
+    next_quality = quality
+
+    while next_quality is not None and len(results) < max_encodes:
+        data = encode_webp(image, next_quality)
+        results[next_quality] = data
+        if len(data) <= max_size:
+            fits.append((next_quality, len(data)))
+            if next_quality == quality or len(data) >= max_size * GOOD_ENOUGH_FILL:
+                break  # Fits at the requested quality, or close enough to max_size
+        else:
+            too_big.append((next_quality, len(data)))
+        if not too_big:
+            break
+        next_quality = _next_quality(
+            too_big, fits, max_size, min_quality, last=len(results) == max_encodes - 1
+        )
+        if next_quality in results:
+            break
+
+    if fits:
+        best_quality = max(fits)[0]
+    else:
+        best_quality = min(too_big, key=lambda item: item[1])[0]
+
+    return {
+        'data': results[best_quality],
+        'quality': best_quality,
+        'encodes': len(results),
+        'fits': bool(fits),
+    }
+
+
 def process_image_to_webp(
     file_content: bytes,
     plant_id: int,
@@ -89,19 +307,14 @@ def process_image_to_webp(
         'original_height': int
     }
     """
+    from PIL import Image
     try:
-        # Open and validate image
+        # Open (header only), then decode once at the largest version size
         image = Image.open(io.BytesIO(file_content))
         original_width = image.width
         original_height = image.height
-        
-        # Convert to RGB if needed (remove alpha channel for JPEG/WebP)
-        if image.mode in ('RGBA', 'LA', 'P'):
-            rgb_image = Image.new('RGB', image.size, (255, 255, 255))
-            rgb_image.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
-            image = rgb_image
-        elif image.mode != 'RGB':
-            image = image.convert('RGB')
+        sizes = {name: config['size'] for name, config in VERSIONS.items()}
+        image = decode_image(image, max(sizes.values(), key=lambda size: size[0] * size[1]))
         
         # Create photos directory using settings
         photos_dir = settings.PHOTOS_DIR / str(plant_id)
@@ -109,14 +322,13 @@ def process_image_to_webp(
         
         files = {}
         
+        # Resize WITHOUT crop (keep aspect ratio), each version from the previous one
+        resized_versions = derive_versions(image, sizes)
+        
         # Generate each version
         for version_name, version_config in VERSIONS.items():
-            target_size = version_config['size']
             max_size = version_config['max_size']
-            
-            # Resize WITHOUT crop (keep aspect ratio)
-            resized = image.copy()
-            resized.thumbnail(target_size, Image.LANCZOS)
+            resized = resized_versions[version_name]
             
             # Determine filename
             if version_name == 'large':
@@ -126,27 +338,14 @@ def process_image_to_webp(
             
             filepath = photos_dir / filename
             
-            # Save as WebP with quality adjustment
-            quality = WEBP_QUALITY
-            
-            # Iterative quality reduction if file too large
-            for _ in range(5):  # Try up to 5 times
-                buffer = io.BytesIO()
-                resized.save(buffer, format='WebP', quality=quality, method=6)
-                buffer.seek(0)
-                file_bytes = buffer.read()
-                
-                if len(file_bytes) <= max_size:
-                    break
-                
-                # Reduce quality and try again
-                quality -= 10
-                if quality < 30:
-                    logger.warning(
-                        f'Could not compress {version_name} to {max_size} bytes, '
-                        f'using quality {quality} (size: {len(file_bytes)} bytes)'
-                    )
-                    break
+            # Save as WebP, quality searched to fit max_size (<= 3 encodes)
+            encoded = encode_webp_to_target(resized, max_size)
+            file_bytes = encoded['data']
+            if not encoded['fits']:
+                logger.warning(
+                    f'Could not compress {version_name} to {max_size} bytes, '
+                    f'using quality {encoded["quality"]} (size: {len(file_bytes)} bytes)'
+                )
             
             # Write file
             with open(filepath, 'wb') as f:
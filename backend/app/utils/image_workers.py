@@ -0,0 +1,137 @@
+"""
+Pool de workers pour le traitement d'images (hors boucle d'événements)
+
+Le redimensionnement LANCZOS et les encodages WebP (method=6) sont coûteux en
+CPU: exécutés dans une route async, ils bloquent toutes les autres requêtes.
+ImageWorkerPool les délègue à un ProcessPoolExecutor:
+- IMAGE_WORKERS processus (0 = un thread du processus courant)
+- IMAGE_QUEUE_MAX tâches au plus en cours ou en attente: au-delà,
+  ImagePoolSaturated est levée (la route répond 503 + Retry-After)
+- IMAGE_TASK_TIMEOUT secondes max par tâche (ImagePoolTimeout)
+
+Les fonctions soumises doivent être importables (picklables) et ne pas
+toucher à la DB: le processus parent écrit les fichiers et les métadonnées.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ImagePoolSaturated(Exception):
+    """File d'attente pleine: le client doit réessayer plus tard"""
+
+    def __init__(self, pending: int, retry_after: int = 1):
+        super().__init__(f"Traitement d'images saturé ({pending} tâches en cours)")
+        self.pending = pending
+        self.retry_after = retry_after
+
+
+class ImagePoolTimeout(Exception):
+    """Tâche de traitement d'image trop longue"""
+
+
+class ImageWorkerPool:
+    """Exécuteur borné pour les traitements d'images CPU"""
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Tâches soumises et pas encore terminées"""
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        """Crée l'exécuteur au premier usage (aucun processus au démarrage)"""
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    # spawn: même comportement sous Linux, macOS et Windows (Tauri),
+                    # et pas de fork d'un processus qui tient des connexions DB
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="image-worker"
+                    )
+            return self._executor
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn, *args):
+        """
+        Exécute fn(*args) dans le pool et attend son résultat
+
+        Raises:
+            ImagePoolSaturated: Si max_pending tâches sont déjà en cours
+            ImagePoolTimeout: Si la tâche dépasse timeout secondes
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise ImagePoolSaturated(self._pending)
+            self._pending += 1
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BrokenProcessPool:
+            # Un worker est mort (OOM, crash PIL): repartir d'un pool neuf
+            logger.error("Pool d'images cassé, recréation")
+            self.shutdown(wait=False)
+            try:
+                future = self._get_executor().submit(fn, *args)
+            except Exception:
+                self._release()
+                raise
+        except Exception:
+            self._release()
+            raise
+
+        # Le compteur n'est libéré qu'à la fin réelle de la tâche, même après
+        # un timeout côté client: la contre-pression reflète le travail en cours
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise ImagePoolTimeout(f"Traitement d'image > {self.timeout}s")
+
+    def stats(self) -> dict:
+        """État du pool (pour diagnostic)"""
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "started": self._executor is not None,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Arrête les workers (arrêt de l'application)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+image_pool = ImageWorkerPool(
+    workers=settings.IMAGE_WORKERS,
+    max_pending=settings.IMAGE_QUEUE_MAX,
+    timeout=settings.IMAGE_TASK_TIMEOUT,
+)
@@ -0,0 +1,140 @@
+"""
+Profilage des imports au démarrage (équivalent de python -X importtime, en mémoire)
+
+Activé par la variable d'environnement IMPORT_PROFILING=1, lue avant tout autre
+import de l'application (Settings n'est pas encore chargé à ce stade).
+Un finder placé en tête de sys.meta_path enveloppe le loader de chaque module:
+temps cumulé (module + imports qu'il déclenche) et temps propre, par module.
+Exposé par GET /api/diagnostics/startup
+"""
+
+import os
+import sys
+import threading
+import time
+from importlib.abc import MetaPathFinder
+from typing import Dict, List, Optional
+
+ENV_VAR = "IMPORT_PROFILING"
+
+
+class _TimedLoader:
+    """Loader délégué: mesure create_module + exec_module"""
+
+    def __init__(self, loader, profiler: "ImportProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        with self._profiler.measure(spec.name):
+            return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._profiler.measure(module.__name__):
+            self._loader.exec_module(module)
+
+
+class _Measure:
+    def __init__(self, profiler: "ImportProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        stack = self.profiler._stack()
+        stack.append(0.0)  # temps des imports imbriqués
+        self.depth = len(stack)
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        stack = self.profiler._stack()
+        nested = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        self.profiler._record(self.name, elapsed, elapsed - nested, self.depth)
+        return False
+
+
+class ImportProfiler(MetaPathFinder):
+    """Finder de mesure: délègue la recherche aux finders suivants de sys.meta_path"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.modules: Dict[str, dict] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def measure(self, name: str) -> _Measure:
+        return _Measure(self, name)
+
+    def _record(self, name: str, cumulative: float, own: float, depth: int) -> None:
+        with self._lock:
+            entry = self.modules.setdefault(
+                name, {"module": name, "self_ms": 0.0, "cumulative_ms": 0.0, "depth": depth}
+            )
+            # create_module + exec_module: deux mesures pour un même module
+            entry["self_ms"] += own * 1000
+            entry["cumulative_ms"] += cumulative * 1000
+            entry["depth"] = min(entry["depth"], depth)
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self)
+                return spec
+        return None
+
+    def report(self, limit: Optional[int] = None, sort: str = "cumulative_ms") -> List[dict]:
+        """Modules triés par coût décroissant (ms arrondies à 0.01)"""
+        with self._lock:
+            entries = sorted(self.modules.values(), key=lambda e: e[sort], reverse=True)
+        return [
+            {**entry, "self_ms": round(entry["self_ms"], 2), "cumulative_ms": round(entry["cumulative_ms"], 2)}
+            for entry in entries[:limit]
+        ]
+
+    def total_ms(self) -> float:
+        """Somme des temps propres: coût total des imports mesurés"""
+        with self._lock:
+            return round(sum(entry["self_ms"] for entry in self.modules.values()), 2)
+
+
+_profiler: Optional[ImportProfiler] = None
+
+
+def install() -> ImportProfiler:
+    """Place le finder de mesure en tête de sys.meta_path (idempotent)"""
+    global _profiler
+    if _profiler is None:
+        _profiler = ImportProfiler()
+        sys.meta_path.insert(0, _profiler)
+    return _profiler
+
+
+def uninstall() -> None:
+    """Retire le finder (les mesures déjà faites restent consultables)"""
+    if _profiler is not None and _profiler in sys.meta_path:
+        sys.meta_path.remove(_profiler)
+
+
+def install_from_env() -> Optional[ImportProfiler]:
+    """Installe le profiler si IMPORT_PROFILING est activé"""
+    if os.environ.get(ENV_VAR, "").lower() in ("1", "true", "yes", "on"):
+        return install()
+    return None
+
+
+def get_profiler() -> Optional[ImportProfiler]:
+    return _profiler
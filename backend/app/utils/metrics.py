@@ -0,0 +1,234 @@
+"""
+Instrumentation des requêtes HTTP (middleware ASGI)
+
+Par requête: durée, nombre de requêtes SQL et temps SQL cumulé (événements
+before/after_cursor_execute sur tous les Engine, sync et aiosqlite), taille de
+la réponse.
+- En-tête Server-Timing (sql;dur=…;desc="N queries", app;dur=…), ajouté aux
+  mesures éventuelles de la route: visible dans l'onglet réseau des devtools
+- Histogrammes par route (gabarit de chemin, pas l'URL) exposés au format
+  Prometheus par GET /metrics
+
+Activé par Settings.METRICS_ENABLED. Les requêtes SQL hors requête HTTP (jobs
+photo, bootstrap) ne sont pas comptées.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Bornes supérieures des buckets (le bucket +Inf est implicite)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+UNMATCHED_ROUTE = "<unmatched>"  # 404: pas d'étiquette par URL inconnue
+
+
+class RequestMetrics:
+    """Compteurs SQL de la requête en cours (partagés avec le threadpool)"""
+
+    __slots__ = ("sql_count", "sql_seconds", "scope")
+
+    def __init__(self, scope=None):
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.scope = scope  # route résolue par le routeur (journal des requêtes lentes)
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def current_request_metrics() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+class Histogram:
+    """Histogramme cumulatif Prometheus, une série par jeu d'étiquettes"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...], buckets: Iterable[float]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.series: Dict[tuple, dict] = {}
+
+    def observe(self, label_values: tuple, value: float) -> None:
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = {
+                "counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0,
+            }
+        series["counts"][bisect_left(self.buckets, value)] += 1
+        series["sum"] += value
+        series["count"] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_values, series in sorted(self.series.items()):
+            labels = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series["counts"]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format(bound)
+                lines.append(f'{self.name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {_format(series['sum'])}")
+            lines.append(f"{self.name}_count{{{labels}}} {series['count']}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class MetricsRegistry:
+    """Histogrammes de l'application, mis à jour par le middleware"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.duration = Histogram(
+                "http_request_duration_seconds", "Durée des requêtes HTTP",
+                ("method", "route", "status"), LATENCY_BUCKETS,
+            )
+            self.sql_statements = Histogram(
+                "http_request_sql_statements", "Requêtes SQL exécutées par requête HTTP",
+                ("method", "route"), SQL_COUNT_BUCKETS,
+            )
+            self.sql_duration = Histogram(
+                "http_request_sql_duration_seconds", "Temps SQL cumulé par requête HTTP",
+                ("method", "route"), LATENCY_BUCKETS,
+            )
+            self.response_size = Histogram(
+                "http_response_size_bytes", "Taille du corps des réponses HTTP",
+                ("method", "route"), SIZE_BUCKETS,
+            )
+
+    def record(self, method: str, route: str, status: int, seconds: float,
+               request: RequestMetrics, size: int) -> None:
+        with self._lock:
+            self.duration.observe((method, route, str(status)), seconds)
+            self.sql_statements.observe((method, route), request.sql_count)
+            self.sql_duration.observe((method, route), request.sql_seconds)
+            self.response_size.observe((method, route), size)
+
+    def render(self) -> str:
+        with self._lock:
+            lines = []
+            for histogram in (self.duration, self.sql_statements, self.sql_duration, self.response_size):
+                lines.extend(histogram.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# ===== SQL =====
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    request = _current.get()
+    started = conn.info.get("metrics_started")
+    if request is None or not started:
+        return
+    request.sql_count += 1
+    request.sql_seconds += time.perf_counter() - started.pop()
+
+
+def _handle_error(exception_context):
+    # Requête en échec: pas d'after_cursor_execute, retirer son instant de départ
+    started = exception_context.connection.info.get("metrics_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def instrument_sql() -> None:
+    """Écoute les requêtes SQL de tous les Engine (idempotent)"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+# ===== HTTP =====
+
+def route_label(scope) -> str:
+    """Gabarit de la route (/api/plants/{plant_id}), renseigné par le routeur"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def server_timing(request: RequestMetrics, app_seconds: float) -> str:
+    return (
+        f'sql;dur={request.sql_seconds * 1000:.1f};desc="{request.sql_count} queries", '
+        f"app;dur={app_seconds * 1000:.1f}"
+    )
+
+
+def with_server_timing(headers, timing: bytes) -> list:
+    """Ajoute les mesures après celles de la route (upload photo: durées par étape)"""
+    headers = list(headers)
+    for index, (name, value) in enumerate(headers):
+        if name.lower() == b"server-timing":
+            headers[index] = (name, value + b", " + timing)
+            return headers
+    headers.append((b"server-timing", timing))
+    return headers
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI pur (pas de BaseHTTPMiddleware: ni tâche ni copie du corps)
+    Le Server-Timing est calculé à l'envoi des en-têtes: pour une réponse en
+    flux, le temps SQL postérieur n'y figure pas (il est compté dans /metrics)
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestMetrics(scope)
+        token = _current.set(request)
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = server_timing(request, time.perf_counter() - started).encode("latin-1")
+                message = {**message, "headers": with_server_timing(message.get("headers", []), timing)}
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            self.registry.record(
+                scope["method"], route_label(scope), status,
+                time.perf_counter() - started, request, size,
+            )
@@ -0,0 +1,38 @@
+"""
+Pagination par curseur (keyset) pour les listes
+Le curseur est opaque pour le client: base64url d'un JSON {s, k, id}
+- s: clé de tri utilisée (le curseur n'est valable que pour ce tri)
+- k: valeur de la clé de tri du dernier élément renvoyé
+- id: id du dernier élément renvoyé (départage les égalités)
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Tuple
+
+
+def encode_cursor(sort: str, sort_value: Any, item_id: int) -> str:
+    """Construit un curseur opaque à partir du dernier élément d'une page"""
+    payload = json.dumps({"s": sort, "k": sort_value, "id": item_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """
+    Décode un curseur et retourne (valeur de tri, id)
+
+    Raises:
+        ValueError: Si le curseur est malformé ou créé pour un autre tri
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        cursor_sort, sort_value, item_id = payload["s"], payload["k"], int(payload["id"])
+    except (ValueError, KeyError, TypeError, binascii.Error, UnicodeError):
+        raise ValueError("Curseur de pagination invalide")
+
+    if cursor_sort != sort:
+        raise ValueError(f"Curseur créé pour le tri '{cursor_sort}', pas '{sort}'")
+
+    return sort_value, item_id
@@ -0,0 +1,170 @@
+"""
+Journal des requêtes SQL lentes (surveillance de l'Engine)
+
+Toute requête au-delà de Settings.SLOW_QUERY_THRESHOLD_MS est:
+- journalisée (WARNING) avec ses paramètres et le plan EXPLAIN QUERY PLAN
+- signalée si le plan contient un parcours complet de table ("SCAN plants"),
+  à indexer sur les grandes collections
+- attribuée à la route en cours (contexte du middleware de app.utils.metrics,
+  METRICS_ENABLED) et à la première frame appelante de l'application
+- conservée dans un tampon circulaire (SLOW_QUERY_BUFFER_SIZE dernières),
+  exposé par GET /api/diagnostics/slow-queries
+
+Le plan est calculé sur la connexion DBAPI (sans repasser par les événements),
+uniquement pour les requêtes lentes: les autres ne paient que le chronométrage.
+"""
+
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.utils.metrics import current_request_metrics, route_label
+
+logger = logging.getLogger(__name__)
+
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE")
+# Ni index, ni table virtuelle (FTS5); "SCAN TABLE x" avant SQLite 3.36
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\S+)$")
+PARAM_MAX_CHARS = 200
+
+APP_DIR = Path(__file__).resolve().parents[1]
+SKIPPED_DIRS = (APP_DIR / "utils",)
+
+
+class SlowQueryLog:
+    """Tampon circulaire des dernières requêtes lentes"""
+
+    def __init__(self, size: int):
+        self._lock = threading.Lock()
+        self._entries = deque(maxlen=size)
+
+    def add(self, entry: dict) -> None:
+        with self._lock:
+            self._entries.append(entry)
+
+    def entries(self, limit: Optional[int] = None) -> List[dict]:
+        """Plus récentes d'abord"""
+        with self._lock:
+            entries = list(reversed(self._entries))
+        return entries if limit is None else entries[:limit]
+
+    def full_scans(self) -> dict:
+        """Nombre de requêtes lentes par table parcourue en entier"""
+        with self._lock:
+            return dict(Counter(table for entry in self._entries for table in entry["full_scans"]))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_BUFFER_SIZE)
+
+
+def _format_parameters(parameters) -> object:
+    def short(value):
+        text = repr(value)
+        return text if len(text) <= PARAM_MAX_CHARS else text[:PARAM_MAX_CHARS] + "…"
+
+    if isinstance(parameters, dict):
+        return {key: short(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [short(value) for value in parameters]
+    return short(parameters)
+
+
+def _request_route() -> Optional[str]:
+    request = current_request_metrics()
+    if request is None or request.scope is None:
+        return None
+    return f"{request.scope['method']} {route_label(request.scope)}"
+
+
+def _caller() -> Optional[str]:
+    """Première frame de l'application hors utilitaires (service ou route)"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        path = Path(frame.f_code.co_filename)
+        if APP_DIR in path.parents and path.parent not in SKIPPED_DIRS:
+            return f"{path.relative_to(APP_DIR.parent)}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return None
+
+
+def explain(dbapi_connection, statement: str, parameters) -> List[str]:
+    """Détail de chaque étape d'EXPLAIN QUERY PLAN ([] si non applicable)"""
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return []
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[3] for row in cursor.fetchall()]
+    except Exception as e:
+        return [f"EXPLAIN impossible: {e}"]
+    finally:
+        cursor.close()
+
+
+def full_scans(plan: List[str]) -> List[str]:
+    """Tables parcourues en entier (hors catalogue sqlite_*, non indexable)"""
+    tables = [match.group(1) for match in map(FULL_SCAN.match, plan) if match]
+    return [table for table in tables if not table.startswith("sqlite_")]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("slow_query_started")
+    if not started:
+        return
+    elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+    if elapsed_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    plan = [] if executemany or not settings.SLOW_QUERY_EXPLAIN else explain(
+        conn.connection.dbapi_connection, statement, parameters
+    )
+    entry = {
+        "at": datetime.now().isoformat(timespec="seconds"),
+        "duration_ms": round(elapsed_ms, 1),
+        "statement": statement,
+        "parameters": _format_parameters(parameters),
+        "executemany": executemany,
+        "route": _request_route(),
+        "caller": _caller(),
+        "plan": plan,
+        "full_scans": full_scans(plan),
+    }
+    slow_query_log.add(entry)
+    logger.warning(
+        f"Requête lente {entry['duration_ms']:.0f} ms"
+        f" [{entry['route'] or entry['caller'] or 'hors requête'}]"
+        f"{' parcours complet: ' + ', '.join(entry['full_scans']) if entry['full_scans'] else ''}\n"
+        f"{statement}\nparamètres: {entry['parameters']}\nplan: {' | '.join(plan) or '-'}"
+    )
+
+
+def _handle_error(exception_context):
+    started = exception_context.connection.info.get("slow_query_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def watch_slow_queries(engine: Engine) -> None:
+    """Chronomètre les requêtes de l'engine (idempotent; AsyncEngine: passer sync_engine)"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
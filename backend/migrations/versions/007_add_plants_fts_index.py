@@ -0,0 +1,33 @@
+"""Add FTS5 full-text index on plants
+
+Revision ID: 007_add_plants_fts_index
+Revises: 5bf7f24bfad9
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '007_add_plants_fts_index'
+down_revision = '5bf7f24bfad9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    from app.models.plant_search import CREATE_STATEMENTS, FTS_TABLE
+
+    # Table virtuelle FTS5 + triggers de synchronisation
+    for statement in CREATE_STATEMENTS:
+        op.execute(statement)
+
+    # Indexer les plantes existantes
+    op.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    from app.models.plant_search import DROP_STATEMENTS
+
+    for statement in DROP_STATEMENTS:
+        op.execute(statement)
@@ -0,0 +1,29 @@
+"""Add plant_stats counter table
+
+Revision ID: 008_add_plant_stats_table
+Revises: 007_add_plants_fts_index
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008_add_plant_stats_table'
+down_revision = '007_add_plants_fts_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Compteurs du dashboard (remplis à la première lecture ou via /api/statistics/counters/rebuild)
+    op.create_table('plant_stats',
+        sa.Column('key', sa.String(50), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('plant_stats')
@@ -0,0 +1,34 @@
+"""Add composite (plant_id, date) indexes on history tables
+
+Revision ID: 009_add_history_plant_date_indexes
+Revises: 008_add_plant_stats_table
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '009_add_history_plant_date_indexes'
+down_revision = '008_add_plant_stats_table'
+branch_labels = None
+depends_on = None
+
+HISTORY_TABLES = [
+    'watering_histories',
+    'fertilizing_histories',
+    'repotting_histories',
+    'disease_histories',
+    'plant_histories',
+]
+
+
+def upgrade() -> None:
+    # max(date) par plante et historique trié par plante → parcours d'index
+    for table in HISTORY_TABLES:
+        op.create_index(f'ix_{table}_plant_date', table, ['plant_id', 'date'])
+
+
+def downgrade() -> None:
+    for table in HISTORY_TABLES:
+        op.drop_index(f'ix_{table}_plant_date', table_name=table)
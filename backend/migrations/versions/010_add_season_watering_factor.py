@@ -0,0 +1,38 @@
+"""Add watering_factor to seasons
+
+Revision ID: 010_add_season_watering_factor
+Revises: 009_add_history_plant_date_indexes
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010_add_season_watering_factor'
+down_revision = '009_add_history_plant_date_indexes'
+branch_labels = None
+depends_on = None
+
+# Multiplicateur de l'intervalle d'arrosage par saison (seed_watering_lookups.SEASONS)
+SEASON_FACTORS = {
+    'Printemps': 1.0,
+    'Été': 0.75,
+    'Automne': 1.25,
+    'Hiver': 1.5,
+}
+
+
+def upgrade() -> None:
+    op.add_column('seasons', sa.Column('watering_factor', sa.Float(), nullable=False, server_default='1.0'))
+
+    seasons = sa.table('seasons', sa.column('name', sa.String), sa.column('watering_factor', sa.Float))
+    for name, factor in SEASON_FACTORS.items():
+        op.execute(
+            seasons.update().where(seasons.c.name == name).values(watering_factor=factor)
+        )
+
+
+def downgrade() -> None:
+    op.drop_column('seasons', 'watering_factor')
@@ -0,0 +1,43 @@
+"""Add denormalized last care columns on plants (backfilled from histories)
+
+Revision ID: 011_add_plant_last_care_columns
+Revises: 010_add_season_watering_factor
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '011_add_plant_last_care_columns'
+down_revision = '010_add_season_watering_factor'
+branch_labels = None
+depends_on = None
+
+# Colonne de plants → table d'historique source
+LAST_CARE_COLUMNS = {
+    'last_watered_at': 'watering_histories',
+    'last_fertilized_at': 'fertilizing_histories',
+    'last_repotted_at': 'repotting_histories',
+}
+
+
+def upgrade() -> None:
+    for column, history_table in LAST_CARE_COLUMNS.items():
+        op.add_column('plants', sa.Column(column, sa.Date(), nullable=True))
+        op.create_index(f'ix_plants_{column}', 'plants', [column])
+
+        # Backfill: max(date) des entrées non supprimées (index (plant_id, date))
+        op.execute(
+            f"UPDATE plants SET {column} = ("
+            f"SELECT max(h.date) FROM {history_table} h "
+            f"WHERE h.plant_id = plants.id AND h.deleted_at IS NULL)"
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('plants') as batch_op:
+        for column in LAST_CARE_COLUMNS:
+            batch_op.drop_index(f'ix_plants_{column}')
+            batch_op.drop_column(column)
@@ -0,0 +1,45 @@
+"""Add photo_jobs table for asynchronous photo ingestion
+
+Revision ID: 012_add_photo_jobs_table
+Revises: 011_add_plant_last_care_columns
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '012_add_photo_jobs_table'
+down_revision = '011_add_plant_last_care_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('photo_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('plant_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('upload_path', sa.String(500), nullable=False),
+        sa.Column('original_filename', sa.String(255), nullable=True),
+        sa.Column('upload_size', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('photo_id', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['plant_id'], ['plants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['photo_id'], ['photos.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_photo_jobs_id', 'photo_jobs', ['id'])
+    op.create_index('ix_photo_jobs_plant_id', 'photo_jobs', ['plant_id'])
+    op.create_index('ix_photo_jobs_status', 'photo_jobs', ['status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_photo_jobs_status', 'photo_jobs')
+    op.drop_index('ix_photo_jobs_plant_id', 'photo_jobs')
+    op.drop_index('ix_photo_jobs_id', 'photo_jobs')
+    op.drop_table('photo_jobs')
@@ -0,0 +1,40 @@
+"""Add reference_sequences table (seeded from existing plant references)
+
+Revision ID: 013_add_reference_sequences_table
+Revises: 012_add_photo_jobs_table
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '013_add_reference_sequences_table'
+down_revision = '012_add_photo_jobs_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('reference_sequences',
+        sa.Column('prefix', sa.String(100), nullable=False),
+        sa.Column('next_value', sa.Integer(), nullable=False, server_default='1'),
+        sa.PrimaryKeyConstraint('prefix')
+    )
+
+    # Seed: PREFIX-NNN existants → next_value = max(NNN) + 1 (comparaison numérique)
+    op.execute(
+        "INSERT INTO reference_sequences (prefix, next_value) "
+        "SELECT upper(substr(reference, 1, instr(reference, '-') - 1)), "
+        "max(CAST(substr(reference, instr(reference, '-') + 1) AS INTEGER)) + 1 "
+        "FROM plants "
+        "WHERE instr(reference, '-') > 1 "
+        "AND substr(reference, instr(reference, '-') + 1) <> '' "
+        "AND substr(reference, instr(reference, '-') + 1) NOT GLOB '*[^0-9]*' "
+        "GROUP BY 1"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('reference_sequences')
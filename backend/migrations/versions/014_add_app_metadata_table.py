@@ -0,0 +1,29 @@
+"""Add app_metadata table (seed version/checksum recorded by the startup bootstrap)
+
+Revision ID: 014_add_app_metadata_table
+Revises: 013_add_reference_sequences_table
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '014_add_app_metadata_table'
+down_revision = '013_add_reference_sequences_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('app_metadata',
+        sa.Column('key', sa.String(100), nullable=False),
+        sa.Column('value', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('app_metadata')
@@ -4,25 +4,29 @@ Pytest configuration and fixtures
 
 import os
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from starlette.testclient import TestClient
 
 from app.main import app
-from app.utils.db import get_db
+from app.utils.db import get_async_db, get_db, make_async_engine, make_engine
+from app.utils.bootstrap import bootstrap
 from app.models.base import BaseModel
+from app.services.watering_schedule_service import WateringScheduleService
+from app.services.photo_service import PhotoService
 
 
-# Create test database
+# Create test database (same PRAGMAs as the app: WAL, foreign_keys=ON, ...)
 TEST_DATABASE_URL = "sqlite:////tmp/test_plants.db"
-engine = create_engine(
-    TEST_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    echo=False,
-)
+engine = make_engine(TEST_DATABASE_URL)
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Same database for the async routes (NullPool: TestClient runs each request in its own event loop)
+async_engine = make_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 def override_get_db():
     """Override get_db for tests"""
@@ -33,21 +37,50 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    """Override get_async_db for tests"""
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
+@pytest.fixture(scope="session", autouse=True)
+def app_database():
+    """App database (clients without overrides): bootstrap normally run by the lifespan"""
+    bootstrap()
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Process-level caches must not leak between tests (same test DB URL)"""
+    WateringScheduleService.invalidate()
+    PhotoService.clear_known_files()
+    yield
+
+
 @pytest.fixture(scope="function")
 def db():
     """Create fresh test database for each test"""
     # Create tables
     BaseModel.metadata.create_all(bind=engine)
-    yield TestingSessionLocal()
-    # Drop tables after test
+    session = TestingSessionLocal()
+    yield session
+    # Close (rollback) before dropping tables: an open write transaction would lock the DB
+    session.close()
     BaseModel.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def async_bind():
+    """Sync engine behind the async test sessions (to listen to SQL events of async routes)"""
+    return async_engine.sync_engine
+
+
 @pytest.fixture(scope="function")
 def client():
     """Create FastAPI test client with dependency override"""
     # Override get_db dependency
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     
     # Create test database
     BaseModel.metadata.create_all(bind=engine)
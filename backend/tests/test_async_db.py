@@ -0,0 +1,93 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.plant import Plant
+from app.services.plant_service import AsyncPlantService, PlantService
+from app.services.stats_service import AsyncStatsService, StatsService
+from app.services.watering_schedule_service import AsyncWateringScheduleService, WateringScheduleService
+from app.utils.db import async_url, init_db, make_async_engine, make_engine
+
+
+def test_async_url():
+    assert async_url("sqlite:////tmp/plants.db") == "sqlite+aiosqlite:////tmp/plants.db"
+    assert async_url("sqlite+aiosqlite:///plants.db") == "sqlite+aiosqlite:///plants.db"
+
+
+def test_async_engine_applies_pragmas_and_pools(tmp_path):
+    async def check():
+        engine = make_async_engine(f"sqlite:///{tmp_path / 'app.db'}")
+        try:
+            async with engine.connect() as conn:
+                assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+                assert (await conn.execute(text("PRAGMA foreign_keys"))).scalar() == 1
+            assert engine.pool.__class__.__name__ == "AsyncAdaptedQueuePool"
+        finally:
+            await engine.dispose()
+
+    asyncio.run(check())
+
+
+def test_async_services_match_sync(tmp_path):
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    engine = make_engine(url)
+    init_db(engine)
+    with engine.begin() as conn:
+        conn.execute(Plant.__table__.insert(), [
+            {"name": f"Ficus {i}", "is_archived": i % 4 == 0, "health_status": "good",
+             "is_favorite": False, "is_indoor": True, "is_outdoor": False}
+            for i in range(12)
+        ])
+        conn.execute(Plant.__table__.insert(), [{"name": "Monstera", "is_archived": False, "is_favorite": False,
+                                                 "is_indoor": True, "is_outdoor": False}])
+
+    with Session(engine) as db:
+        expected_page = [p.id for p in PlantService.get_all(db, limit=3, sort="name")]
+        expected_fields = PlantService.get_all(db, limit=3, after=None, fields=["id", "name"])
+        expected_search = [p.id for p in PlantService.search(db, "ficus", limit=50)]
+        expected_stats = StatsService.compute_dashboard_stats(db)
+        WateringScheduleService.invalidate()
+        expected_due = WateringScheduleService.get_due(db, fallback_days=0)
+    WateringScheduleService.invalidate()
+    engine.dispose()
+
+    async def run():
+        async_engine = make_async_engine(url)
+        try:
+            async with AsyncSession(async_engine) as db:
+                page = await AsyncPlantService.get_all(db, limit=3, sort="name")
+                cursor = PlantService.next_cursor(page, 3, "name")
+                next_page = await AsyncPlantService.get_all(db, limit=3, sort="name", after=cursor)
+                return {
+                    "page": [p.id for p in page],
+                    "next_page": [p.id for p in next_page],
+                    "fields": await AsyncPlantService.get_all(db, limit=3, fields=["id", "name"]),
+                    "search": [p.id for p in await AsyncPlantService.search(db, "ficus", limit=50)],
+                    "stats": await AsyncStatsService.compute_dashboard_stats(db),
+                    "due": await AsyncWateringScheduleService.get_due(db, fallback_days=0),
+                }
+        finally:
+            await async_engine.dispose()
+
+    result = asyncio.run(run())
+    assert result["page"] == expected_page
+    assert result["next_page"] and result["next_page"][0] not in expected_page
+    assert result["fields"] == expected_fields
+    assert sorted(result["search"]) == sorted(expected_search) and len(expected_search) == 9
+    assert result["stats"] == expected_stats
+    assert result["due"] == expected_due
+
+
+def test_hot_read_routes_on_async_path(client):
+    plant = client.post("/api/plants", json={"name": "Calathea", "health_status": "good"}).json()
+    client.post(f"/api/plants/{plant['id']}/watering-history", json={"date": "2024-01-01", "amount_ml": 200})
+
+    assert [p["id"] for p in client.get("/api/plants").json()] == [plant["id"]]
+    assert [p["id"] for p in client.get("/api/plants/search", params={"q": "cala"}).json()] == [plant["id"]]
+    assert client.get("/api/statistics/dashboard").json()["health_good"] == 1
+    assert [p["id"] for p in client.get("/api/plants/to-water").json()] == [plant["id"]]
+    history = client.get(f"/api/plants/{plant['id']}/watering-history").json()
+    assert [h["amount_ml"] for h in history] == [200]
+    assert client.get("/api/plants/999999/watering-history").status_code == 404
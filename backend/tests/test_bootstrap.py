@@ -0,0 +1,96 @@
+"""
+Tests du bootstrap de démarrage (schéma + seeds ignorés si l'empreinte est à jour)
+"""
+
+import logging
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from starlette.testclient import TestClient
+
+import app.main as main_module
+from app.models import AppMetadata, Location, Plant
+from app.models.lookup import Season
+from app.scripts.seed_lookups import LOCATIONS
+from app.utils import bootstrap as bootstrap_module
+from app.utils.bootstrap import CHECKSUM_KEY, bootstrap, bootstrap_checksum
+from app.utils.db import make_engine
+
+
+@pytest.fixture
+def fresh_engine(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'plants.db'}")
+    yield engine
+    engine.dispose()
+
+
+def count(engine, model):
+    with Session(bind=engine) as session:
+        return session.scalar(select(func.count()).select_from(model))
+
+
+def test_first_run_seeds_and_records_checksum(fresh_engine):
+    result = bootstrap(fresh_engine)
+
+    assert result["status"] == "seeded"
+    assert count(fresh_engine, Location) == len(LOCATIONS)
+    assert count(fresh_engine, Season) == 4
+    assert count(fresh_engine, Plant) > 0
+    with Session(bind=fresh_engine) as session:
+        assert session.get(AppMetadata, CHECKSUM_KEY).value == bootstrap_checksum()
+
+
+def test_second_run_skips_with_single_query(fresh_engine):
+    bootstrap(fresh_engine)
+    statements = []
+    event.listen(fresh_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    result = bootstrap(fresh_engine)
+
+    assert result["status"] == "current"
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("SELECT")
+
+
+def test_checksum_change_reseeds_idempotently(fresh_engine, monkeypatch):
+    bootstrap(fresh_engine)
+    locations, plants = count(fresh_engine, Location), count(fresh_engine, Plant)
+
+    monkeypatch.setattr(bootstrap_module, "SEED_VERSION", bootstrap_module.SEED_VERSION + 1)
+    result = bootstrap(fresh_engine)
+
+    assert result["status"] == "seeded"
+    assert count(fresh_engine, Location) == locations
+    assert count(fresh_engine, Plant) == plants
+    assert bootstrap(fresh_engine)["status"] == "current"
+
+
+def test_lookups_insert_or_ignore_keeps_existing_rows(fresh_engine):
+    bootstrap(fresh_engine)
+    with Session(bind=fresh_engine) as session:
+        salon = session.scalar(select(Location).where(Location.name == "Salon"))
+        salon.description = "Modifié"
+        session.delete(session.scalar(select(Location).where(Location.name == "Serre")))
+        session.delete(session.get(AppMetadata, CHECKSUM_KEY))
+        session.commit()
+
+    bootstrap(fresh_engine)
+
+    with Session(bind=fresh_engine) as session:
+        assert session.scalar(select(Location.description).where(Location.name == "Salon")) == "Modifié"
+        assert session.scalar(select(Location).where(Location.name == "Serre")) is not None
+    assert count(fresh_engine, Location) == len(LOCATIONS)
+
+
+def test_lifespan_runs_bootstrap_and_logs_cold_start(fresh_engine, monkeypatch, caplog):
+    monkeypatch.setattr(main_module, "bootstrap", lambda: bootstrap(fresh_engine))
+    monkeypatch.setattr(main_module, "resume_photo_jobs", lambda tasks: None)
+
+    with caplog.at_level(logging.INFO, logger="app.main"):
+        with TestClient(main_module.app) as client:
+            assert client.get("/health").status_code == 200
+
+    assert count(fresh_engine, AppMetadata) == 2
+    assert any("Cold start" in record.getMessage() for record in caplog.records)
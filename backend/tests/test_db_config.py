@@ -0,0 +1,56 @@
+from sqlalchemy import text
+
+from app import config
+from app.utils.db import make_engine, sqlite_pragmas
+
+
+def test_pragmas_applied_on_every_connection(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    try:
+        for _ in range(2):
+            with engine.connect() as conn:
+                pragma = lambda name: conn.execute(text(f"PRAGMA {name}")).scalar()
+                assert pragma("journal_mode") == "wal"
+                assert pragma("synchronous") == 1  # NORMAL
+                assert pragma("foreign_keys") == 1
+                assert pragma("temp_store") == 2  # MEMORY
+                assert pragma("busy_timeout") == config.settings.SQLITE_BUSY_TIMEOUT_MS
+                assert pragma("cache_size") == config.settings.SQLITE_CACHE_SIZE
+            engine.dispose()  # nouvelle connexion au tour suivant
+        assert engine.pool.size() == config.settings.DB_POOL_SIZE
+    finally:
+        engine.dispose()
+
+
+def test_pragmas_from_settings(monkeypatch):
+    monkeypatch.setattr(config.settings, "SQLITE_SYNCHRONOUS", "FULL")
+    monkeypatch.setattr(config.settings, "SQLITE_FOREIGN_KEYS", False)
+    pragmas = sqlite_pragmas()
+    assert pragmas["synchronous"] == "FULL"
+    assert pragmas["foreign_keys"] == "OFF"
+    assert list(pragmas)[0] == "busy_timeout"
+
+
+def test_wal_readers_not_blocked_by_open_write(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+
+        with engine.connect() as writer:
+            writer.execute(text("BEGIN IMMEDIATE"))
+            writer.execute(text("INSERT INTO t VALUES (2)"))
+            # Verrou d'écriture tenu: le lecteur voit le dernier état commité
+            with engine.connect() as reader:
+                assert reader.execute(text("SELECT count(*) FROM t")).scalar() == 1
+            writer.execute(text("COMMIT"))
+    finally:
+        engine.dispose()
+
+
+def test_memory_database():
+    engine = make_engine("sqlite://")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+    engine.dispose()
@@ -0,0 +1,84 @@
+"""
+Tests du profilage des imports et de l'endpoint de diagnostic du démarrage
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.utils import import_profiler
+from app.utils.import_profiler import ImportProfiler
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def run_python(code: str, **env) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR, env={**os.environ, **env},
+        capture_output=True, text=True, check=True,
+    ).stdout.strip().splitlines()[-1]
+
+
+def test_profiler_records_self_and_cumulative_time(tmp_path, monkeypatch):
+    (tmp_path / "profiled_child.py").write_text("import time\ntime.sleep(0.02)\n")
+    (tmp_path / "profiled_parent.py").write_text("import time\nimport profiled_child\ntime.sleep(0.01)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    profiler = ImportProfiler()
+    sys.meta_path.insert(0, profiler)
+    try:
+        import profiled_parent  # noqa: F401
+    finally:
+        sys.meta_path.remove(profiler)
+        sys.modules.pop("profiled_parent", None)
+        sys.modules.pop("profiled_child", None)
+
+    modules = {entry["module"]: entry for entry in profiler.report()}
+    parent, child = modules["profiled_parent"], modules["profiled_child"]
+    assert child["self_ms"] >= 20
+    assert parent["cumulative_ms"] >= parent["self_ms"] + child["cumulative_ms"] - 1
+    assert 10 <= parent["self_ms"] < 20
+    assert child["depth"] == parent["depth"] + 1
+    assert profiler.report(limit=1)[0]["module"] == "profiled_parent"
+
+
+def test_app_import_does_not_load_pil():
+    assert run_python("import sys, app.main; print('PIL' in sys.modules)") == "False"
+
+
+def test_import_profiling_enabled_from_env():
+    code = (
+        "import app.main\n"
+        "from app.utils import import_profiler\n"
+        "print(','.join(e['module'] for e in import_profiler.get_profiler().report()))"
+    )
+    modules = run_python(code, IMPORT_PROFILING="1").split(",")
+    assert "app.routes.plants" in modules
+    assert "fastapi" in modules
+
+
+def test_startup_endpoint_without_profiling(client):
+    assert import_profiler.get_profiler() is None
+    response = client.get("/api/diagnostics/startup")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["import_profiling"] == {"enabled": False, "total_ms": None, "modules": []}
+    assert "PIL" in data["deferred_modules"]
+
+
+def test_startup_endpoint_reports_profile(client, monkeypatch):
+    profiler = ImportProfiler()
+    profiler._record("app.fake_heavy", 0.05, 0.04, 1)
+    profiler._record("app.fake_light", 0.01, 0.01, 2)
+    monkeypatch.setattr(import_profiler, "_profiler", profiler)
+    client.app.state.startup = {"import_ms": 1.0, "bootstrap_status": "current", "bootstrap_ms": 1.0, "cold_start_ms": 2.0}
+    try:
+        data = client.get("/api/diagnostics/startup", params={"limit": 1, "sort": "self"}).json()
+    finally:
+        del client.app.state.startup
+
+    assert data["startup"]["bootstrap_status"] == "current"
+    assert data["import_profiling"]["enabled"] is True
+    assert data["import_profiling"]["total_ms"] == 50.0
+    assert [e["module"] for e in data["import_profiling"]["modules"]] == ["app.fake_heavy"]
@@ -0,0 +1,127 @@
+import csv
+import io
+import json
+import zipfile
+from datetime import date
+from io import BytesIO
+
+from PIL import Image
+
+from app import config
+from app.models.plant import Plant
+from app.models.tags import Tag, TagCategory
+from app.services.export_service import ExportService
+
+
+def make_jpeg_bytes(size=(320, 240)):
+    buf = BytesIO()
+    Image.new("RGB", size, (30, 140, 60)).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def _collection(client, db, monkeypatch, tmp_path):
+    photos = tmp_path / "photos"
+    photos.mkdir()
+    exports = tmp_path / "exports"
+    exports.mkdir()
+    monkeypatch.setattr(config.settings, "PHOTOS_DIR", photos)
+    monkeypatch.setattr(config.settings, "EXPORTS_DIR", exports)
+
+    monstera = client.post("/api/plants", json={"name": "Monstera"}).json()["id"]
+    client.post("/api/plants", json={"name": "Pilea"})
+    deleted = client.post("/api/plants", json={"name": "Supprimée"}).json()["id"]
+    client.delete(f"/api/plants/{deleted}")
+
+    client.post(f"/api/plants/{monstera}/watering-history", json={"date": date.today().isoformat(), "amount_ml": 250})
+    files = {"file": ("photo.jpg", make_jpeg_bytes(), "image/jpeg")}
+    photo = client.post(f"/api/plants/{monstera}/photos", files=files).json()
+
+    category = TagCategory(name="Pièce")
+    tag = Tag(name="Salon", category=category)
+    plant = db.get(Plant, monstera)
+    plant.tags.append(tag)
+    db.commit()
+    return monstera, photo
+
+
+def test_stream_ndjson(client, db, monkeypatch, tmp_path):
+    monstera, photo = _collection(client, db, monkeypatch, tmp_path)
+
+    resp = client.get("/api/exports/stream", params={"format": "ndjson"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["name"] for r in records] == ["Monstera", "Pilea"]
+
+    record = records[0]
+    assert record["id"] == monstera
+    assert record["tags"] == ["Salon"]
+    assert [p["filename"] for p in record["photos"]] == [photo["filename"]]
+    assert record["histories"]["watering"][0]["amount_ml"] == 250
+    assert record["histories"]["notes"] == []
+
+
+def test_stream_csv_tables(client, db, monkeypatch, tmp_path):
+    monstera, _ = _collection(client, db, monkeypatch, tmp_path)
+
+    plants = list(csv.DictReader(io.StringIO(client.get("/api/exports/stream", params={"format": "csv"}).text)))
+    assert [p["name"] for p in plants] == ["Monstera", "Pilea"]
+    assert plants[0]["tags"] == "Salon"
+
+    resp = client.get("/api/exports/stream", params={"format": "csv", "table": "watering"})
+    watering = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [(int(w["plant_id"]), w["amount_ml"]) for w in watering] == [(monstera, "250")]
+
+    assert client.get("/api/exports/stream", params={"format": "csv", "table": "users"}).status_code == 400
+    assert client.get("/api/exports/stream", params={"format": "xml"}).status_code == 422
+
+
+def test_stream_zip_with_photos(client, db, monkeypatch, tmp_path):
+    monstera, photo = _collection(client, db, monkeypatch, tmp_path)
+
+    resp = client.get("/api/exports/stream", params={"format": "zip", "include_photos": True})
+    assert resp.status_code == 200
+    archive = zipfile.ZipFile(BytesIO(resp.content))
+    assert archive.testzip() is None
+    names = set(archive.namelist())
+    assert {"plants.ndjson", *(f"{table}.csv" for table in ExportService.TABLES)} <= names
+    photo_name = f"photos/{monstera}/{photo['filename']}"
+    assert photo_name in names
+    assert archive.read(photo_name) == (config.settings.PHOTOS_DIR / str(monstera) / photo["filename"]).read_bytes()
+
+    without = zipfile.ZipFile(BytesIO(client.get("/api/exports/stream", params={"format": "zip"}).content))
+    assert not any(name.startswith("photos/") for name in without.namelist())
+
+
+def test_export_is_streamed_in_batches(client, db, monkeypatch, tmp_path):
+    _collection(client, db, monkeypatch, tmp_path)
+    for i in range(3):
+        client.post("/api/plants", json={"name": f"Plante {i}"})
+    monkeypatch.setattr(ExportService, "BATCH_SIZE", 2)
+
+    chunks = list(ExportService.stream(db.get_bind(), "ndjson"))
+    assert len(chunks) == 3  # 5 plantes, lots de 2
+    assert sum(chunk.count(b"\n") for chunk in chunks) == 5
+
+
+def test_background_export_to_exports_dir(client, db, monkeypatch, tmp_path):
+    _collection(client, db, monkeypatch, tmp_path)
+
+    resp = client.post("/api/exports", params={"format": "csv", "table": "photos"})
+    assert resp.status_code == 202
+    created = resp.json()
+    assert created["status"] == "running"
+    assert created["filename"].startswith("photos-") and created["filename"].endswith(".csv")
+
+    # La tâche de fond est exécutée avant le retour du TestClient
+    exports = client.get("/api/exports").json()
+    assert [(e["filename"], e["status"]) for e in exports] == [(created["filename"], "done")]
+
+    download = client.get(created["url"])
+    assert download.status_code == 200
+    assert download.text.splitlines()[0].startswith("id,")
+    assert (config.settings.EXPORTS_DIR / created["filename"]).exists()
+
+    assert client.get("/api/exports/plants-20240101T000000-abcdef.zip").status_code == 404
+    assert client.get("/api/exports/..%2Fplants.db").status_code == 404
+    assert client.post("/api/exports", params={"format": "csv", "table": "users"}).status_code == 400
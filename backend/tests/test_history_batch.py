@@ -0,0 +1,104 @@
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app.models.histories import WateringHistory, FertilizingHistory
+from app.models.lookup import Location
+from app.models.plant import Plant
+from app.models.tags import Tag, TagCategory
+
+
+def _room(db):
+    salon = Location(name="Salon")
+    bureau = Location(name="Bureau")
+    db.add_all([salon, bureau])
+    db.flush()
+    plants = [Plant(name=f"Salon {i}", location_id=salon.id) for i in range(3)]
+    plants.append(Plant(name="Bureau", location_id=bureau.id))
+    plants.append(Plant(name="Archivée", location_id=salon.id, is_archived=True))
+    db.add_all(plants)
+    db.commit()
+    return salon, [p.id for p in plants]
+
+
+def test_water_room_in_one_statement(client, db):
+    salon, ids = _room(db)
+    today = date.today()
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        resp = client.post("/api/histories/watering/batch", json={
+            "location_id": salon.id,
+            "data": {"date": today.isoformat(), "amount_ml": 200},
+        })
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+    assert resp.status_code == 201
+    assert resp.json() == {"count": 3, "plant_ids": ids[:3]}
+    assert sum(s.lstrip().upper().startswith("INSERT") for s in statements) == 1
+
+    rows = db.query(WateringHistory).all()
+    assert sorted(r.plant_id for r in rows) == ids[:3]
+    assert {r.amount_ml for r in rows} == {200}
+    assert db.get(Plant, ids[0]).last_watered_at == today
+    assert db.get(Plant, ids[3]).last_watered_at is None
+
+
+def test_fertilize_by_tag_and_plant_ids(client, db):
+    _, ids = _room(db)
+    tag = Tag(name="Cactus", category=TagCategory(name="Type"))
+    plant = db.get(Plant, ids[1])
+    plant.tags.append(tag)
+    db.commit()
+
+    payload = {"data": {"date": date.today().isoformat(), "amount": "5 ml"}}
+    by_tag = client.post("/api/histories/fertilizing/batch", json={**payload, "tag_id": tag.id}).json()
+    assert by_tag == {"count": 1, "plant_ids": [ids[1]]}
+
+    by_ids = client.post("/api/histories/fertilizing/batch", json={**payload, "plant_ids": [ids[0], ids[3], 999]}).json()
+    assert by_ids["plant_ids"] == [ids[0], ids[3]]
+    assert db.query(FertilizingHistory).count() == 3
+
+
+def test_batch_requires_selection(client):
+    resp = client.post("/api/histories/watering/batch", json={"data": {"date": date.today().isoformat()}})
+    assert resp.status_code == 422
+
+
+def test_batch_update_and_delete_resync_last_watered(client, db):
+    salon, ids = _room(db)
+    today, yesterday = date.today(), date.today() - timedelta(days=1)
+    client.post("/api/histories/watering/batch", json={"location_id": salon.id, "data": {"date": yesterday.isoformat()}})
+    client.post("/api/histories/watering/batch", json={"location_id": salon.id, "data": {"date": today.isoformat()}})
+
+    resp = client.patch("/api/histories/watering/batch", json={
+        "location_id": salon.id, "date": today.isoformat(), "data": {"amount_ml": 150},
+    })
+    assert resp.json()["count"] == 3
+    assert db.query(WateringHistory).filter(WateringHistory.amount_ml == 150).count() == 3
+
+    resp = client.post("/api/histories/watering/batch/delete", json={
+        "location_id": salon.id, "date": today.isoformat(),
+    })
+    assert resp.json() == {"count": 3, "plant_ids": ids[:3]}
+    assert db.get(Plant, ids[0]).last_watered_at == yesterday
+    assert len(client.get(f"/api/plants/{ids[0]}/watering-history").json()) == 1
+
+    entry_id = db.query(WateringHistory.id).filter(
+        WateringHistory.plant_id == ids[0], WateringHistory.deleted_at.is_(None)
+    ).scalar()
+    resp = client.post("/api/histories/watering/batch/delete", json={"ids": [entry_id]})
+    assert resp.json()["count"] == 1
+    assert db.get(Plant, ids[0]).last_watered_at is None
+
+
+def test_batch_update_without_fields(client, db):
+    resp = client.patch("/api/histories/watering/batch", json={"ids": [1], "data": {}})
+    assert resp.status_code == 400
+
+
+def test_batch_target_requires_date_with_plant_filter(client, db):
+    salon, _ = _room(db)
+    resp = client.post("/api/histories/watering/batch/delete", json={"location_id": salon.id})
+    assert resp.status_code == 422
@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, timedelta
 
 import pytest
 
@@ -62,3 +62,46 @@ def test_history_service_other_types(db):
     assert ph.id
     HistoryService.update_plant_note(db, pid, ph.id, PlantHistoryUpdate(note="m"))
     assert HistoryService.delete_plant_note(db, pid, ph.id) is True
+
+
+@pytest.mark.usefixtures("db")
+def test_history_service_maintains_last_care_columns(db):
+    p = Plant(name="H3")
+    db.add(p)
+    db.commit()
+    pid = p.id
+    today = date.today()
+
+    old = HistoryService.create_watering(db, pid, WateringHistoryCreate(date=today - timedelta(days=10)))
+    recent = HistoryService.create_watering(db, pid, WateringHistoryCreate(date=today - timedelta(days=2)))
+    assert db.get(Plant, pid).last_watered_at == today - timedelta(days=2)
+
+    HistoryService.update_watering(db, pid, recent.id, WateringHistoryUpdate(notes="x"))
+    assert db.get(Plant, pid).last_watered_at == today - timedelta(days=2)
+
+    # Soft-deleted entries no longer count: falls back to the previous one
+    HistoryService.delete_watering(db, pid, recent.id)
+    assert db.get(Plant, pid).last_watered_at == today - timedelta(days=10)
+    HistoryService.delete_watering(db, pid, old.id)
+    assert db.get(Plant, pid).last_watered_at is None
+
+    HistoryService.create_fertilizing(db, pid, FertilizingHistoryCreate(date=today))
+    HistoryService.create_repotting(db, pid, RepottingHistoryCreate(date=today - timedelta(days=1)))
+    plant = db.get(Plant, pid)
+    assert plant.last_fertilized_at == today
+    assert plant.last_repotted_at == today - timedelta(days=1)
+
+
+@pytest.mark.usefixtures("db")
+def test_rebuild_last_care_backfills_direct_inserts(db):
+    from app.models.histories import WateringHistory
+
+    p = Plant(name="H4")
+    db.add(p)
+    db.commit()
+    db.add(WateringHistory(plant_id=p.id, date=date(2026, 3, 1)))
+    db.commit()
+    assert db.get(Plant, p.id).last_watered_at is None
+
+    HistoryService.rebuild_last_care(db)
+    assert db.get(Plant, p.id).last_watered_at == date(2026, 3, 1)
@@ -55,3 +55,65 @@ def test_process_image_and_delete_files(monkeypatch, tmp_path):
 
     # Directory should be removed
     assert not plant_dir.exists()
+
+
+def _noisy_image(size=(600, 450)):
+    return Image.merge("RGB", [Image.effect_noise(size, 60).convert("L") for _ in range(3)])
+
+
+def test_encode_webp_to_target_fits_in_three_encodes():
+    img = _noisy_image()
+    # Atteignable entre MIN_WEBP_QUALITY et WEBP_QUALITY
+    max_size = len(image_processor.encode_webp(img, 55))
+
+    out = image_processor.encode_webp_to_target(img, max_size)
+    assert out["fits"] is True
+    assert len(out["data"]) <= max_size
+    assert out["encodes"] <= image_processor.MAX_TARGET_ENCODES
+    assert image_processor.MIN_WEBP_QUALITY <= out["quality"] < image_processor.WEBP_QUALITY
+
+
+def test_encode_webp_to_target_single_encode_when_small_enough():
+    img = _noisy_image((100, 100))
+    out = image_processor.encode_webp_to_target(img, 10 * 1024 * 1024)
+    assert out == {
+        "data": out["data"], "quality": image_processor.WEBP_QUALITY, "encodes": 1, "fits": True,
+    }
+
+
+def test_encode_webp_to_target_unreachable_returns_smallest():
+    img = _noisy_image()
+    out = image_processor.encode_webp_to_target(img, 100)
+    assert out["fits"] is False
+    assert out["encodes"] <= image_processor.MAX_TARGET_ENCODES
+    assert out["quality"] == image_processor.MIN_WEBP_QUALITY
+
+
+def test_decode_image_uses_jpeg_draft():
+    data = create_image_bytes("JPEG", size=(4000, 3000))
+    img = Image.open(io.BytesIO(data))
+    decoded = image_processor.decode_image(img, (1200, 1200))
+    assert decoded.mode == "RGB"
+    assert decoded.size == (1200, 900)
+    # draft: libjpeg decoded at reduced scale (1/2 → 2000x1500), not 4000x3000
+    assert img.size[0] < 4000
+
+
+def test_decode_image_flattens_transparency():
+    img = Image.new("RGBA", (50, 50), (0, 0, 0, 0))
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    decoded = image_processor.decode_image(Image.open(io.BytesIO(buf.getvalue())), (100, 100))
+    assert decoded.mode == "RGB"
+    assert decoded.getpixel((0, 0)) == (255, 255, 255)
+
+
+def test_derive_versions_progressive_and_ordered():
+    img = Image.new("RGB", (1600, 1200), (0, 128, 0))
+    sizes = {name: config["size"] for name, config in image_processor.VERSIONS.items()}
+    versions = image_processor.derive_versions(img, {"thumbnail": sizes["thumbnail"], **sizes})
+    assert list(versions) == ["thumbnail", "large", "medium"]
+    assert versions["large"].size == (1200, 900)
+    assert versions["medium"].size == (400, 300)
+    assert versions["thumbnail"].size == (150, 113)
+    assert img.size == (1600, 1200)
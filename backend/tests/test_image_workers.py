@@ -0,0 +1,114 @@
+import asyncio
+import math
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.utils.image_workers import ImagePoolSaturated, ImagePoolTimeout, ImageWorkerPool
+
+
+def test_inline_pool_runs_task():
+    pool = ImageWorkerPool(workers=0, max_pending=2, timeout=5)
+    try:
+        assert asyncio.run(pool.run(sum, [1, 2, 3])) == 6
+        assert pool.pending == 0
+    finally:
+        pool.shutdown()
+
+
+def test_process_pool_runs_task():
+    pool = ImageWorkerPool(workers=1, max_pending=2, timeout=60)
+    try:
+        assert asyncio.run(pool.run(math.factorial, 10)) == 3628800
+        assert pool.stats()["started"] is True
+    finally:
+        pool.shutdown()
+
+
+def test_pool_rejects_when_saturated():
+    pool = ImageWorkerPool(workers=0, max_pending=1, timeout=5)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(pool.run(release.wait, 5))
+        await asyncio.sleep(0)
+        with pytest.raises(ImagePoolSaturated):
+            await pool.run(sum, [1])
+        release.set()
+        await first
+
+    try:
+        asyncio.run(scenario())
+        assert pool.pending == 0
+    finally:
+        pool.shutdown()
+
+
+def test_pool_timeout_keeps_slot_until_task_ends():
+    pool = ImageWorkerPool(workers=0, max_pending=1, timeout=0.05)
+    release = threading.Event()
+    try:
+        with pytest.raises(ImagePoolTimeout):
+            asyncio.run(pool.run(release.wait, 5))
+        # La tâche tourne encore: la place n'est pas libérée
+        assert pool.pending == 1
+        release.set()
+    finally:
+        pool.shutdown()
+    assert pool.pending == 0
+
+
+
+def test_broken_pool_retry_failure_releases_slot(monkeypatch):
+    pool = ImageWorkerPool(workers=0, max_pending=1, timeout=5)
+
+    class BrokenExecutor:
+        def submit(self, fn, *args):
+            raise BrokenProcessPool("worker mort")
+
+        def shutdown(self, **kwargs):
+            pass
+
+    monkeypatch.setattr(pool, "_get_executor", lambda: BrokenExecutor())
+    with pytest.raises(BrokenProcessPool):
+        asyncio.run(pool.run(sum, [1]))
+    assert pool.pending == 0
+
+    monkeypatch.undo()
+    try:
+        assert asyncio.run(pool.run(sum, [1, 2])) == 3
+    finally:
+        pool.shutdown()
+
+
+def test_upload_returns_503_when_pool_saturated(client, monkeypatch, tmp_path):
+    from app import config
+    from app.utils.image_workers import image_pool
+
+    monkeypatch.setattr(config.settings, "PHOTOS_DIR", tmp_path)
+    monkeypatch.setattr(image_pool, "max_pending", 0)
+    plant_id = client.post("/api/plants", json={"name": "Busy"}).json()["id"]
+
+    files = {"file": ("photo.jpg", b"not used", "image/jpeg")}
+    resp = client.post(f"/api/plants/{plant_id}/photos", files=files)
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "1"
+
+
+def test_upload_reports_stage_timings(client, monkeypatch, tmp_path):
+    from io import BytesIO
+    from PIL import Image
+    from app import config
+
+    monkeypatch.setattr(config.settings, "PHOTOS_DIR", tmp_path)
+    plant_id = client.post("/api/plants", json={"name": "Timed"}).json()["id"]
+    buf = BytesIO()
+    Image.new("RGB", (640, 480), (10, 120, 40)).save(buf, format="JPEG")
+
+    files = {"file": ("photo.jpg", buf.getvalue(), "image/jpeg")}
+    resp = client.post(f"/api/plants/{plant_id}/photos", files=files)
+    assert resp.status_code == 201
+    stages = [part.split(";")[0] for part in resp.headers["server-timing"].split(", ")]
+    assert stages == ["read", "queue", "validate", "decode", "encode", "thumbnail", "save", "db", "sql", "app"]
+    assert resp.json()["width"] == 640
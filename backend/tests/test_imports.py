@@ -0,0 +1,122 @@
+import json
+from datetime import date
+
+from app import config
+from app.models.histories import WateringHistory
+from app.models.plant import Plant
+from app.services.import_service import ImportService
+
+
+def _upload(client, content, fmt="csv", kind="plants"):
+    files = {"file": (f"import.{fmt}", content.encode("utf-8"), "text/plain")}
+    return client.post("/api/imports", params={"format": fmt, "kind": kind}, files=files)
+
+
+def test_import_csv(client, db):
+    content = (
+        "name,family,genus,species,health_status,is_favorite\n"
+        "Monstera,Araceae,monstera,Deliciosa,good,true\n"
+        "Pilea,,,,,\n"
+    )
+    resp = _upload(client, content)
+    assert resp.status_code == 200
+    report = resp.json()
+    assert report["total_rows"] == 2
+    assert report["imported"]["plants"] == 2
+    assert report["error_count"] == 0
+
+    monstera = db.query(Plant).filter(Plant.name == "Monstera").one()
+    assert monstera.scientific_name == "Monstera deliciosa"
+    assert monstera.reference == "ARACE-001"
+    assert monstera.is_favorite is True
+    pilea = db.query(Plant).filter(Plant.name == "Pilea").one()
+    assert pilea.reference is None
+    assert pilea.is_favorite is False
+
+
+def test_import_reports_row_errors_without_aborting(client, db):
+    content = (
+        "name,temperature_min\n"
+        "Valide,12\n"
+        ",5\n"
+        "Température,froid\n"
+        "Autre,8\n"
+    )
+    report = _upload(client, content).json()
+    assert report["imported"]["plants"] == 2
+    assert report["error_count"] == 2
+    assert [e["row"] for e in report["errors"]] == [3, 4]
+    assert "name" in report["errors"][0]["errors"][0]
+    assert "temperature_min" in report["errors"][1]["errors"][0]
+    assert {p.name for p in db.query(Plant).all()} == {"Valide", "Autre"}
+
+
+def test_import_duplicate_reference_rejects_only_that_row(client, db):
+    client.post("/api/plants", json={"name": "Existante", "reference": "REF-1"})
+    content = "name,reference\nA,REF-1\nB,REF-2\n"
+    report = _upload(client, content).json()
+    assert report["imported"]["plants"] == 1
+    assert report["errors"][0]["row"] == 2
+    assert db.query(Plant).filter(Plant.reference == "REF-2").one().name == "B"
+
+
+def test_import_preallocates_references_after_existing(client, db, monkeypatch):
+    client.post("/api/plants", json={"name": "Existante", "family": "Araceae"})
+    monkeypatch.setattr(ImportService, "CHUNK_SIZE", 2)
+    content = "name,family\n" + "".join(f"P{i},{family}\n" for i, family in enumerate(["Araceae", "Cactaceae"] * 3))
+    report = _upload(client, content).json()
+    assert report["imported"]["plants"] == 6
+
+    references = sorted(p.reference for p in db.query(Plant).all())
+    assert references == [
+        "ARACE-001", "ARACE-002", "ARACE-003", "ARACE-004",
+        "CACTA-001", "CACTA-002", "CACTA-003",
+    ]
+
+
+def test_import_ndjson_with_nested_histories(client, db):
+    today = date.today().isoformat()
+    lines = [
+        {"id": 99, "name": "Monstera", "tags": ["Salon"],
+         "histories": {"watering": [{"date": today, "amount_ml": 250}], "notes": [{"date": today, "note": "Nouvelle feuille"}]}},
+        {"name": "Invalide", "histories": {"watering": [{"amount_ml": 100}]}},
+        "pas un objet",
+    ]
+    content = "\n".join(json.dumps(line) for line in lines) + "\n{cassé\n"
+    report = _upload(client, content, fmt="ndjson").json()
+    assert report["imported"] == {
+        "plants": 1, "watering": 1, "fertilizing": 0, "repotting": 0, "disease": 0, "notes": 1,
+    }
+    assert [e["row"] for e in report["errors"]] == [2, 3, 4]
+
+    plant = db.query(Plant).one()
+    assert plant.id != 99
+    assert plant.last_watered_at.isoformat() == today
+    assert client.get("/api/plants/search", params={"q": "monstera"}).json()[0]["id"] == plant.id
+
+
+def test_import_history_rows_by_reference(client, db):
+    plant_id = client.post("/api/plants", json={"name": "Monstera", "reference": "MON-1"}).json()["id"]
+    content = (
+        "plant_reference,plant_id,date,amount_ml\n"
+        f"MON-1,,2024-05-01,200\n"
+        f",{plant_id},2024-05-03,300\n"
+        "INCONNUE,,2024-05-02,100\n"
+    )
+    report = _upload(client, content, kind="watering").json()
+    assert report["imported"]["watering"] == 2
+    assert report["errors"] == [{"row": 4, "errors": ["Plante introuvable (plant_id ou plant_reference)"]}]
+    assert db.query(WateringHistory).count() == 2
+    assert db.get(Plant, plant_id).last_watered_at.isoformat() == "2024-05-03"
+
+
+def test_import_updates_stats_counters(client, db, monkeypatch):
+    monkeypatch.setattr(config.settings, "STATS_COUNTERS_ENABLED", True)
+    before = client.get("/api/statistics/dashboard").json()
+    _upload(client, "name,health_status\nA,good\nB,poor\n")
+    after = client.get("/api/statistics/dashboard").json()
+    assert after["total_plants"] == before["total_plants"] + 2
+
+
+def test_import_rejects_unknown_kind(client):
+    assert _upload(client, "name\nA\n", kind="plantes").status_code == 400
@@ -0,0 +1,94 @@
+"""
+Tests du middleware d'instrumentation (Server-Timing, /metrics)
+"""
+
+import re
+
+import pytest
+from sqlalchemy import text
+
+from app.utils.metrics import Histogram, RequestMetrics, _current, current_request_metrics, registry
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def sql_count(response) -> int:
+    return int(re.search(r'desc="(\d+) queries"', response.headers["server-timing"]).group(1))
+
+
+def metric(body: str, line_prefix: str) -> float:
+    for line in body.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix} absent de /metrics")
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Démo", ("route",), (0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(("/a",), value)
+
+    lines = histogram.render()
+    assert lines[:2] == ["# HELP demo_seconds Démo", "# TYPE demo_seconds histogram"]
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'demo_seconds_bucket{route="/a",le="1"} 3' in lines
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'demo_seconds_sum{route="/a"} 3.65' in lines
+    assert 'demo_seconds_count{route="/a"} 4' in lines
+
+
+def test_server_timing_counts_sql_on_sync_and_async_routes(client):
+    plant = client.post("/api/plants", json={"name": "Pilea"}).json()
+
+    sync_response = client.get(f"/api/plants/{plant['id']}")
+    async_response = client.get("/api/plants")
+    health = client.get("/health")
+
+    assert re.fullmatch(r'sql;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+', sync_response.headers["server-timing"])
+    assert sql_count(sync_response) >= 1
+    assert sql_count(async_response) >= 1
+    assert sql_count(health) == 0
+
+
+def test_metrics_endpoint_reports_per_route_template(client):
+    plant = client.post("/api/plants", json={"name": "Pilea"}).json()
+    client.get(f"/api/plants/{plant['id']}")
+    client.get(f"/api/plants/{plant['id']}")
+    response = client.get(f"/api/plants/{plant['id']}")
+    client.get("/no/such/path")
+
+    body = client.get("/metrics")
+    assert body.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text_body = body.text
+    route = 'method="GET",route="/api/plants/{plant_id}"'
+    assert metric(text_body, f'http_request_duration_seconds_count{{{route},status="200"}}') == 3
+    assert metric(text_body, f"http_request_sql_statements_sum{{{route}}}") == 3 * sql_count(response)
+    assert metric(text_body, f"http_response_size_bytes_sum{{{route}}}") == 3 * len(response.content)
+    assert metric(text_body, 'http_request_duration_seconds_count{method="GET",route="<unmatched>",status="404"}') == 1
+    assert f"/api/plants/{plant['id']}" not in text_body
+
+
+def test_sql_outside_requests_is_not_counted(db):
+    assert current_request_metrics() is None
+    db.execute(text("SELECT 1"))
+    assert "http_request_sql_statements_count" not in registry.render()
+
+
+
+def test_failed_statement_does_not_skew_timings(db):
+    request = RequestMetrics()
+    token = _current.set(request)
+    try:
+        with pytest.raises(Exception):
+            db.execute(text("SELECT * FROM no_such_table"))
+        db.rollback()
+        db.execute(text("SELECT 1"))
+        assert not db.connection().info.get("metrics_started")
+    finally:
+        _current.reset(token)
+    assert request.sql_count == 1
@@ -87,6 +87,14 @@ class TestPlantService:
         assert ref1 == "ARACE-002"
         assert ref2 == "ORCHI-002"
     
+    def test_generate_reference_past_999(self, db):
+        """Test numeric ordering of references (ARACE-1000 after ARACE-999)"""
+        db.add(Plant(name="Plant 1", family="Araceae", reference="ARACE-999"))
+        db.add(Plant(name="Plant 2", family="Araceae", reference="ARACE-1000"))
+        db.commit()
+
+        assert PlantService.generate_reference(db, "Araceae") == "ARACE-1001"
+
     def test_generate_reference_invalid_family(self, db):
         """Test reference generation with invalid family"""
         with pytest.raises(ValueError):
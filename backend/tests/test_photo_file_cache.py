@@ -0,0 +1,222 @@
+import asyncio
+from io import BytesIO
+
+from PIL import Image
+from sqlalchemy import event
+
+from app import config
+from app.services.photo_service import PhotoService
+from app.services.plant_service import PlantService
+from app.utils.derived_cache import DerivedImageCache, derived_cache
+from app.utils.http_cache import IMMUTABLE_CACHE_CONTROL, parse_range
+from app.utils.image_processor import render_variant
+from app.utils.image_workers import image_pool
+
+
+def make_jpeg_bytes(size=(1600, 1200)):
+    buf = BytesIO()
+    Image.new("RGB", size, (30, 140, 60)).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def _upload(client, monkeypatch, tmp_path):
+    photos = tmp_path / "photos"
+    photos.mkdir()
+    monkeypatch.setattr(config.settings, "PHOTOS_DIR", photos)
+    monkeypatch.setattr(config.settings, "DERIVED_DIR", tmp_path / "derived")
+    plant_id = client.post("/api/plants", json={"name": "Cache"}).json()["id"]
+    files = {"file": ("photo.jpg", make_jpeg_bytes(), "image/jpeg")}
+    resp = client.post(f"/api/plants/{plant_id}/photos", files=files)
+    assert resp.status_code == 201
+    return plant_id, resp.json()
+
+
+def test_photo_file_cache_headers_and_304(client, monkeypatch, tmp_path):
+    plant_id, photo = _upload(client, monkeypatch, tmp_path)
+    url = f"/api/photos/{plant_id}/{photo['filename']}"
+
+    resp = client.get(url)
+    assert resp.status_code == 200
+    etag = resp.headers["etag"]
+    uuid = photo["filename"].rsplit(".", 1)[0]
+    assert etag == f'"{uuid}-full-{len(resp.content)}"'
+    assert resp.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert resp.headers["accept-ranges"] == "bytes"
+    assert "last-modified" in resp.headers
+
+    resp = client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+
+    resp = client.get(url, headers={"If-Modified-Since": resp.headers["last-modified"]})
+    assert resp.status_code == 304
+
+    # La thumbnail a son propre ETag
+    thumb = client.get(url, params={"thumb": True})
+    assert thumb.status_code == 200
+    assert thumb.headers["etag"] != etag
+    assert client.get(url, headers={"If-None-Match": '"autre"'}).status_code == 200
+
+
+def test_photo_file_range_requests(client, monkeypatch, tmp_path):
+    plant_id, photo = _upload(client, monkeypatch, tmp_path)
+    url = f"/api/photos/{plant_id}/{photo['filename']}"
+    full = client.get(url).content
+
+    resp = client.get(url, headers={"Range": "bytes=0-9"})
+    assert resp.status_code == 206
+    assert resp.content == full[:10]
+    assert resp.headers["content-range"] == f"bytes 0-9/{len(full)}"
+
+    resp = client.get(url, headers={"Range": "bytes=-5"})
+    assert resp.status_code == 206
+    assert resp.content == full[-5:]
+
+    resp = client.get(url, headers={"Range": f"bytes={len(full)}-"})
+    assert resp.status_code == 416
+    assert resp.headers["content-range"] == f"bytes */{len(full)}"
+
+    # If-Range périmé: fichier complet
+    resp = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"ancien"'})
+    assert resp.status_code == 200
+    assert resp.content == full
+
+
+def test_parse_range():
+    assert parse_range("bytes=5-", 10) == (5, 9)
+    assert parse_range("bytes=2-100", 10) == (2, 9)
+    assert parse_range("bytes=-100", 10) == (0, 9)
+    assert parse_range("bytes=0-1,4-5", 10) is None
+    assert parse_range("items=0-1", 10) is None
+    assert parse_range("bytes=abc", 10) is None
+
+
+def test_known_file_skips_db_and_delete_forgets(client, db, monkeypatch, tmp_path):
+    plant_id, photo = _upload(client, monkeypatch, tmp_path)
+    url = f"/api/photos/{plant_id}/{photo['filename']}"
+    assert client.get(url).status_code == 200
+    assert PhotoService.is_known_file(plant_id, photo["filename"])
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        assert client.get(url).status_code == 200
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+    assert not any("photos" in sql for sql in statements)
+
+    resp = client.delete(f"/api/plants/{plant_id}/photos/{photo['id']}")
+    assert resp.status_code == 204
+    assert not PhotoService.is_known_file(plant_id, photo["filename"])
+    assert client.get(url).status_code == 404
+
+
+def test_hard_delete_plant_forgets_files(client, db, monkeypatch, tmp_path):
+    plant_id, photo = _upload(client, monkeypatch, tmp_path)
+    assert client.get(f"/api/photos/{plant_id}/{photo['filename']}").status_code == 200
+    PhotoService.remember_file(plant_id + 1, "autre.webp")
+
+    assert PlantService.delete(db, plant_id, soft=False)
+    assert not PhotoService.is_known_file(plant_id, photo["filename"])
+    assert PhotoService.is_known_file(plant_id + 1, "autre.webp")
+
+
+def test_size_variants_rendered_once_and_cached(client, monkeypatch, tmp_path):
+    plant_id, photo = _upload(client, monkeypatch, tmp_path)
+    url = f"/api/photos/{plant_id}/{photo['filename']}"
+    renders = []
+    original = image_pool.run
+
+    async def counting_run(fn, *args):
+        if fn is render_variant:
+            renders.append(args[1])
+        return await original(fn, *args)
+
+    monkeypatch.setattr(image_pool, "run", counting_run)
+
+    medium = client.get(url, params={"size": "medium"})
+    assert medium.status_code == 200
+    assert max(Image.open(BytesIO(medium.content)).size) == 400
+    assert medium.headers["etag"].endswith(f'-w400-{len(medium.content)}"')
+
+    again = client.get(url, params={"size": "400"})
+    assert again.content == medium.content
+    assert renders == [400]
+
+    assert max(Image.open(BytesIO(client.get(url, params={"size": "800"}).content)).size) == 800
+    thumb = client.get(url, params={"size": "thumb"})
+    assert thumb.content == client.get(url, params={"thumb": True}).content
+    assert renders == [400, 800]
+
+    assert client.get(url, params={"size": "333"}).status_code == 400
+
+    # Suppression de la photo: variantes supprimées
+    derived = derived_cache.path_for(plant_id, photo["filename"], 400)
+    assert derived.exists()
+    client.delete(f"/api/plants/{plant_id}/photos/{photo['id']}")
+    assert not derived.exists()
+
+
+def test_derived_cache_lru_eviction(tmp_path):
+    cache = DerivedImageCache(tmp_path, max_bytes=250)
+    paths = [cache.path_for(1, f"photo{i}.webp", 150) for i in range(3)]
+    cache.store(paths[0], b"a" * 100)
+    cache.store(paths[1], b"b" * 100)
+    assert cache.lookup(paths[0])  # paths[1] devient la moins récente
+
+    cache.store(paths[2], b"c" * 100)
+    assert [p.exists() for p in paths] == [True, False, True]
+    assert cache.total_bytes == 200
+
+    # Index reconstruit depuis le disque
+    reloaded = DerivedImageCache(tmp_path, max_bytes=250)
+    assert reloaded.total_bytes == 200
+    reloaded.discard(1)
+    assert reloaded.total_bytes == 0
+    assert not any(p.exists() for p in paths)
+
+
+def test_derived_cache_deduplicates_concurrent_renders(tmp_path):
+    cache = DerivedImageCache(tmp_path, max_bytes=10_000)
+    path = cache.path_for(1, "photo.webp", 400)
+    calls = []
+
+    async def render():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return b"variant"
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_render(path, render) for _ in range(5)))
+
+    assert asyncio.run(main()) == [path] * 5
+    assert len(calls) == 1
+    assert path.read_bytes() == b"variant"
+
+
+def test_derived_cache_cancelled_first_caller_does_not_fail_waiters(tmp_path):
+    cache = DerivedImageCache(tmp_path, max_bytes=10_000)
+    path = cache.path_for(1, "photo.webp", 400)
+    calls = []
+
+    async def render():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return b"variant"
+
+    async def main():
+        first = asyncio.ensure_future(cache.get_or_render(path, render))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.ensure_future(cache.get_or_render(path, render))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        result = await waiter
+        assert first.cancelled()
+        return result
+
+    assert asyncio.run(main()) == path
+    assert len(calls) == 1
+    assert path.read_bytes() == b"variant"
+    assert cache._inflight == {}
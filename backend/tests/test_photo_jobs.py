@@ -0,0 +1,195 @@
+import asyncio
+import random
+from io import BytesIO
+
+from PIL import Image
+
+from app import config
+from app.models.photo_job import PhotoJob
+from app.services.photo_job_service import PhotoJobService
+from app.services.photo_service import PhotoService
+
+
+def make_jpeg_bytes(size=(800, 600)):
+    buf = BytesIO()
+    Image.new("RGB", size, (30, 140, 60)).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def make_phone_jpeg_bytes(size=(2400, 1800)):
+    """Photo de téléphone: > 1MB en JPEG, compressible sous 500KB en WebP"""
+    w, h = size[0] // 24, size[1] // 24
+    img = Image.frombytes("RGB", (w, h), random.Random(0).randbytes(w * h * 3))
+    buf = BytesIO()
+    img.resize(size, Image.BICUBIC).save(buf, format="JPEG", quality=100)
+    return buf.getvalue()
+
+
+def _use_tmp_dirs(monkeypatch, tmp_path):
+    photos, uploads = tmp_path / "photos", tmp_path / "uploads"
+    photos.mkdir()
+    uploads.mkdir()
+    monkeypatch.setattr(config.settings, "PHOTOS_DIR", photos)
+    monkeypatch.setattr(config.settings, "UPLOADS_DIR", uploads)
+    return photos, uploads
+
+
+def test_ingest_returns_202_and_job_completes(client, monkeypatch, tmp_path):
+    photos, uploads = _use_tmp_dirs(monkeypatch, tmp_path)
+    plant_id = client.post("/api/plants", json={"name": "Async"}).json()["id"]
+
+    files = {"file": ("phone.jpg", make_jpeg_bytes(), "image/jpeg")}
+    resp = client.post(f"/api/plants/{plant_id}/photos/jobs", files=files)
+    assert resp.status_code == 202
+    job = resp.json()
+    assert job["status"] == "pending"
+    assert job["upload_size"] > 0
+
+    # TestClient exécute les tâches de fond avant de rendre la main
+    resp = client.get(f"/api/photo-jobs/{job['id']}")
+    assert resp.status_code == 200
+    done = resp.json()
+    assert done["status"] == "done"
+    assert done["error"] is None
+    assert done["photo"]["id"] == done["photo_id"]
+    assert done["finished_at"] is not None
+
+    filename = done["photo"]["filename"]
+    assert (photos / str(plant_id) / filename).exists()
+    assert (photos / str(plant_id) / "thumbs" / filename).exists()
+    # L'upload brut est supprimé une fois traité
+    assert list(uploads.iterdir()) == []
+
+
+def test_ingest_invalid_image_marks_job_failed(client, monkeypatch, tmp_path):
+    _use_tmp_dirs(monkeypatch, tmp_path)
+    plant_id = client.post("/api/plants", json={"name": "Broken"}).json()["id"]
+
+    files = {"file": ("bad.jpg", b"not an image", "image/jpeg")}
+    job = client.post(f"/api/plants/{plant_id}/photos/jobs", files=files).json()
+
+    failed = client.get(f"/api/photo-jobs/{job['id']}").json()
+    assert failed["status"] == "failed"
+    assert "invalide" in failed["error"]
+    assert failed["photo_id"] is None
+
+
+def test_ingest_large_phone_photo_completes(client, monkeypatch, tmp_path):
+    _use_tmp_dirs(monkeypatch, tmp_path)
+    plant_id = client.post("/api/plants", json={"name": "Téléphone"}).json()["id"]
+    content = make_phone_jpeg_bytes()
+    assert 1024 * 1024 < len(content) <= PhotoJobService.MAX_UPLOAD_SIZE
+
+    files = {"file": ("IMG_0001.jpg", content, "image/jpeg")}
+    job = client.post(f"/api/plants/{plant_id}/photos/jobs", files=files).json()
+
+    done = client.get(f"/api/photo-jobs/{job['id']}").json()
+    assert done["status"] == "done", done["error"]
+    assert done["photo"]["file_size"] <= PhotoService.MAX_FILE_SIZE
+
+
+def test_ingest_rejects_upload_over_limit(client, db, monkeypatch, tmp_path):
+    _, uploads = _use_tmp_dirs(monkeypatch, tmp_path)
+    monkeypatch.setattr(PhotoJobService, "MAX_UPLOAD_SIZE", 2048)
+    monkeypatch.setattr(PhotoJobService, "CHUNK_SIZE", 1024)
+    plant_id = client.post("/api/plants", json={"name": "Trop gros"}).json()["id"]
+
+    resp = client.post(
+        f"/api/plants/{plant_id}/photos/jobs", files={"file": ("big.jpg", b"x" * 4096, "image/jpeg")}
+    )
+    assert resp.status_code == 413
+    assert "trop volumineux" in resp.json()["detail"].lower()
+    # Copie partielle supprimée, aucune tâche créée
+    assert list(uploads.iterdir()) == []
+    assert PhotoJobService.count_active(db) == 0
+
+
+def test_ingest_backpressure_and_not_found(client, monkeypatch, tmp_path):
+    _use_tmp_dirs(monkeypatch, tmp_path)
+    assert client.get("/api/photo-jobs/9999").status_code == 404
+    assert client.post(
+        "/api/plants/9999/photos/jobs", files={"file": ("a.jpg", b"x", "image/jpeg")}
+    ).status_code == 404
+
+    monkeypatch.setattr(config.settings, "PHOTO_JOBS_MAX_PENDING", 0)
+    plant_id = client.post("/api/plants", json={"name": "Full"}).json()["id"]
+    resp = client.post(
+        f"/api/plants/{plant_id}/photos/jobs", files={"file": ("a.jpg", b"x", "image/jpeg")}
+    )
+    assert resp.status_code == 503
+    assert "retry-after" in resp.headers
+
+
+def test_reset_interrupted_requeues_processing_jobs(db):
+    from app.models.plant import Plant
+
+    plant = Plant(name="Restart")
+    db.add(plant)
+    db.commit()
+    db.add_all([
+        PhotoJob(plant_id=plant.id, status=PhotoJob.STATUS_PROCESSING, upload_path="/tmp/a"),
+        PhotoJob(plant_id=plant.id, status=PhotoJob.STATUS_PENDING, upload_path="/tmp/b"),
+        PhotoJob(plant_id=plant.id, status=PhotoJob.STATUS_DONE, upload_path="/tmp/c"),
+    ])
+    db.commit()
+
+    job_ids = PhotoJobService.reset_interrupted(db)
+    assert len(job_ids) == 2
+    assert PhotoJobService.count_active(db) == 2
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def test_process_job_keeps_db_and_disk_off_the_event_loop(client, monkeypatch, tmp_path):
+    _use_tmp_dirs(monkeypatch, tmp_path)
+    calls = []
+
+    def spy(name, fn):
+        def wrapper(*args, **kwargs):
+            calls.append((name, _on_event_loop()))
+            return fn(*args, **kwargs)
+        return staticmethod(wrapper)
+
+    monkeypatch.setattr(PhotoService, "check_quota", spy("check_quota", PhotoService.check_quota))
+    monkeypatch.setattr(PhotoService, "save_upload", spy("save_upload", PhotoService.save_upload))
+    monkeypatch.setattr(PhotoJobService, "get_job", spy("get_job", PhotoJobService.get_job))
+
+    plant_id = client.post("/api/plants", json={"name": "Threadpool"}).json()["id"]
+    files = {"file": ("phone.jpg", make_jpeg_bytes(), "image/jpeg")}
+    calls.clear()
+    job = client.post(f"/api/plants/{plant_id}/photos/jobs", files=files).json()
+    job_calls = list(calls)  # tâche de fond terminée avant la réponse
+
+    assert client.get(f"/api/photo-jobs/{job['id']}").json()["status"] == "done"
+    assert {name for name, _ in job_calls} == {"check_quota", "save_upload", "get_job"}
+    assert not any(on_loop for _, on_loop in job_calls)
+
+
+def test_resumed_jobs_are_referenced_until_done(monkeypatch):
+    from app import main as main_module
+
+    processed = []
+
+    async def fake_process(job_id, bind):
+        await asyncio.sleep(0)
+        processed.append(job_id)
+
+    monkeypatch.setattr(PhotoJobService, "reset_interrupted", staticmethod(lambda db: [1, 2]))
+    monkeypatch.setattr(PhotoJobService, "process_job", staticmethod(fake_process))
+
+    async def scenario():
+        tasks = set()
+        main_module.resume_photo_jobs(tasks)
+        assert len(tasks) == 2
+        await asyncio.gather(*tasks)
+        await asyncio.sleep(0)  # done callbacks
+        return tasks
+
+    assert asyncio.run(scenario()) == set()
+    assert processed == [1, 2]
@@ -9,6 +9,7 @@ from PIL import Image
 from app.services.photo_service import PhotoService
 from app.config import settings
 from app.models.photo import Photo
+from app.models.plant import Plant
 
 
 def make_test_image_bytes(format="JPEG", size=(800, 600), color=(100, 150, 200)):
@@ -63,6 +64,8 @@ def test_process_upload_success_and_file_creation(tmp_path, db):
     try:
         settings.PHOTOS_DIR = Path(tmp_path)
         plant_id = 42
+        db.add(Plant(id=plant_id, name="Photographiée"))  # photos.plant_id: clé étrangère vérifiée
+        db.commit()
         img_bytes = make_test_image_bytes(format="JPEG", size=(1200, 900))
 
         ok, photo_obj, msg = PhotoService.process_upload(plant_id, img_bytes, "test.jpg", db)
@@ -115,6 +118,8 @@ def test_delete_and_set_main_photo(tmp_path, db):
     try:
         settings.PHOTOS_DIR = Path(tmp_path)
         plant_id = 77
+        db.add(Plant(id=plant_id, name="Photographiée"))
+        db.commit()
         img_bytes = make_test_image_bytes(format="JPEG")
 
         # upload first
@@ -147,3 +152,15 @@ def test_delete_and_set_main_photo(tmp_path, db):
 
     finally:
         settings.PHOTOS_DIR = original
+
+
+def test_encode_upload_decodes_once_at_max_image_size():
+    img_bytes = make_test_image_bytes(format="JPEG", size=(2400, 1800))
+    encoded = PhotoService.encode_upload(img_bytes)
+    assert encoded["ok"] is True
+    assert (encoded["width"], encoded["height"]) == (2400, 1800)
+
+    main = Image.open(BytesIO(encoded["webp"]))
+    assert max(main.size) <= max(PhotoService.MAX_IMAGE_SIZE)
+    thumb = Image.open(BytesIO(encoded["thumb"]))
+    assert max(thumb.size) <= max(PhotoService.THUMBNAIL_SIZE)
@@ -0,0 +1,95 @@
+from io import BytesIO
+
+from PIL import Image
+
+from app import config
+from app.services.photo_sprite_service import PhotoSpriteService
+from app.utils.image_processor import render_sprite
+from app.utils.image_workers import image_pool
+
+
+def make_jpeg_bytes(color, size=(640, 480)):
+    buf = BytesIO()
+    Image.new("RGB", size, color).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def _use_tmp_dirs(monkeypatch, tmp_path):
+    photos = tmp_path / "photos"
+    photos.mkdir()
+    monkeypatch.setattr(config.settings, "PHOTOS_DIR", photos)
+    monkeypatch.setattr(config.settings, "DERIVED_DIR", tmp_path / "derived")
+
+
+def _plant_with_photo(client, name, color):
+    plant_id = client.post("/api/plants", json={"name": name}).json()["id"]
+    files = {"file": ("photo.jpg", make_jpeg_bytes(color), "image/jpeg")}
+    photo = client.post(f"/api/plants/{plant_id}/photos", files=files).json()
+    return plant_id, photo
+
+
+def test_sprite_map_and_image(client, monkeypatch, tmp_path):
+    _use_tmp_dirs(monkeypatch, tmp_path)
+    red, _ = _plant_with_photo(client, "Rouge", (220, 20, 20))
+    blue, _ = _plant_with_photo(client, "Bleue", (20, 20, 220))
+    bare = client.post("/api/plants", json={"name": "Sans photo"}).json()["id"]
+
+    resp = client.get("/api/photo-sprites", params={"plant_ids": f"{blue},{bare},{red}"})
+    assert resp.status_code == 200
+    sprite = resp.json()
+    tile = PhotoSpriteService.TILE_SIZE
+    assert sprite["missing"] == [bare]
+    assert [t["plant_id"] for t in sprite["tiles"]] == [blue, red]
+    assert (sprite["tiles"][1]["x"], sprite["tiles"][1]["y"]) == (tile, 0)
+    assert (sprite["width"], sprite["height"]) == (2 * tile, tile)
+
+    image_resp = client.get(sprite["url"])
+    assert image_resp.status_code == 200
+    assert image_resp.headers["cache-control"].endswith("immutable")
+    image = Image.open(BytesIO(image_resp.content)).convert("RGB")
+    assert image.size == (2 * tile, tile)
+    assert image.getpixel((tile // 2, tile // 2))[2] > 150  # bleu
+    assert image.getpixel((tile + tile // 2, tile // 2))[0] > 150  # rouge
+
+    assert client.get(sprite["url"], headers={"If-None-Match": image_resp.headers["etag"]}).status_code == 304
+
+
+def test_sprite_cached_by_members(client, monkeypatch, tmp_path):
+    _use_tmp_dirs(monkeypatch, tmp_path)
+    plant_id, _ = _plant_with_photo(client, "Verte", (20, 200, 20))
+    renders = []
+    original = image_pool.run
+
+    async def counting_run(fn, *args):
+        if fn is render_sprite:
+            renders.append(args)
+        return await original(fn, *args)
+
+    monkeypatch.setattr(image_pool, "run", counting_run)
+
+    first = client.get("/api/photo-sprites", params={"plant_ids": str(plant_id)}).json()
+    second = client.get("/api/photo-sprites", params={"plant_ids": str(plant_id)}).json()
+    assert first["key"] == second["key"]
+    assert len(renders) == 1
+
+    # Nouvelle photo principale: nouveau sprite
+    files = {"file": ("photo.jpg", make_jpeg_bytes((200, 200, 20)), "image/jpeg")}
+    new_photo = client.post(f"/api/plants/{plant_id}/photos", files=files).json()
+    client.put(f"/api/plants/{plant_id}/photos/{new_photo['id']}/set-primary")
+    third = client.get("/api/photo-sprites", params={"plant_ids": str(plant_id)}).json()
+    assert third["key"] != first["key"]
+    assert third["tiles"][0]["photo_id"] == new_photo["id"]
+    assert len(renders) == 2
+
+
+def test_sprite_validation(client, monkeypatch, tmp_path):
+    _use_tmp_dirs(monkeypatch, tmp_path)
+    assert client.get("/api/photo-sprites", params={"plant_ids": "1,abc"}).status_code == 400
+    too_many = ",".join(str(i) for i in range(1, PhotoSpriteService.MAX_PLANTS + 2))
+    assert client.get("/api/photo-sprites", params={"plant_ids": too_many}).status_code == 400
+
+    empty = client.get("/api/photo-sprites", params={"plant_ids": "99999"}).json()
+    assert empty["key"] is None and empty["tiles"] == [] and empty["missing"] == [99999]
+
+    assert client.get(f"/api/photo-sprites/{'0' * 32}.webp").status_code == 404
+    assert client.get("/api/photo-sprites/not-a-key.webp").status_code == 422
@@ -0,0 +1,67 @@
+from sqlalchemy import event
+
+
+def _create(client, count=3):
+    return [
+        client.post("/api/plants", json={
+            "name": f"Ficus {i}",
+            "description": "Longue description " * 20,
+            "is_favorite": i == 0,
+        }).json()["id"]
+        for i in range(count)
+    ]
+
+
+def test_fields_projection_on_list_endpoints(client):
+    ids = _create(client)
+
+    plants = client.get("/api/plants", params={"fields": "name,health_status"}).json()
+    assert {p["id"] for p in plants} >= set(ids)
+    assert all(set(p) == {"id", "name", "health_status"} for p in plants)
+
+    for url, params in [
+        ("/api/plants/search", {"q": "ficus"}),
+        ("/api/plants/filter", {}),
+        ("/api/plants/favorites", {}),
+    ]:
+        resp = client.get(url, params={**params, "fields": "name"})
+        assert resp.status_code == 200, url
+        assert resp.json() and all("description" not in p and "name" in p for p in resp.json()), url
+
+    # La clé de tri est sélectionnée pour le curseur
+    page = client.get("/api/plants", params={"fields": "reference", "sort": "name", "limit": 2}).json()
+    assert page[0].keys() == {"id", "name", "reference"}
+
+
+def test_fields_with_cursor_and_include(client):
+    _create(client, count=5)
+    first = client.get("/api/plants", params={"fields": "name", "limit": 2, "cursor": True}).json()
+    assert first["next_cursor"]
+    second = client.get("/api/plants", params={"fields": "name", "limit": 2, "after": first["next_cursor"]}).json()
+    assert second["items"][0]["id"] > first["items"][-1]["id"]
+
+    search = client.get("/api/plants/search", params={"q": "ficus", "fields": "name", "limit": 2, "cursor": True}).json()
+    assert search["next_cursor"] and "relevance" in search["items"][0]
+
+    plants = client.get("/api/plants", params={"fields": "name", "include": "primary_photo"}).json()
+    assert all(p["primary_photo"] is None for p in plants)
+
+
+def test_fields_selects_only_requested_columns(client, async_bind):
+    _create(client)
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(async_bind, "before_cursor_execute", listener)
+    try:
+        resp = client.get("/api/plants", params={"fields": "name"})
+    finally:
+        event.remove(async_bind, "before_cursor_execute", listener)
+    assert resp.status_code == 200
+    select = next(sql for sql in statements if "FROM plants" in sql)
+    assert "plants.description" not in select
+    assert "plants.name" in select
+
+
+def test_unknown_field_rejected(client):
+    assert client.get("/api/plants", params={"fields": "name,password"}).status_code == 400
+    assert client.get("/api/plants/favorites", params={"fields": "nope"}).status_code == 400
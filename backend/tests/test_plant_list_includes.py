@@ -0,0 +1,79 @@
+from io import BytesIO
+
+from PIL import Image
+from sqlalchemy import event
+
+from app import config
+
+
+def make_jpeg_bytes(size=(640, 480)):
+    buf = BytesIO()
+    Image.new("RGB", size, (30, 140, 60)).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def _setup(client, monkeypatch, tmp_path):
+    photos = tmp_path / "photos"
+    photos.mkdir()
+    monkeypatch.setattr(config.settings, "PHOTOS_DIR", photos)
+    with_photo = client.post("/api/plants", json={"name": "Monstera avec photo", "is_favorite": True}).json()
+    without = client.post("/api/plants", json={"name": "Monstera sans photo", "is_favorite": True}).json()
+    files = {"file": ("photo.jpg", make_jpeg_bytes(), "image/jpeg")}
+    photo = client.post(f"/api/plants/{with_photo['id']}/photos", files=files).json()
+    return with_photo["id"], without["id"], photo
+
+
+def test_list_include_primary_photo(client, monkeypatch, tmp_path):
+    with_photo, without, photo = _setup(client, monkeypatch, tmp_path)
+
+    plain = {p["id"]: p for p in client.get("/api/plants").json()}
+    assert plain[with_photo]["primary_photo"] is None
+
+    plants = {p["id"]: p for p in client.get("/api/plants", params={"include": "primary_photo"}).json()}
+    primary = plants[with_photo]["primary_photo"]
+    assert primary["id"] == photo["id"]
+    assert primary["filename"] == photo["filename"]
+    assert (primary["width"], primary["height"]) == (640, 480)
+    assert primary["thumb_url"] == f"/api/photos/{with_photo}/{photo['filename']}?size=thumb"
+    assert plants[without]["primary_photo"] is None
+
+    page = client.get("/api/plants", params={"include": "primary_photo", "cursor": True}).json()
+    assert any(p["primary_photo"] for p in page["items"])
+
+    for url, params in [
+        ("/api/plants/search", {"q": "monstera"}),
+        ("/api/plants/filter", {}),
+        ("/api/plants/favorites", {}),
+    ]:
+        found = {p["id"]: p for p in client.get(url, params={**params, "include": "primary_photo"}).json()}
+        assert found[with_photo]["primary_photo"]["id"] == photo["id"], url
+        assert found[without]["primary_photo"] is None, url
+
+
+def test_favorites_lists_active_favorites(client):
+    favorite = client.post("/api/plants", json={"name": "Favorite", "is_favorite": True}).json()
+    client.post("/api/plants", json={"name": "Ordinaire"})
+    archived = client.post("/api/plants", json={"name": "Archivée", "is_favorite": True}).json()
+    client.post(f"/api/plants/{archived['id']}/archive")
+
+    resp = client.get("/api/plants/favorites")
+    assert resp.status_code == 200
+    assert [p["id"] for p in resp.json()] == [favorite["id"]]
+
+
+def test_include_primary_photo_single_query(client, async_bind, monkeypatch, tmp_path):
+    _setup(client, monkeypatch, tmp_path)
+    for i in range(5):
+        client.post("/api/plants", json={"name": f"Plante {i}"})
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(async_bind, "before_cursor_execute", listener)
+    try:
+        resp = client.get("/api/plants", params={"include": "primary_photo"})
+    finally:
+        event.remove(async_bind, "before_cursor_execute", listener)
+    assert resp.status_code == 200
+    assert len([sql for sql in statements if "FROM photos" in sql]) == 1
+
+    assert client.get("/api/plants", params={"include": "photos"}).status_code == 400
@@ -317,3 +317,45 @@ def test_update_nonexistent_plant_returns_none(db):
 # - search, filter_plants, get_plants_to_water, etc. are in routes/plants.py
 # - These are tested via integration tests, not service unit tests
 # Keeping only service-layer methods here
+
+
+def test_get_all_keyset_matches_offset(db):
+    """Test that keyset pages cover the same plants as offset pages"""
+    for i in range(9):
+        PlantService.create(db, PlantCreate(name=f"Plant {i}"))
+    
+    offset_ids = [p.id for p in PlantService.get_all(db, skip=0, limit=100)]
+    
+    keyset_ids = []
+    after = None
+    while True:
+        page = PlantService.get_all(db, limit=4, after=after)
+        keyset_ids.extend(p.id for p in page)
+        after = PlantService.next_cursor(page, 4)
+        if after is None:
+            break
+    
+    assert keyset_ids == offset_ids
+
+
+def test_get_archived_only_returns_archived(db):
+    """Test that get_archived excludes active plants"""
+    active = PlantService.create(db, PlantCreate(name="Active"))
+    archived = PlantService.create(db, PlantCreate(name="Archived"))
+    PlantService.archive(db, archived.id)
+    
+    ids = {p.id for p in PlantService.get_archived(db)}
+    assert archived.id in ids
+    assert active.id not in ids
+
+
+def test_search_index_rebuild(db):
+    """Test that the FTS index can be rebuilt from the plants table"""
+    from app.models.plant_search import rebuild_search_index
+    
+    PlantService.create(db, PlantCreate(name="Philodendron"))
+    rebuild_search_index(db.connection())
+    db.commit()
+    
+    results = PlantService.search(db, "philo")
+    assert [p.name for p in results] == ["Philodendron"]
@@ -94,6 +94,7 @@ def test_list_plants_include_archived(client):
 
 def test_create_plant_with_all_fields(client):
     """Test creating plant with comprehensive data"""
+    location = client.post("/api/settings/locations", json={"name": "Salon"}).json()
     plant_data = {
         "name": "Complete Plant",
         "scientific_name": "Monstera deliciosa",
@@ -104,7 +105,7 @@ def test_create_plant_with_all_fields(client):
         "health_status": "healthy",
         "difficulty_level": "easy",
         "growth_speed": "fast",
-        "location_id": 1,
+        "location_id": location["id"],
         "temperature_min": 15,
         "temperature_max": 25,
         "humidity_level": 60,
@@ -201,3 +202,180 @@ def test_restore_plant_not_found_returns_404(client):
     """Test that restoring non-existent plant returns 404"""
     resp = client.post("/api/plants/99999/restore")
     assert resp.status_code == 404
+
+
+def test_list_plants_cursor_pagination(client):
+    """Test keyset pagination: pages chain through next_cursor without overlap"""
+    for i in range(7):
+        client.post("/api/plants", json={"name": f"Cursor {i}"})
+    
+    resp = client.get("/api/plants?cursor=true&limit=3")
+    assert resp.status_code == 200
+    page = resp.json()
+    assert len(page["items"]) == 3
+    assert page["next_cursor"]
+    
+    seen = [p["id"] for p in page["items"]]
+    while page["next_cursor"]:
+        resp = client.get(f"/api/plants?limit=3&after={page['next_cursor']}")
+        assert resp.status_code == 200
+        page = resp.json()
+        seen.extend(p["id"] for p in page["items"])
+    
+    assert len(seen) == 7
+    assert seen == sorted(seen)
+
+
+def test_list_plants_cursor_sorted_by_name(client):
+    """Test keyset pagination on (name, id) with duplicate names"""
+    for name in ["Beta", "Alpha", "Beta", "Gamma", "Alpha"]:
+        client.post("/api/plants", json={"name": name})
+    
+    resp = client.get("/api/plants?cursor=true&limit=2&sort=name")
+    page = resp.json()
+    names = [p["name"] for p in page["items"]]
+    while page["next_cursor"]:
+        page = client.get(f"/api/plants?limit=2&sort=name&after={page['next_cursor']}").json()
+        names.extend(p["name"] for p in page["items"])
+    
+    assert names == ["Alpha", "Alpha", "Beta", "Beta", "Gamma"]
+
+
+def test_list_plants_invalid_cursor(client):
+    """Test that a malformed or mismatched cursor returns 400"""
+    resp = client.get("/api/plants?after=not-a-cursor")
+    assert resp.status_code == 400
+    
+    client.post("/api/plants", json={"name": "One"})
+    cursor = client.get("/api/plants?cursor=true&limit=1").json()["next_cursor"]
+    resp = client.get(f"/api/plants?after={cursor}&sort=name")
+    assert resp.status_code == 400
+
+
+def test_search_and_filter_cursor_pagination(client):
+    """Test that search and filter support the cursor mode"""
+    for i in range(4):
+        client.post("/api/plants", json={"name": f"Ficus {i}", "difficulty_level": "easy"})
+    client.post("/api/plants", json={"name": "Monstera", "difficulty_level": "hard"})
+    
+    page = client.get("/api/plants/search?q=ficus&cursor=true&limit=3").json()
+    assert len(page["items"]) == 3
+    page2 = client.get(f"/api/plants/search?q=ficus&limit=3&after={page['next_cursor']}").json()
+    assert len(page2["items"]) == 1
+    assert page2["next_cursor"] is None
+    
+    resp = client.get("/api/plants/filter?difficulty=easy&limit=10")
+    assert resp.status_code == 200
+    assert len(resp.json()) == 4
+
+
+def test_search_fts_prefix_and_diacritics(client):
+    """Test FTS search: prefix matching, accent-insensitive, synced on update"""
+    resp = client.post("/api/plants", json={"name": "Fougère de Boston"})
+    fern_id = resp.json()["id"]
+    client.post("/api/plants", json={"name": "Ficus", "description": "Pas une fougère"})
+    client.post("/api/plants", json={"name": "Monstera"})
+    
+    results = client.get("/api/plants/search?q=fouger").json()
+    ids = [p["id"] for p in results]
+    assert len(ids) == 2
+    # name weighs more than description in bm25 ranking
+    assert ids[0] == fern_id
+    
+    client.put(f"/api/plants/{fern_id}", json={"name": "Nephrolepis"})
+    results = client.get("/api/plants/search?q=nephro").json()
+    assert [p["id"] for p in results] == [fern_id]
+    results = client.get("/api/plants/search?q=boston").json()
+    assert results == []
+
+
+def test_search_fts_relevance_cursor(client):
+    """Test cursor pagination over bm25-ranked search results"""
+    for i in range(5):
+        client.post("/api/plants", json={"name": f"Calathea {i}"})
+    
+    page = client.get("/api/plants/search?q=cala&cursor=true&limit=2").json()
+    ids = [p["id"] for p in page["items"]]
+    while page["next_cursor"]:
+        page = client.get(f"/api/plants/search?q=cala&limit=2&after={page['next_cursor']}").json()
+        ids.extend(p["id"] for p in page["items"])
+    
+    assert len(ids) == 5
+    assert len(set(ids)) == 5
+
+
+@pytest.fixture
+def without_search_index(monkeypatch):
+    """ILIKE fallback: FTS index reported absent"""
+    from app.services import plant_service
+    monkeypatch.setattr(plant_service, "search_index_exists", lambda conn: False)
+
+
+def test_search_without_fts_index_relevance_cursor(db, without_search_index):
+    """Test ILIKE fallback: constant relevance, relevance cursor pages by id"""
+    from app.models.plant import Plant
+    from app.services.plant_service import PlantService
+    plants = [Plant(name=f"Monstera {i}") for i in range(5)]
+    db.add_all(plants)
+    db.commit()
+    created = [p.id for p in plants]
+    
+    page = PlantService.search(db, "Monstera", limit=2)
+    assert [p.relevance for p in page] == [PlantService.NO_RELEVANCE] * 2
+    cursor = PlantService.next_cursor(page, 2, "relevance")
+    assert [p.id for p in PlantService.search(db, "Monstera", limit=2, after=cursor)] == created[2:4]
+    
+    rows = PlantService.search(db, "Monstera", limit=2, fields=["id", "name"])
+    cursor = PlantService.next_cursor(rows, 2, "relevance")
+    assert [r["id"] for r in PlantService.search(db, "Monstera", limit=2, after=cursor, fields=["id", "name"])] == created[2:4]
+
+
+def test_search_without_fts_index_route_cursor(client, without_search_index):
+    """Test ILIKE fallback on the search route: cursor mode with and without fields"""
+    created = [client.post("/api/plants", json={"name": f"Monstera {i}"}).json()["id"] for i in range(5)]
+    
+    for extra in ("", "&fields=name"):
+        resp = client.get(f"/api/plants/search?q=Monstera&limit=2&cursor=true{extra}")
+        assert resp.status_code == 200
+        page = resp.json()
+        ids = [p["id"] for p in page["items"]]
+        while page["next_cursor"]:
+            resp = client.get(f"/api/plants/search?q=Monstera&limit=2{extra}&after={page['next_cursor']}")
+            assert resp.status_code == 200
+            page = resp.json()
+            ids.extend(p["id"] for p in page["items"])
+        assert ids == created
+
+
+def test_search_ignores_fts_syntax(client):
+    """Test that FTS operators in user input do not raise errors"""
+    client.post("/api/plants", json={"name": "Aloe vera"})
+    resp = client.get('/api/plants/search?q=aloe" OR NEAR(')
+    assert resp.status_code == 200
+    resp = client.get("/api/plants/search?q=***")
+    assert resp.status_code == 200
+    assert resp.json() == []
+
+
+def test_to_fertilize_uses_last_fertilized_at(client):
+    """Plantes à fertiliser: jamais fertilisées, ou depuis days_ago jours ou plus"""
+    from datetime import date, timedelta
+
+    never = client.post("/api/plants", json={"name": "Jamais"}).json()["id"]
+    recent = client.post("/api/plants", json={"name": "Récente"}).json()["id"]
+    old = client.post("/api/plants", json={"name": "Ancienne"}).json()["id"]
+    client.post(f"/api/plants/{recent}/fertilizing-history", json={"date": date.today().isoformat()})
+    client.post(
+        f"/api/plants/{old}/fertilizing-history",
+        json={"date": (date.today() - timedelta(days=40)).isoformat()},
+    )
+
+    resp = client.get("/api/plants/to-fertilize?days_ago=30")
+    assert resp.status_code == 200
+    by_id = {p["id"]: p for p in resp.json()}
+    assert set(by_id) == {never, old}
+    assert by_id[old]["days_since"] == 40
+    assert by_id[never]["reason"] == "Jamais fertilisée"
+
+    detail = client.get(f"/api/plants/{recent}").json()
+    assert detail["last_fertilized_at"] == date.today().isoformat()
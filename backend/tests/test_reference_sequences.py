@@ -0,0 +1,104 @@
+import threading
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.plant import Plant
+from app.models.reference_sequence import ReferenceSequence
+from app.schemas.plant_schema import PlantCreate, PlantUpdate
+from app.services.plant_service import PlantService
+
+
+def test_sequence_seeded_from_existing_references(db):
+    db.add_all([
+        Plant(name="A", reference="ARACE-999"),
+        Plant(name="B", reference="arace-1000"),
+        Plant(name="C", reference="ARACEAE-5000"),
+    ])
+    db.commit()
+
+    assert PlantService.generate_reference(db, "Araceae") == "ARACE-1001"
+    assert db.get(ReferenceSequence, "ARACE").next_value == 1002
+
+
+def test_allocate_block(db):
+    first = PlantService.allocate_references(db, "CACTA", 10)
+    assert first == 1
+    assert PlantService.allocate_references(db, "CACTA") == 11
+    db.commit()
+    assert db.get(ReferenceSequence, "CACTA").next_value == 12
+
+
+def test_numbers_not_reused_after_delete(db):
+    plant = PlantService.create(db, PlantCreate(name="Monstera", family="Araceae"))
+    assert plant.reference == "ARACE-001"
+    PlantService.delete(db, plant.id, soft=False)
+
+    assert PlantService.create(db, PlantCreate(name="Philodendron", family="Araceae")).reference == "ARACE-002"
+
+
+def test_create_retries_when_generated_reference_is_taken(db):
+    PlantService.create(db, PlantCreate(name="Monstera", family="Araceae"))
+    # Saisie manuelle au-delà de la séquence
+    PlantService.create(db, PlantCreate(name="Manuelle", reference="ARACE-002"))
+
+    plant = PlantService.create(db, PlantCreate(name="Philodendron", family="Araceae"))
+    assert plant.reference == "ARACE-003"
+
+
+def test_concurrent_creates_get_distinct_references(db):
+    Session = sessionmaker(bind=db.get_bind())
+    references, errors = [], []
+
+    def worker(index):
+        with Session() as session:
+            try:
+                for n in range(10):
+                    plant = PlantService.create(session, PlantCreate(name=f"P{index}-{n}", family="Araceae"))
+                    references.append(plant.reference)
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(references) == [f"ARACE-{n:03d}" for n in range(1, 41)]
+
+
+def test_manual_reference_advances_sequence(client):
+    client.post("/api/plants", json={"name": "Monstera", "family": "Araceae"})
+    client.post("/api/plants", json={"name": "Manuelle", "reference": "ARACE-002"})
+
+    resp = client.post("/api/plants/generate-reference", params={"family": "Araceae"})
+    assert resp.json()["reference"] == "ARACE-003"
+
+
+def test_reference_set_by_update_advances_sequence(db):
+    plant = PlantService.create(db, PlantCreate(name="Sans référence"))
+    PlantService.update(db, plant.id, PlantUpdate(reference="CACTA-010"))
+
+    assert PlantService.create(db, PlantCreate(name="Cactus", family="Cactaceae")).reference == "CACTA-011"
+
+
+def test_regenerate_retries_when_reference_is_taken(client, db):
+    plant = client.post("/api/plants", json={"name": "Monstera", "family": "Araceae"}).json()
+    # Référence écrite hors service: séquence non avancée
+    db.add(Plant(name="Hors séquence", reference="ARACE-002"))
+    db.commit()
+
+    resp = client.post(f"/api/plants/{plant['id']}/regenerate-reference")
+    assert resp.status_code == 200
+    assert resp.json()["reference"] == "ARACE-003"
+
+
+def test_import_references_advance_sequence(client, db):
+    content = "name,family,reference\nA,Araceae,ARACE-005\nB,Araceae,\n"
+    files = {"file": ("import.csv", content.encode("utf-8"), "text/plain")}
+    report = client.post("/api/imports", params={"format": "csv", "kind": "plants"}, files=files).json()
+    assert report["imported"]["plants"] == 2
+
+    assert db.query(Plant).filter(Plant.name == "B").one().reference == "ARACE-006"
+    assert PlantService.generate_reference(db, "Araceae") == "ARACE-007"
@@ -46,3 +46,30 @@ def test_settings_fertilizer_and_tags(client, db):
     client.get(f"/api/settings/tags?category_id={cat.id}")
     client.put(f"/api/settings/tags/{tid}", json={"name": "Vert clair"})
     client.delete(f"/api/settings/tags/{tid}")
+
+
+def test_delete_location_in_use_is_conflict(client, db):
+    lid = client.post("/api/settings/locations", json={"name": "Véranda"}).json()["id"]
+    plant = client.post("/api/plants", json={"name": "Monstera", "location_id": lid}).json()
+
+    resp = client.delete(f"/api/settings/locations/{lid}")
+    assert resp.status_code == 409
+    assert "encore utilisé" in resp.json()["detail"]
+    assert client.get(f"/api/plants/{plant['id']}").json()["location_id"] == lid
+
+    # Libérée, la localisation se supprime normalement
+    client.put(f"/api/plants/{plant['id']}", json={"location_id": None})
+    assert client.delete(f"/api/settings/locations/{lid}").status_code == 204
+
+
+def test_delete_fertilizer_type_in_use_is_conflict(client, db):
+    fid = client.post("/api/settings/fertilizer-types", json={"name": "Osmocote", "unit": "g"}).json()["id"]
+    plant = client.post("/api/plants", json={"name": "Calathea"}).json()
+    resp = client.post(
+        f"/api/plants/{plant['id']}/fertilizing-history",
+        json={"date": "2025-01-10", "fertilizer_type_id": fid},
+    )
+    assert resp.status_code == 201
+
+    assert client.delete(f"/api/settings/fertilizer-types/{fid}").status_code == 409
+    assert any(f["id"] == fid for f in client.get("/api/settings/fertilizer-types").json())
@@ -0,0 +1,118 @@
+"""
+Tests du journal des requêtes SQL lentes (seuil, EXPLAIN QUERY PLAN, diagnostic)
+"""
+
+import logging
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.plant import Plant
+from app.services.plant_service import PlantService
+from app.utils.db import init_db, make_engine
+from app.utils.slow_queries import SlowQueryLog, full_scans, slow_query_log, watch_slow_queries
+
+
+@pytest.fixture
+def log_all_queries(monkeypatch):
+    """Seuil à 0: chaque requête est consignée"""
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    slow_query_log.clear()
+    yield slow_query_log
+    slow_query_log.clear()
+
+
+@pytest.fixture
+def plants_engine(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    init_db(engine)
+    with engine.begin() as conn:
+        conn.execute(Plant.__table__.insert(), [
+            {"name": f"Ficus {i}", "is_archived": False, "is_favorite": False,
+             "is_indoor": True, "is_outdoor": False}
+            for i in range(5)
+        ])
+    yield engine
+    engine.dispose()
+
+
+def test_slow_query_recorded_with_parameters_and_plan(plants_engine, log_all_queries):
+    with Session(plants_engine) as db:
+        assert len(PlantService._search_ilike(db, "ficus", 0, 50, None, "id")) == 5
+
+    entry = log_all_queries.entries(limit=1)[0]
+    assert entry["statement"].lstrip().upper().startswith("SELECT")
+    assert "%ficus%" in " ".join(entry["parameters"])
+    assert entry["plan"] and not entry["plan"][0].startswith("EXPLAIN impossible")
+    assert entry["caller"].startswith("app/services/plant_service.py:")
+    assert entry["route"] is None
+
+
+def test_full_table_scan_flagged(plants_engine, log_all_queries, caplog):
+    with Session(plants_engine) as db, caplog.at_level(logging.WARNING, logger="app.utils.slow_queries"):
+        PlantService.get_all(db, include_archived=True)
+
+    entry = log_all_queries.entries(limit=1)[0]
+    assert "SCAN plants" in entry["plan"]
+    assert entry["full_scans"] == ["plants"]
+    assert log_all_queries.full_scans()["plants"] >= 1
+    assert "parcours complet: plants" in caplog.text
+
+
+def test_fast_queries_below_threshold_are_ignored(plants_engine, monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 60_000.0)
+    slow_query_log.clear()
+    with Session(plants_engine) as db:
+        PlantService._search_ilike(db, "ficus", 0, 50, None, "id")
+    assert slow_query_log.entries() == []
+
+
+def test_indexed_lookups_are_not_full_scans(plants_engine, log_all_queries):
+    with Session(plants_engine) as db:
+        PlantService.get_by_id(db, 1)
+    entry = log_all_queries.entries(limit=1)[0]
+    assert entry["plan"] and entry["full_scans"] == []
+
+    assert full_scans([
+        "SEARCH plants USING INTEGER PRIMARY KEY (rowid=?)",
+        "SCAN plants USING COVERING INDEX ix_plants_is_archived",
+        "SCAN plants_fts VIRTUAL TABLE INDEX 0:M2",
+        "SCAN sqlite_master",
+        "SCAN p",
+    ]) == ["p"]
+
+
+def test_full_scans_detected_in_both_sqlite_plan_formats():
+    # SQLite >= 3.36, puis le libellé des versions antérieures
+    assert full_scans(["SCAN plants"]) == ["plants"]
+    assert full_scans(["SCAN TABLE plants"]) == ["plants"]
+    assert full_scans([
+        "SCAN TABLE plants USING INDEX ix_plants_is_archived",
+        "SCAN TABLE plants USING COVERING INDEX ix_plants_is_archived",
+        "SCAN TABLE plants_fts VIRTUAL TABLE INDEX 0:M2",
+        "SCAN TABLE sqlite_master",
+    ]) == []
+
+
+def test_ring_buffer_keeps_latest_entries():
+    log = SlowQueryLog(size=2)
+    for i in range(3):
+        log.add({"statement": f"SELECT {i}", "full_scans": ["plants"] if i else []})
+    assert [e["statement"] for e in log.entries()] == ["SELECT 2", "SELECT 1"]
+    assert log.full_scans() == {"plants": 2}
+
+
+def test_slow_queries_endpoint_reports_route(client, async_bind, log_all_queries):
+    watch_slow_queries(async_bind)
+    client.post("/api/plants", json={"name": "Alocasia"})
+    log_all_queries.clear()
+
+    client.get("/api/plants")
+    data = client.get("/api/diagnostics/slow-queries", params={"limit": 5}).json()
+    assert data["enabled"] is True and data["threshold_ms"] == 0.0
+    assert any(q["route"] == "GET /api/plants" and q["plan"] for q in data["queries"])
+    assert len(data["queries"]) <= 5
+
+    assert client.delete("/api/diagnostics/slow-queries").status_code == 204
+    assert client.get("/api/diagnostics/slow-queries").json()["queries"] == []
@@ -3,6 +3,7 @@ from datetime import date, timedelta
 import pytest
 
 from app.services.stats_service import StatsService
+from app.services.history_service import HistoryService
 from app.models.plant import Plant
 from app.models.photo import Photo
 from app.models.histories import WateringHistory, FertilizingHistory
@@ -63,6 +64,7 @@ def test_get_upcoming_waterings_and_fertilizing(db):
     fh = FertilizingHistory(plant_id=p_old.id, date=today - timedelta(days=12), amount="1 unité")
     db.add_all([wh, fh])
     db.commit()
+    HistoryService.rebuild_last_care(db)
 
     upcoming_w = StatsService.get_upcoming_waterings(db, days=7)
     # Expect both entries: never watered and old watering
@@ -72,3 +74,136 @@ def test_get_upcoming_waterings_and_fertilizing(db):
     upcoming_f = StatsService.get_upcoming_fertilizing(db, days=7)
     assert any(item["name"] == "Never" for item in upcoming_f)
     assert any(item["name"] == "Old" for item in upcoming_f)
+
+
+@pytest.mark.usefixtures("db")
+def test_get_dashboard_stats_counts_photos_not_plants(db):
+    p1 = Plant(name="P1", is_archived=False)
+    p2 = Plant(name="P2", is_archived=False)
+    db.add_all([p1, p2])
+    db.commit()
+
+    db.add_all([
+        Photo(plant_id=p1.id, filename="a.webp", file_size=10),
+        Photo(plant_id=p1.id, filename="b.webp", file_size=10),
+        Photo(plant_id=p1.id, filename="c.webp", file_size=10),
+    ])
+    db.commit()
+
+    stats = StatsService.get_dashboard_stats(db)
+    assert stats["total_plants"] == 2
+    assert stats["total_photos"] == 3
+
+
+@pytest.mark.usefixtures("db")
+def test_stats_counters_follow_service_writes(db, monkeypatch):
+    from app.config import settings
+    from app.services.plant_service import PlantService
+    from app.schemas.plant_schema import PlantCreate, PlantUpdate
+
+    monkeypatch.setattr(settings, "STATS_COUNTERS_ENABLED", True)
+
+    # First read initializes the counter table
+    assert StatsService.get_dashboard_stats(db)["total_plants"] == 0
+
+    p1 = PlantService.create(db, PlantCreate(name="P1", health_status="good"))
+    p2 = PlantService.create(db, PlantCreate(name="P2", health_status="poor"))
+    PlantService.update(db, p1.id, PlantUpdate(health_status="excellent"))
+    PlantService.archive(db, p2.id)
+
+    stats = StatsService.get_dashboard_stats(db)
+    assert stats["total_plants"] == 2
+    assert stats["archived_plants"] == 1
+    assert stats["health_excellent"] == 1
+    assert stats["health_good"] == 0
+    assert stats["health_poor"] == 0
+    assert StatsService.check_counters(db)["consistent"] is True
+
+    PlantService.restore(db, p2.id)
+    PlantService.delete(db, p1.id, soft=False)
+    assert StatsService.check_counters(db)["consistent"] is True
+
+
+@pytest.mark.usefixtures("db")
+def test_stats_counters_check_and_rebuild(db, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "STATS_COUNTERS_ENABLED", True)
+
+    report = StatsService.check_counters(db)
+    assert report["consistent"] is False
+    assert report["counters"] is None
+
+    StatsService.rebuild_counters(db)
+    # Write that bypasses the services: counters drift
+    db.add(Plant(name="Direct", is_archived=False))
+    db.commit()
+
+    report = StatsService.check_counters(db)
+    assert report["consistent"] is False
+    assert report["drift"]["total_plants"] == -1
+
+    StatsService.rebuild_counters(db)
+    assert StatsService.check_counters(db)["consistent"] is True
+    assert StatsService.get_dashboard_stats(db)["total_plants"] == 1
+
+
+@pytest.mark.usefixtures("db")
+def test_upcoming_waterings_single_query_ignores_deleted_history(db):
+    from datetime import datetime
+    from sqlalchemy import event
+
+    today = date.today()
+    p_never_1 = Plant(name="Never 1", is_archived=False)
+    p_never_2 = Plant(name="Never 2", is_archived=False)
+    p_recent = Plant(name="Recent", is_archived=False)
+    p_old = Plant(name="Old", is_archived=False)
+    db.add_all([p_never_1, p_never_2, p_recent, p_old])
+    db.commit()
+
+    db.add_all([
+        WateringHistory(plant_id=p_old.id, date=today - timedelta(days=10)),
+        # Recent watering was soft-deleted: only the old one counts
+        WateringHistory(plant_id=p_recent.id, date=today - timedelta(days=20)),
+        WateringHistory(plant_id=p_recent.id, date=today - timedelta(days=1), deleted_at=datetime.utcnow()),
+    ])
+    db.commit()
+    HistoryService.rebuild_last_care(db)
+
+    statements = []
+    bind = db.get_bind()
+    listener = lambda *args: statements.append(args[2])
+    event.listen(bind, "before_cursor_execute", listener)
+    try:
+        upcoming = StatsService.get_upcoming_waterings(db, days=7)
+    finally:
+        event.remove(bind, "before_cursor_execute", listener)
+
+    assert len(statements) == 1
+    by_name = {item["name"]: item for item in upcoming}
+    assert set(by_name) == {"Never 1", "Never 2", "Recent", "Old"}
+    assert by_name["Recent"]["days_since"] == 20
+    assert by_name["Old"]["days_since"] == 10
+    assert by_name["Never 1"]["last_watered"] is None
+    # Never-watered plants come last
+    assert [item["name"] for item in upcoming][:2] == ["Old", "Recent"]
+
+
+@pytest.mark.usefixtures("db")
+def test_stats_counters_rebuilt_after_period_disabled(db, monkeypatch):
+    from app.config import settings
+    from app.services.plant_service import PlantService
+    from app.schemas.plant_schema import PlantCreate
+
+    monkeypatch.setattr(settings, "STATS_COUNTERS_ENABLED", True)
+    PlantService.create(db, PlantCreate(name="Avant"))
+    assert StatsService.get_dashboard_stats(db)["total_plants"] == 1
+
+    # Writes while the flag is off are not counted: the table is dropped
+    monkeypatch.setattr(settings, "STATS_COUNTERS_ENABLED", False)
+    PlantService.create(db, PlantCreate(name="Pendant"))
+    assert StatsService.read_counters(db) is None
+
+    monkeypatch.setattr(settings, "STATS_COUNTERS_ENABLED", True)
+    assert StatsService.get_dashboard_stats(db)["total_plants"] == 2
+    assert StatsService.check_counters(db)["consistent"] is True
@@ -0,0 +1,136 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.plant import Plant
+from app.models.lookup import Season, WateringFrequency
+from app.models.histories import WateringHistory
+from app.services.watering_schedule_service import WateringScheduleService
+from app.services.history_service import HistoryService
+from app.schemas.history_schema import WateringHistoryCreate
+
+
+def _seed_seasons(db):
+    db.add_all([
+        Season(name="Printemps", start_month=3, end_month=5, watering_factor=1.0),
+        Season(name="Été", start_month=6, end_month=8, watering_factor=0.5),
+        Season(name="Automne", start_month=9, end_month=11, watering_factor=1.0),
+        Season(name="Hiver", start_month=12, end_month=2, watering_factor=2.0),
+    ])
+    db.commit()
+
+
+@pytest.mark.usefixtures("db")
+def test_next_due_uses_interval_and_season_factor(db):
+    _seed_seasons(db)
+    weekly = WateringFrequency(name="Hebdo", days_interval=7)
+    db.add(weekly)
+    db.commit()
+
+    summer = Plant(name="Summer", watering_frequency_id=weekly.id)
+    winter = Plant(name="Winter", watering_frequency_id=weekly.id)
+    db.add_all([summer, winter])
+    db.commit()
+
+    db.add_all([
+        WateringHistory(plant_id=summer.id, date=date(2026, 7, 1)),
+        # Hiver chevauche le changement d'année (12 → 2)
+        WateringHistory(plant_id=winter.id, date=date(2026, 1, 10)),
+    ])
+    db.commit()
+    HistoryService.rebuild_last_care(db)
+
+    schedule = {e["name"]: e for e in WateringScheduleService.get_schedule(db)}
+    # 7 jours × 0.5 = 3.5 → arrondi à 4
+    assert schedule["Summer"]["next_due"] == date(2026, 7, 5)
+    assert schedule["Winter"]["next_due"] == date(2026, 1, 24)
+
+
+@pytest.mark.usefixtures("db")
+def test_get_due_respects_each_plant_interval(db):
+    today = date(2026, 4, 15)
+    monthly = WateringFrequency(name="Mensuel", days_interval=30)
+    daily = WateringFrequency(name="Quotidien", days_interval=1)
+    db.add_all([monthly, daily])
+    db.commit()
+
+    cactus = Plant(name="Cactus", watering_frequency_id=monthly.id)
+    fern = Plant(name="Fern", watering_frequency_id=daily.id)
+    never = Plant(name="Never", watering_frequency_id=daily.id)
+    no_freq = Plant(name="NoFreq")
+    db.add_all([cactus, fern, never, no_freq])
+    db.commit()
+
+    db.add_all([
+        WateringHistory(plant_id=cactus.id, date=today - timedelta(days=5)),
+        WateringHistory(plant_id=fern.id, date=today - timedelta(days=5)),
+        WateringHistory(plant_id=no_freq.id, date=today - timedelta(days=3)),
+    ])
+    db.commit()
+    HistoryService.rebuild_last_care(db)
+
+    due = {e["name"]: e for e in WateringScheduleService.get_due(db, today=today)}
+    assert "Cactus" not in due
+    assert due["Fern"]["reason"] == "En retard de 4 jours"
+    assert due["Never"]["reason"] == "Jamais arrosée"
+    assert "NoFreq" not in due
+
+    due = {e["name"] for e in WateringScheduleService.get_due(db, fallback_days=3, today=today)}
+    assert "NoFreq" in due
+
+    due = {e["name"] for e in WateringScheduleService.get_due(db, horizon_days=30, today=today)}
+    assert "Cactus" in due
+
+
+@pytest.mark.usefixtures("db")
+def test_schedule_cache_invalidated_by_watering(db):
+    daily = WateringFrequency(name="Quotidien", days_interval=1)
+    db.add(daily)
+    db.commit()
+    plant = Plant(name="Thirsty", watering_frequency_id=daily.id)
+    db.add(plant)
+    db.commit()
+
+    assert [e["name"] for e in WateringScheduleService.get_due(db)] == ["Thirsty"]
+
+    HistoryService.create_watering(db, plant.id, WateringHistoryCreate(date=date.today()))
+    assert WateringScheduleService.get_due(db) == []
+
+
+@pytest.mark.usefixtures("db")
+def test_agenda_projects_occurrences(db):
+    today = date(2026, 4, 1)
+    every_three = WateringFrequency(name="3 jours", days_interval=3)
+    db.add(every_three)
+    db.commit()
+    plant = Plant(name="Pothos", watering_frequency_id=every_three.id)
+    db.add(plant)
+    db.commit()
+    db.add(WateringHistory(plant_id=plant.id, date=today - timedelta(days=5)))
+    db.commit()
+    HistoryService.rebuild_last_care(db)
+
+    agenda = WateringScheduleService.get_agenda(db, today, today + timedelta(days=6), today=today)
+    assert [day["date"] for day in agenda] == ["2026-04-01", "2026-04-04", "2026-04-07"]
+    assert agenda[0]["plants"][0]["overdue_days"] == 2
+    assert agenda[1]["plants"][0]["overdue_days"] == 0
+
+    with pytest.raises(ValueError):
+        WateringScheduleService.get_agenda(db, today, today - timedelta(days=1), today=today)
+
+
+def test_watering_agenda_endpoint(client):
+    resp = client.get("/api/statistics/watering-agenda")
+    assert resp.status_code == 200
+    assert isinstance(resp.json(), list)
+
+    resp = client.get("/api/statistics/watering-agenda?start=2026-05-10&end=2026-05-01")
+    assert resp.status_code == 400
+
+
+def test_to_water_endpoint(client):
+    resp = client.post("/api/plants", json={"name": "Never watered"})
+    plant_id = resp.json()["id"]
+    resp = client.get("/api/plants/to-water")
+    assert resp.status_code == 200
+    assert any(p["id"] == plant_id for p in resp.json())